@@ -1,4 +1,13 @@
 import ast
+import gc
+import logging
+
+from cfg import build_cfgs
+from gate_ir import build_gate_op, build_gate_ops
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
 
 class Ast_parser:
     def __init__(self) -> None:
@@ -12,9 +21,9 @@ class Ast_parser:
         self.file_text = file_text
         try:
             self.root = ast.parse(file_text)
-            print("[INFO] AST 解析成功")
+            logger.debug("[INFO] AST 解析成功")
         except SyntaxError as e:
-            print(f"[ERROR] 语法错误: {e}")
+            logger.warning("[ERROR] 语法错误: %s", e)
             self.root = None
         return self.root
 
@@ -40,6 +49,310 @@ class Ast_parser:
                 self.call_list.append(node)
         return self.call_list
 
+    def collect(self):
+        """ 单次遍历提取变量赋值与函数调用，结果与 extract_* 系列一致 """
+        collector = MQCollector()
+        if self.root is not None:
+            collector.collect(self.root)
+            self.assign_list = collector.assign_list
+            self.call_list = collector.call_list
+        return collector
+
+
+class MQCollector(ast.NodeVisitor):
+    """
+    单次遍历 AST，同时收集变量赋值、函数调用、行号以及所在语句与作用域。
+
+    NodeVisitor 为深度优先遍历，而原先的 ast.walk 为广度优先。对树而言，
+    同一深度的节点在两种遍历中的相对顺序相同，因此按深度做一次稳定排序即可
+    还原 ast.walk 的顺序，保证下游检查结果不变。
+    """
+    def __init__(self) -> None:
+        self.assign_list = []
+        self.call_list = []
+        self.assign_scopes = []   # 每条赋值所在作用域，如 '<module>'、'U_operator'
+        self.call_scopes = []
+        self.assign_stmts = []    # 每条赋值所在的语句节点
+        self.call_stmts = []
+        self.call_loops = []      # 每个调用外层的循环绑定，见 _loop_snapshot
+        self.attributes = []
+        self.att_line_numbers = []
+        self.gate_ops = []        # 与 call_list 一一对应的门操作 IR
+        self._operations = None
+        self.cfgs = None          # 文件的控制流图（见 cfg.py）
+        self._depth = 0
+        self._scope = ['<module>']
+        self._stmt = None
+        self._assigns = []
+        self._calls = []
+        self._loops = []          # (变量名, 迭代表达式, guarded, 进入循环时的条件分支层数)
+        self._guards = 0
+        self._events = None       # 当前最外层表达式中的调用与海象赋值
+        self._event_memo = {}     # 表达式或语句节点 → 事件列表，即 build_cfgs 的 memo
+
+    def collect(self, root):
+        """ 遍历 root 并生成 MQ-Attributes、门操作 IR 及控制流图 """
+        # 期间新建的对象全部保留，分代回收只会反复扫描整棵 AST（2 万个门时占一半以上耗时），暂停到结束
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self._collect(root)
+        finally:
+            if enabled:
+                gc.enable()
+        return self
+
+    def _collect(self, root):
+        self.visit(root)
+        self._assigns.sort(key=lambda item: item[0])
+        self._calls.sort(key=lambda item: item[0])
+        for _, node, scope, stmt in self._assigns:
+            self.assign_list.append(node)
+            self.assign_scopes.append(scope)
+            self.assign_stmts.append(stmt)
+        for _, node, scope, stmt, loops in self._calls:
+            self.call_list.append(node)
+            self.call_scopes.append(scope)
+            self.call_stmts.append(stmt)
+            self.call_loops.append(loops)
+        # 赋值右侧的调用链同样出现在 call_list 中，两者共用同一份调用链缓存
+        memo = {}
+        self.gate_ops = build_gate_ops(self.call_list, self.call_scopes, self.call_loops, memo)
+        self.attributes, self.att_line_numbers = get_attributes(self.assign_list, memo)
+        # 遍历时已记录各表达式的事件，构建 CFG 时只需按语句走一遍，不再遍历表达式
+        self.cfgs = build_cfgs(root, self._event_memo)
+
+    @property
+    def operations(self):
+        """ MQ-Operations 字符串（只用于调试输出），首次访问时才构建 """
+        if self._operations is None:
+            self._operations = get_operations(self.call_list)
+        return self._operations[0]
+
+    @property
+    def opt_line_numbers(self):
+        self.operations
+        return self._operations[1]
+
+    def scan(self, root):
+        """
+        只遍历 root，返回未排序的赋值记录 (深度, 节点, 作用域, 语句) 与
+        调用记录 (深度, 节点, 作用域, 语句, 循环绑定)，供按语句缓存的增量分析使用。
+        按深度稳定排序后即为 collect 的顺序。
+        """
+        self.visit(root)
+        return self._assigns, self._calls
+
+    def visit(self, node):
+        events = self._events
+        if events is not None:
+            if type(node) in _EVENT_NODES:
+                events.append(node)
+        elif isinstance(node, ast.expr):
+            self._visit_expression(node)
+            return
+        # 按类型查表分派，避免 NodeVisitor 每个节点一次的 getattr 字符串拼接
+        handler = _COLLECTOR_DISPATCH.get(type(node))
+        if handler is None:
+            self.generic_visit(node)
+        else:
+            handler(self, node)
+
+    def _visit_expression(self, node):
+        """
+        语句中的最外层表达式：顺带记录其中的调用与海象赋值（与 cfg.expression_events 的结果相同），
+        同时按语句汇总。同一语句的各个最外层表达式按源码顺序出现且互不重叠，直接拼接即按求值完成排序。
+        """
+        self._events = events = []
+        self.visit(node)
+        self._events = None
+        if len(events) > 1:
+            events.sort(key=_end)
+        memo = self._event_memo
+        memo[node] = events
+        previous = memo.get(self._stmt)
+        memo[self._stmt] = events if previous is None else previous + events
+
+    def generic_visit(self, node):
+        if isinstance(node, ast.stmt):
+            outer_stmt, self._stmt = self._stmt, node
+        else:
+            outer_stmt = self._stmt
+        self._depth += 1
+        for field in node._fields:
+            self._visit_value(getattr(node, field, None))
+        self._depth -= 1
+        self._stmt = outer_stmt
+
+    def _visit_value(self, value):
+        if isinstance(value, list):
+            for item in value:
+                if isinstance(item, ast.AST) and type(item) not in _LEAF_NODES:
+                    self.visit(item)
+        elif isinstance(value, ast.AST) and type(value) not in _LEAF_NODES:
+            self.visit(value)
+
+    def _loop_snapshot(self):
+        """ 当前调用外层的循环绑定：(变量名, 迭代表达式, guarded)，由外到内 """
+        if not self._loops:
+            return ()
+        guards = self._guards
+        return tuple((name, iter_node, guarded or guards > level)
+                     for name, iter_node, guarded, level in self._loops)
+
+    def _bindings(self, target, iter_node, guarded, stored=()):
+        """
+        循环目标的绑定；非单个变量的目标（如元组解包）以及在循环体中被重新赋值的变量（stored）
+        只遮蔽同名变量，不给出取值
+        """
+        if isinstance(target, ast.Name) and target.id not in stored:
+            return [(target.id, iter_node, guarded, self._guards)]
+        return [(node.id, None, True, self._guards)
+                for node in ast.walk(target) if isinstance(node, ast.Name)]
+
+    def visit_For(self, node):
+        # 与 generic_visit 的遍历顺序一致，只在访问循环体时压入循环绑定
+        outer_stmt, self._stmt = self._stmt, node
+        self._depth += 1
+        self._visit_value(node.target)
+        self._visit_value(node.iter)
+        # 循环体内的 break / continue / return / raise 可能使部分迭代不完整
+        jumps, stored = _scan_loop_body(node.body)
+        size = len(self._loops)
+        self._loops.extend(self._bindings(node.target, node.iter, jumps, stored))
+        self._visit_value(node.body)
+        del self._loops[size:]
+        self._guards += 1
+        self._visit_value(node.orelse)
+        self._guards -= 1
+        self._depth -= 1
+        self._stmt = outer_stmt
+
+    def _visit_branches(self, node):
+        """ 条件分支中的字段只在部分迭代中执行，其中调用的循环绑定不再 exact """
+        if not self._loops:
+            self.generic_visit(node)
+            return
+        outer_stmt = self._stmt
+        if isinstance(node, ast.stmt):
+            self._stmt = node
+        self._depth += 1
+        unconditional = _UNCONDITIONAL_FIELDS.get(type(node), ())
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if field in unconditional:
+                self._visit_value(value)
+            elif isinstance(node, ast.BoolOp) and field == 'values':
+                self._visit_value(value[:1])
+                self._guards += 1
+                self._visit_value(value[1:])
+                self._guards -= 1
+            else:
+                self._guards += 1
+                self._visit_value(value)
+                self._guards -= 1
+        self._depth -= 1
+        self._stmt = outer_stmt
+
+    def _visit_comprehension(self, node):
+        # 元素表达式在全部生成器的绑定下求值，带 if 过滤时不再 exact
+        self._depth += 1
+        guarded = any(generator.ifs for generator in node.generators)
+        size = len(self._loops)
+        for generator in node.generators:
+            self._loops.extend(self._bindings(generator.target, generator.iter, guarded))
+        for field in node._fields:
+            if field != 'generators':
+                self._visit_value(getattr(node, field, None))
+        del self._loops[size:]
+        self._visit_value(node.generators)
+        self._depth -= 1
+
+    def visit_Assign(self, node):
+        self._assigns.append((self._depth, node, self._scope[-1], node))
+        self.generic_visit(node)
+
+    def visit_Call(self, node):
+        self._calls.append((self._depth, node, self._scope[-1], self._stmt, self._loop_snapshot()))
+        self.generic_visit(node)
+
+    def _visit_scope(self, node):
+        name = getattr(node, 'name', '<lambda>')
+        self._scope.append(f"{self._scope[-1]}.{name}" if len(self._scope) > 1 else name)
+        # 函数体在调用时才执行，不继承外层循环的绑定
+        outer_loops, self._loops = self._loops, []
+        self.generic_visit(node)
+        self._loops = outer_loops
+        self._scope.pop()
+
+    visit_FunctionDef = _visit_scope
+    visit_AsyncFunctionDef = _visit_scope
+    visit_ClassDef = _visit_scope
+    visit_Lambda = _visit_scope
+
+
+# 不可能包含赋值或调用的叶子节点，遍历时直接跳过
+_LEAF_NODES = frozenset(
+    [ast.Constant, ast.Name, ast.Load, ast.Store, ast.Del, ast.Pass, ast.Break, ast.Continue,
+     ast.Import, ast.ImportFrom, ast.Global, ast.Nonlocal, ast.alias]
+    + ast.operator.__subclasses__() + ast.unaryop.__subclasses__()
+    + ast.cmpop.__subclasses__() + ast.boolop.__subclasses__()
+)
+
+# 使循环迭代可能不完整的语句
+_JUMP_NODES = (ast.Break, ast.Continue, ast.Return, ast.Raise)
+
+# 控制流图中的表达式事件，见 cfg.expression_events
+_EVENT_NODES = frozenset([ast.Call, ast.NamedExpr])
+
+
+def _end(node):
+    return node.end_lineno or 0, node.end_col_offset or 0
+
+
+def _scan_loop_body(body):
+    """ 一次遍历循环体：是否含 break / continue / return / raise，以及被赋值、增量赋值或删除的变量名 """
+    jumps = False
+    stored = set()
+    for stmt in body:
+        for child in ast.walk(stmt):
+            if isinstance(child, ast.Name):
+                if not isinstance(child.ctx, ast.Load):
+                    stored.add(child.id)
+            elif isinstance(child, _JUMP_NODES):
+                jumps = True
+    return jumps, stored
+
+
+# 条件分支节点中无条件执行的字段，其余字段视为条件分支
+_UNCONDITIONAL_FIELDS = {
+    ast.If: ('test',),
+    ast.IfExp: ('test',),
+    ast.While: (),
+    ast.Try: ('body', 'finalbody'),
+    ast.BoolOp: ('op',),
+}
+if hasattr(ast, 'Match'):
+    _UNCONDITIONAL_FIELDS[ast.Match] = ('subject',)
+if hasattr(ast, 'TryStar'):
+    _UNCONDITIONAL_FIELDS[ast.TryStar] = ('body', 'finalbody')
+
+_COLLECTOR_DISPATCH = {
+    ast.Assign: MQCollector.visit_Assign,
+    ast.Call: MQCollector.visit_Call,
+    ast.FunctionDef: MQCollector._visit_scope,
+    ast.AsyncFunctionDef: MQCollector._visit_scope,
+    ast.ClassDef: MQCollector._visit_scope,
+    ast.Lambda: MQCollector._visit_scope,
+    ast.For: MQCollector.visit_For,
+    ast.AsyncFor: MQCollector.visit_For,
+    ast.ListComp: MQCollector._visit_comprehension,
+    ast.SetComp: MQCollector._visit_comprehension,
+    ast.GeneratorExp: MQCollector._visit_comprehension,
+    ast.DictComp: MQCollector._visit_comprehension,
+}
+_COLLECTOR_DISPATCH.update((node_type, MQCollector._visit_branches) for node_type in _UNCONDITIONAL_FIELDS)
+
 
 def process_constant(node):
     if isinstance(node.value, int):
@@ -174,34 +487,47 @@ def process_dict(node):
 
     return "{" + ','.join(results) + "}", assign_list
 
-def get_attributes(assign_list):
+def get_attribute(assign, memo=None):
+    """
+    单条变量赋值的属性，返回 ((变量名, 值), 字典键值对)。
+    函数调用的值为其 GateOp IR（text 为源码文本，如 NoiseBackend(...)），检查时不再解析字符串；
+    其他值为字符串。赋值不是字典时字典键值对为 None。memo 为 build_gate_ops 的调用链缓存。
+    """
+    if isinstance(assign.targets[0], ast.Tuple):
+        name = ','.join([var.id for var in assign.targets[0].elts if isinstance(var, ast.Name)])
+    elif isinstance(assign.targets[0], ast.Name):
+        name = assign.targets[0].id
+    elif isinstance(assign.targets[0], ast.Subscript):
+        name = process_subscript(assign.targets[0])
+    else:
+        name = "UNKNOWN"
+
+    value = "UNKNOWN"
+    dict_assign = None
+    if isinstance(assign.value, ast.Constant):
+        value = assign.value.value
+    elif isinstance(assign.value, ast.Call):
+        return (name, build_gate_op(assign.value, text=process_call(assign.value), memo=memo)), None
+    elif isinstance(assign.value, ast.Attribute):
+        value = process_attribute(assign.value)
+    elif isinstance(assign.value, ast.Dict):
+        value, dict_assign = process_dict(assign.value)
+
+    return (name, str(value)), dict_assign
+
+def get_attributes(assign_list, memo=None):
     """ 获取变量赋值的属性 """
     attributes = []
     dict_assign = None
     line_numbers = []
     for assign in assign_list:
-        if isinstance(assign.targets[0], ast.Tuple):
-            name = ','.join([var.id for var in assign.targets[0].elts if isinstance(var, ast.Name)])
-        elif isinstance(assign.targets[0], ast.Name):
-            name = assign.targets[0].id
-        elif isinstance(assign.targets[0], ast.Subscript):
-            name = process_subscript(assign.targets[0])
-        else:
-            name = "UNKNOWN"
-
-        value = "UNKNOWN"
-        if isinstance(assign.value, ast.Constant):
-            value = assign.value.value
-        elif isinstance(assign.value, ast.Call):
-            value = process_call(assign.value)
-        elif isinstance(assign.value, ast.Attribute):
-            value = process_attribute(assign.value)
-        elif isinstance(assign.value, ast.Dict):
-            value, dict_assign = process_dict(assign.value)
-
-        attributes.append((name, str(value)))
+        attribute, pairs = get_attribute(assign, memo)
+        if pairs is not None:
+            dict_assign = pairs
+        attributes.append(attribute)
         line_numbers.append(assign.lineno)
 
+    # 只有最后一个字典赋值的键值对追加在末尾（无行号）
     if dict_assign:
         attributes.extend(dict_assign)
 
@@ -0,0 +1,96 @@
+"""
+对比前端提取赋值与调用的两种方式：
+  - 旧路径：extract_variable_assign + extract_function_calls（两次 ast.walk），
+    再调用 get_attributes / get_operations
+  - 新路径：生产环境实际调用的 Ast_parser.collect()，单次遍历并构建 MQ-Attributes、
+    门操作 IR 与控制流图（MQ-Operations 字符串只在调试输出时才构建，不计入）
+两者提取的赋值、调用及其顺序必须一致。
+
+用法：
+    python benchmarks/bench_collector.py --gates 20000 --repeat 5
+"""
+import argparse
+import contextlib
+import gc
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ast_operations import Ast_parser, get_attributes, get_operations
+
+
+def make_source(n_gates, n_qubits=8):
+    """ 生成一个包含大量门调用和变量赋值的 MindQuantum 程序 """
+    lines = [
+        "from mindquantum import Circuit, H, X, RX, Measure, Simulator",
+        "circ = Circuit()",
+    ]
+    for i in range(n_gates):
+        q = i % n_qubits
+        if i % 4 == 0:
+            lines.append(f"theta_{i} = {i * 0.01:.2f}")
+            lines.append(f"circ += RX(theta_{i}).on({q})")
+        elif i % 4 == 1:
+            lines.append(f"circ += X.on({q}, {(q + 1) % n_qubits})")
+        elif i % 4 == 2:
+            lines.append(f"circ = circ.h({q}).x({(q + 2) % n_qubits}, {q})")
+        else:
+            lines.append(f"circ += H.on({q})")
+    lines.append(f"sim = Simulator('mqvector', {n_qubits})")
+    lines.append("res = sim.sampling(circ, shots=100)")
+    return "\n".join(lines) + "\n"
+
+
+def two_walk(parser):
+    assign_list = parser.extract_variable_assign()
+    call_list = parser.extract_function_calls()
+    attributes, att_line_numbers = get_attributes(assign_list)
+    operations, opt_line_numbers = get_operations(call_list)
+    return attributes, att_line_numbers, operations, opt_line_numbers
+
+
+def best_of(func, parser, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = func(parser)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='MQCollector 单次遍历基准测试')
+    arg_parser.add_argument('--gates', type=int, default=20000, help='生成的门调用数量')
+    arg_parser.add_argument('--repeat', type=int, default=5, help='重复次数（取最优）')
+    args = arg_parser.parse_args()
+
+    source = make_source(args.gates)
+    parser = Ast_parser()
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser.parser(source)
+
+    old_time, old_result = best_of(two_walk, parser, args.repeat)
+    old_assigns, old_calls = list(parser.assign_list), list(parser.call_list)
+    new_time, collector = best_of(lambda p: p.collect(), parser, args.repeat)
+
+    attributes, att_line_numbers, operations, opt_line_numbers = old_result
+    assert collector.assign_list == old_assigns and collector.call_list == old_calls, \
+        "collect() 提取的赋值或调用与两次 ast.walk 不一致"
+    # 调用赋值的值为 GateOp，按源码文本比较
+    assert [(name, str(value)) for name, value in collector.attributes] == \
+        [(name, str(value)) for name, value in attributes]
+    assert collector.att_line_numbers == att_line_numbers
+    assert (collector.operations, collector.opt_line_numbers) == (operations, opt_line_numbers)
+    print(f"源码行数        : {source.count(chr(10))}")
+    print(f"两次 ast.walk   : {old_time * 1000:.1f} ms")
+    print(f"collect()       : {new_time * 1000:.1f} ms（含门操作 IR 与控制流图）")
+    print(f"加速比          : {old_time / new_time:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+"""
+lint 流水线的规模基准：用 generate.py 生成不同行数的合成程序，分阶段计时
+（Ast_parser.parser、collect 及其中的 get_attributes / build_gate_ops、
+符号表与门调用表、Rules 中的每个规则、save_report），并与保存的基线比较。
+
+基线记录每个规模的各阶段耗时以及检查结果摘要：结果摘要不同视为正确性回归，
+阶段耗时超过基线的 (1 + tolerance) 倍视为性能回归，两者都会使脚本以状态码 1 退出。
+
+用法：
+    python benchmarks/bench_pipeline.py --sizes 10 1000 100000 --save-baseline
+    python benchmarks/bench_pipeline.py --sizes 10 1000 100000
+    python benchmarks/bench_pipeline.py --sizes 1000000 --repeat 1
+"""
+import argparse
+import gc
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ast_operations import Ast_parser, get_attributes
+from gate_ir import GateTable, build_gate_ops
+from main import save_report
+from mindLint import Facts, LintContext, MindLint, RuleEngine, Rules
+from rule_scheduler import schedule_for
+from symbol_table import SymbolTable
+from generate import DEFAULT_QUBITS, program_for_lines
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_SIZES = (10, 1000, 10000, 100000)
+DEFAULT_TOLERANCE = 0.25
+# 低于该差值（秒）的变化视为噪声，避免小规模下的误报
+MIN_DELTA = 0.002
+
+
+def best_of(repeat, func, *args):
+    """ 重复执行 func，返回 (最短耗时, 最后一次的结果) """
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _parse(source):
+    parser = Ast_parser()
+    parser.parser(source)
+    return parser
+
+
+def _run_rule(code, context):
+    return RuleEngine({code: Rules[code]}).run(context)[code]
+
+
+def _check(collected, file_lines):
+    checker = MindLint()
+    checker.check(collected.attributes, collected.att_line_numbers, collected.gate_ops,
+                  file_lines, collected.assign_scopes, collected.cfgs)
+    return checker.get_report()
+
+
+def bench_source(source, repeat, report_dir):
+    """ 对一份源码分阶段计时，返回 {阶段: 秒} 与检查报告 """
+    phases = {}
+    file_lines = source.split('\n')
+
+    phases['parse'], parser = best_of(repeat, _parse, source)
+    phases['collect'], collected = best_of(repeat, parser.collect)
+    # collect 内部的提取步骤单独计时，便于定位
+    phases['get_attributes'], _ = best_of(repeat, get_attributes, collected.assign_list)
+    phases['build_gate_ops'], _ = best_of(repeat, build_gate_ops, collected.call_list,
+                                             collected.call_scopes, collected.call_loops)
+
+    def build_tables():
+        symbols = SymbolTable(collected.attributes, collected.att_line_numbers, collected.assign_scopes)
+        return symbols, GateTable(collected.gate_ops, symbols.resolve)
+    phases['tables'], (symbols, table) = best_of(repeat, build_tables)
+
+    # 规则按调度顺序（见 rule_scheduler.py）在同一上下文中依次运行；
+    # 数据流事实在各自的上下文中求解，计入首个声明它的规则
+    order = [code for stage in schedule_for(Rules, Facts).stages for code in stage]
+    for code in order:
+        elapsed = float('inf')
+        for _ in range(repeat):
+            context = LintContext(symbols, table, collected.gate_ops, collected.cfgs)
+            for previous in order:
+                if previous == code:
+                    break
+                _run_rule(previous, context)
+            start = time.perf_counter()
+            _run_rule(code, context)
+            elapsed = min(elapsed, time.perf_counter() - start)
+        phases[f'rule:{code}'] = elapsed
+
+    phases['check'], report = best_of(repeat, _check, collected, file_lines)
+    report_path = os.path.join(report_dir, 'synthetic.py')
+    phases['save_report'], _ = best_of(repeat, save_report, report, report_path)
+    return phases, report
+
+
+def report_digest(report):
+    """ 检查结果摘要：结构化 issues 的 SHA-256 """
+    payload = json.dumps(report.get('issues', []), ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def run(sizes, repeat, qubits, seed):
+    results = {}
+    with tempfile.TemporaryDirectory() as report_dir:
+        for lines in sizes:
+            source = program_for_lines(lines, qubits, seed)
+            phases, report = bench_source(source, repeat, report_dir)
+            # 生成参数不同的程序结果不可比，一并写入键中
+            results[f"{lines}-q{qubits}-s{seed}"] = {
+                'lines': source.count('\n'),
+                'phases': phases,
+                'issues': len(report.get('issues', [])),
+                'digest': report_digest(report),
+            }
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """ 与基线比较，返回回归描述列表 """
+    regressions = []
+    for size, result in results.items():
+        base = baseline.get(size)
+        if base is None:
+            continue
+        if result['digest'] != base['digest']:
+            regressions.append(f"[{size}] 检查结果与基线不一致："
+                               f"{base['issues']} → {result['issues']} 条问题")
+        for phase, elapsed in result['phases'].items():
+            base_elapsed = base['phases'].get(phase)
+            if base_elapsed is None:
+                continue
+            if elapsed > base_elapsed * (1 + tolerance) and elapsed - base_elapsed > MIN_DELTA:
+                regressions.append(f"[{size}] {phase}: {base_elapsed * 1000:.2f} ms → "
+                                   f"{elapsed * 1000:.2f} ms ({elapsed / base_elapsed:.2f}x)")
+    return regressions
+
+
+def print_results(results, baseline):
+    for size, result in results.items():
+        base = baseline.get(size, {}).get('phases', {})
+        print(f"\n📏 {result['lines']} 行，{result['issues']} 条问题，结果摘要 {result['digest']}")
+        for phase, elapsed in result['phases'].items():
+            line = f"  {phase:<16}{elapsed * 1000:>12.2f} ms"
+            if phase in base and base[phase] > 0:
+                line += f"   基线 {base[phase] * 1000:>10.2f} ms  ({elapsed / base[phase]:.2f}x)"
+            print(line)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='lint 流水线分阶段规模基准')
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                            help='合成程序的目标行数（可给多个）')
+    arg_parser.add_argument('--repeat', type=int, default=3, help='每个阶段重复次数（取最优）')
+    arg_parser.add_argument('--qubits', type=int, default=DEFAULT_QUBITS, help='合成程序的量子比特数')
+    arg_parser.add_argument('--seed', type=int, default=0, help='生成器随机种子')
+    arg_parser.add_argument('--baseline', type=str, default=DEFAULT_BASELINE, help='基线文件路径')
+    arg_parser.add_argument('--save-baseline', action='store_true', help='将本次结果写入基线文件')
+    arg_parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                            help=f'允许的耗时增长比例（默认 {DEFAULT_TOLERANCE}）')
+    args = arg_parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    results = run(args.sizes, args.repeat, args.qubits, args.seed)
+    print_results(results, baseline)
+
+    if args.save_baseline:
+        baseline.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 基线已保存至：{args.baseline}")
+        return
+
+    if not baseline:
+        print(f"\n[INFO] 未找到基线 {args.baseline}，使用 --save-baseline 创建")
+        return
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("\n❌ 发现回归：")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print("\n✅ 未发现回归")
+
+
+if __name__ == '__main__':
+    main()
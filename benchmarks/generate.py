@@ -0,0 +1,139 @@
+"""
+合成 MindQuantum 基准程序生成器：按给定的门、量子比特、变量、链式 Circuit() 调用
+与测量数量生成可复现（固定随机种子）的程序，规模从十几行到上百万行。
+
+用法：
+    python benchmarks/generate.py --lines 10 1000 100000 --out benchmarks/corpus
+    python benchmarks/generate.py --gates 5000 --qubits 32 --variables 500 \\
+        --chains 200 --measures 50 --out benchmarks/corpus
+"""
+import argparse
+import os
+import random
+
+HEADER = [
+    "from mindquantum import Circuit, Simulator",
+    "from mindquantum.core.gates import H, X, Y, Z, CNOT, RX, RY, RZ, Measure",
+    "",
+]
+
+# 程序体中各类语句的默认占比，其余行数都用于门调用
+DEFAULT_RATIOS = {'variables': 0.10, 'chains': 0.05, 'measures': 0.02}
+DEFAULT_QUBITS = 16
+DEFAULT_CHAIN_LENGTH = 4
+
+SINGLE_GATES = ('H', 'X', 'Y', 'Z')
+ROTATION_GATES = ('RX', 'RY', 'RZ')
+CHAIN_METHODS = ('h', 'x', 'y', 'z')
+
+
+def make_program(gates, qubits=DEFAULT_QUBITS, variables=0, chains=0, measures=0,
+                 chain_length=DEFAULT_CHAIN_LENGTH, seed=0):
+    """
+    生成程序源码：
+      - gates: `circ += G.on(...)` 形式的门调用（单比特门、受控门与带参数的旋转门）
+      - variables: 旋转角变量赋值，旋转门优先引用已定义的变量
+      - chains: `circ = circ + Circuit().h(0).x(1, 0)...` 形式的链式调用，每条 chain_length 个方法
+      - measures: Measure('m<i>').on(q) 测量，之后的门可能用到被测量的比特
+    各类语句按随机顺序交错，末尾声明 Simulator 并采样。
+    """
+    rng = random.Random(seed)
+    kinds = ['gate'] * gates + ['variable'] * variables + ['chain'] * chains + ['measure'] * measures
+    rng.shuffle(kinds)
+
+    lines = list(HEADER)
+    lines.append(f"n_qubits = {qubits}")
+    lines.append("circ = Circuit()")
+    defined = []
+    counters = {'variable': 0, 'measure': 0}
+    for kind in kinds:
+        if kind == 'variable':
+            name = f"theta_{counters['variable']}"
+            counters['variable'] += 1
+            lines.append(f"{name} = {rng.uniform(0, 3.14):.4f}")
+            defined.append(name)
+        elif kind == 'measure':
+            lines.append(f"circ += Measure('m{counters['measure']}').on({rng.randrange(qubits)})")
+            counters['measure'] += 1
+        elif kind == 'chain':
+            calls = []
+            for _ in range(chain_length):
+                method = rng.choice(CHAIN_METHODS)
+                obj = rng.randrange(qubits)
+                if rng.random() < 0.5 and qubits > 1:
+                    calls.append(f".{method}({obj}, {(obj + 1 + rng.randrange(qubits - 1)) % qubits})")
+                else:
+                    calls.append(f".{method}({obj})")
+            lines.append(f"circ = circ + Circuit(){''.join(calls)}")
+        else:
+            lines.append(_make_gate(rng, qubits, defined))
+
+    lines.append("sim = Simulator('mqvector', n_qubits)")
+    lines.append("result = sim.sampling(circ, shots=100)")
+    return "\n".join(lines) + "\n"
+
+
+def _make_gate(rng, qubits, defined):
+    obj = rng.randrange(qubits)
+    roll = rng.random()
+    if roll < 0.4:
+        return f"circ += {rng.choice(SINGLE_GATES)}.on({obj})"
+    if roll < 0.7 and qubits > 1:
+        ctrl = (obj + 1 + rng.randrange(qubits - 1)) % qubits
+        gate = rng.choice(('X', 'CNOT')) if rng.random() < 0.5 else rng.choice(SINGLE_GATES)
+        return f"circ += {gate}.on({obj}, {ctrl})"
+    angle = rng.choice(defined) if defined else f"{rng.uniform(0, 3.14):.4f}"
+    return f"circ += {rng.choice(ROTATION_GATES)}({angle}).on({obj})"
+
+
+def counts_for_lines(lines, ratios=None):
+    """ 按占比把目标行数分配给各类语句，返回 make_program 的关键字参数 """
+    ratios = dict(DEFAULT_RATIOS, **(ratios or {}))
+    body = max(1, lines - len(HEADER) - 4)
+    counts = {kind: int(body * ratio) for kind, ratio in ratios.items()}
+    counts['gates'] = max(1, body - sum(counts.values()))
+    return counts
+
+
+def program_for_lines(lines, qubits=DEFAULT_QUBITS, seed=0, ratios=None):
+    """ 生成约 lines 行的程序 """
+    return make_program(qubits=qubits, seed=seed, **counts_for_lines(lines, ratios))
+
+
+def write_program(path, source):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(source)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='生成合成 MindQuantum 基准程序')
+    parser.add_argument('--out', type=str, default='benchmarks/corpus', help='输出目录')
+    parser.add_argument('--lines', type=int, nargs='+',
+                        help='按目标行数生成（可给多个），各类语句按默认占比分配')
+    parser.add_argument('--gates', type=int, default=1000, help='门调用数量（未指定 --lines 时生效）')
+    parser.add_argument('--qubits', type=int, default=DEFAULT_QUBITS, help='量子比特数')
+    parser.add_argument('--variables', type=int, default=100, help='变量赋值数量')
+    parser.add_argument('--chains', type=int, default=50, help='链式 Circuit() 调用数量')
+    parser.add_argument('--chain-length', type=int, default=DEFAULT_CHAIN_LENGTH, help='每条链的方法调用数')
+    parser.add_argument('--measures', type=int, default=20, help='测量数量')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    args = parser.parse_args()
+
+    if args.lines:
+        for lines in args.lines:
+            source = program_for_lines(lines, args.qubits, args.seed)
+            path = write_program(os.path.join(args.out, f"synthetic_{lines}.py"), source)
+            print(f"📄 {path}: {source.count(chr(10))} 行")
+    else:
+        source = make_program(args.gates, args.qubits, args.variables, args.chains,
+                              args.measures, args.chain_length, args.seed)
+        path = write_program(os.path.join(args.out, f"synthetic_g{args.gates}_q{args.qubits}.py"), source)
+        print(f"📄 {path}: {source.count(chr(10))} 行")
+
+
+if __name__ == '__main__':
+    main()
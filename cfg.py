@@ -0,0 +1,363 @@
+"""
+每个文件构建一次的控制流图（CFG）。
+
+模块顶层与每个函数体各有一个 CFG，作用域名与 MQCollector 一致（'<module>'、'U_operator'、
+'Cls.method'）；类体在定义处顺序执行，并入外层 CFG。
+
+基本块中的 events 为按执行顺序排列的事件节点：
+  - ast.Call：同一语句内按求值完成的先后排序（结束位置），即参数先于外层调用、
+    链式调用与 a + b 从左到右
+  - 绑定事件：赋值、for 目标、with ... as、import、def / class、del、except ... as 等，
+    排在所在语句的调用之后，数据流分析据此更新或失效变量的值
+"""
+import ast
+
+MODULE_SCOPE = '<module>'
+
+
+class BasicBlock:
+    """ 基本块：顺序执行的事件，以及前驱 / 后继块 """
+    __slots__ = ('id', 'events', 'succs', 'preds')
+
+    def __init__(self, block_id):
+        self.id = block_id
+        self.events = []
+        self.succs = []
+        self.preds = []
+
+    def __repr__(self):
+        return f"BasicBlock({self.id}, events={len(self.events)}, succs={[b.id for b in self.succs]})"
+
+
+class CFG:
+    """ 一个作用域（模块顶层或函数体）的控制流图 """
+    __slots__ = ('scope', 'entry', 'exit', 'blocks')
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.blocks = []
+        self.entry = self.new_block()
+        self.exit = self.new_block()
+
+    def new_block(self):
+        block = BasicBlock(len(self.blocks))
+        self.blocks.append(block)
+        return block
+
+    @staticmethod
+    def link(source, target):
+        if source is not None and target not in source.succs:
+            source.succs.append(target)
+            target.preds.append(source)
+
+
+class FileCFG:
+    """
+    一个文件的全部 CFG：
+      - graphs: 各作用域的 CFG，模块顶层在前
+      - points: 调用节点 → (所在 CFG, 基本块, 事件下标)
+      - globals: 在函数中以 global / nonlocal 声明的变量名，其值可能在任意调用处改变
+    """
+    __slots__ = ('graphs', 'points', 'globals')
+
+    def __init__(self):
+        self.graphs = []
+        self.points = {}
+        self.globals = set()
+
+    def point(self, node):
+        """ 调用节点所在的程序点，不在任何 CFG 中时返回 None """
+        return self.points.get(node)
+
+    def __len__(self):
+        return len(self.graphs)
+
+
+def build_cfgs(tree, memo=None):
+    """
+    由模块 AST 构建文件的全部 CFG。
+    memo 为表达式节点 → 事件列表的缓存，同一批 AST 节点多次构建 CFG 时（增量分析）可复用。
+    """
+    file_cfg = FileCFG()
+    pending = [(MODULE_SCOPE, tree.body)]
+    while pending:
+        scope, body = pending.pop(0)
+        builder = _Builder(scope, file_cfg, memo)
+        builder.build(body)
+        file_cfg.graphs.append(builder.cfg)
+        pending.extend(builder.functions)
+    return file_cfg
+
+
+def linear_cfg(nodes):
+    """ 只有一个基本块、按给定顺序执行调用的 CFG（没有 AST 时的退化形式） """
+    file_cfg = FileCFG()
+    cfg = CFG(MODULE_SCOPE)
+    block = cfg.new_block()
+    cfg.link(cfg.entry, block)
+    cfg.link(block, cfg.exit)
+    for node in nodes:
+        if node is not None and node not in file_cfg.points:
+            file_cfg.points[node] = (cfg, block, len(block.events))
+            block.events.append(node)
+    file_cfg.graphs.append(cfg)
+    return file_cfg
+
+
+def _end(node):
+    return node.end_lineno or 0, node.end_col_offset or 0
+
+
+# 不可能包含调用或海象赋值的节点，遍历时跳过
+_LEAF_NODES = frozenset(
+    [ast.Constant, ast.Name, ast.Load, ast.Store, ast.Del, ast.Pass, ast.Break, ast.Continue,
+     ast.Import, ast.ImportFrom, ast.Global, ast.Nonlocal, ast.alias]
+    + ast.operator.__subclasses__() + ast.unaryop.__subclasses__()
+    + ast.cmpop.__subclasses__() + ast.boolop.__subclasses__()
+)
+_EVENT_NODES = (ast.Call, ast.NamedExpr)
+
+
+def expression_events(node):
+    """ 表达式中的调用与海象赋值，按求值完成的先后排序 """
+    events = []
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, _EVENT_NODES):
+            events.append(node)
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if isinstance(value, list):
+                stack.extend(item for item in value
+                             if isinstance(item, ast.AST) and type(item) not in _LEAF_NODES)
+            elif isinstance(value, ast.AST) and type(value) not in _LEAF_NODES:
+                stack.append(value)
+    if len(events) > 1:
+        events.sort(key=_end)
+    return events
+
+
+def bound_names(node):
+    """ 绑定事件写入的变量名 """
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        return [node.name]
+    if isinstance(node, (ast.Import, ast.ImportFrom)):
+        return [alias.asname or alias.name.split('.')[0] for alias in node.names]
+    if isinstance(node, ast.ExceptHandler):
+        return [node.name] if node.name else []
+    if isinstance(node, ast.Assign):
+        if len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            return [node.targets[0].id]
+        targets = node.targets
+    elif isinstance(node, (ast.AugAssign, ast.AnnAssign, ast.NamedExpr, ast.For, ast.AsyncFor)):
+        if isinstance(node.target, ast.Name):
+            return [node.target.id]
+        targets = [node.target]
+    elif isinstance(node, ast.withitem):
+        targets = [node.optional_vars] if node.optional_vars is not None else []
+    elif isinstance(node, ast.Delete):
+        targets = node.targets
+    elif hasattr(ast, 'match_case') and isinstance(node, ast.match_case):
+        return [name for child in ast.walk(node.pattern)
+                for name in (getattr(child, 'name', None), getattr(child, 'rest', None)) if name]
+    else:
+        return []
+    return [child.id for target in targets for child in ast.walk(target) if isinstance(child, ast.Name)]
+
+
+class _Builder:
+    """ 按语句构建一个作用域的 CFG，嵌套函数记入 functions 稍后单独构建 """
+
+    def __init__(self, scope, file_cfg, memo=None):
+        self.cfg = CFG(scope)
+        self.file_cfg = file_cfg
+        self.memo = memo
+        self.scope = scope
+        self.functions = []
+        self.loops = []     # (continue 目标, break 目标)
+        self.classes = []   # 嵌套的类名，用于方法的作用域名
+
+    def build(self, body):
+        start = self.cfg.new_block()
+        self.cfg.link(self.cfg.entry, start)
+        self.cfg.link(self._body(body, start), self.cfg.exit)
+
+    # —— 事件 —— #
+    def _add(self, block, events):
+        points = self.file_cfg.points
+        for event in events:
+            if isinstance(event, ast.Call):
+                points[event] = (self.cfg, block, len(block.events))
+            block.events.append(event)
+
+    def _expr(self, block, node):
+        if node is None:
+            return
+        if self.memo is None:
+            self._add(block, expression_events(node))
+            return
+        events = self.memo.get(node)
+        if events is None:
+            events = self.memo[node] = expression_events(node)
+        self._add(block, events)
+
+    def _exprs(self, block, nodes):
+        for node in nodes:
+            self._expr(block, node)
+
+    # —— 语句 —— #
+    def _body(self, stmts, block):
+        """ 依次构建语句，返回最后所在的块；之后不可达时返回 None """
+        for stmt in stmts:
+            if block is None:
+                # 不可达的语句仍然构建（没有前驱），保证其中的调用都有程序点
+                block = self.cfg.new_block()
+            block = self._stmt(stmt, block)
+        return block
+
+    def _stmt(self, stmt, block):
+        handler = getattr(self, '_stmt_' + type(stmt).__name__, None)
+        if handler is not None:
+            return handler(stmt, block)
+        # 其余简单语句：先求值其中的调用，再执行绑定
+        if isinstance(stmt, (ast.Global, ast.Nonlocal)) and self.scope != MODULE_SCOPE:
+            # 函数体都会单独构建，逐条记录声明即可，不必在每个函数定义处遍历整个函数
+            self.file_cfg.globals.update(stmt.names)
+            return block
+        self._expr(block, stmt)
+        if bound_names(stmt):
+            self._add(block, [stmt])
+        return block
+
+    def _stmt_If(self, stmt, block):
+        self._expr(block, stmt.test)
+        after = self.cfg.new_block()
+        for branch in (stmt.body, stmt.orelse):
+            start = self.cfg.new_block()
+            self.cfg.link(block, start)
+            self.cfg.link(self._body(branch, start), after)
+        return after
+
+    def _loop(self, stmt, block, header):
+        body = self.cfg.new_block()
+        orelse = self.cfg.new_block()
+        after = self.cfg.new_block()
+        self.cfg.link(block, header)
+        self.cfg.link(header, body)
+        self.cfg.link(header, orelse)
+        self.loops.append((header, after))
+        self.cfg.link(self._body(stmt.body, body), header)
+        self.loops.pop()
+        self.cfg.link(self._body(stmt.orelse, orelse), after)
+        return after
+
+    def _stmt_While(self, stmt, block):
+        header = self.cfg.new_block()
+        self._expr(header, stmt.test)
+        return self._loop(stmt, block, header)
+
+    def _stmt_For(self, stmt, block):
+        # 迭代对象只求值一次，循环变量在每次进入循环体前绑定
+        self._expr(block, stmt.iter)
+        header = self.cfg.new_block()
+        self._add(header, [stmt])
+        return self._loop(stmt, block, header)
+
+    _stmt_AsyncFor = _stmt_For
+
+    def _stmt_Break(self, stmt, block):
+        if self.loops:
+            self.cfg.link(block, self.loops[-1][1])
+        return None
+
+    def _stmt_Continue(self, stmt, block):
+        if self.loops:
+            self.cfg.link(block, self.loops[-1][0])
+        return None
+
+    def _stmt_Return(self, stmt, block):
+        self._expr(block, stmt.value)
+        self.cfg.link(block, self.cfg.exit)
+        return None
+
+    def _stmt_Raise(self, stmt, block):
+        self._exprs(block, (stmt.exc, stmt.cause))
+        self.cfg.link(block, self.cfg.exit)
+        return None
+
+    def _stmt_Try(self, stmt, block):
+        body = self.cfg.new_block()
+        self.cfg.link(block, body)
+        first = len(self.cfg.blocks) - 1
+        body_end = self._body(stmt.body, body)
+        # try 体中的任意位置都可能抛出异常，进入各个 except 分支
+        raising = self.cfg.blocks[first:]
+        final = self.cfg.new_block()
+        for handler in stmt.handlers:
+            start = self.cfg.new_block()
+            for source in raising:
+                self.cfg.link(source, start)
+            self._expr(start, handler.type)
+            if handler.name:
+                self._add(start, [handler])
+            self.cfg.link(self._body(handler.body, start), final)
+        if body_end is not None:
+            orelse = self.cfg.new_block()
+            self.cfg.link(body_end, orelse)
+            self.cfg.link(self._body(stmt.orelse, orelse), final)
+        if not stmt.handlers:
+            # 只有 finally：异常同样经过 finally
+            for source in raising:
+                self.cfg.link(source, final)
+        return self._body(stmt.finalbody, final)
+
+    _stmt_TryStar = _stmt_Try
+
+    def _stmt_With(self, stmt, block):
+        for item in stmt.items:
+            self._expr(block, item.context_expr)
+            if item.optional_vars is not None:
+                self._expr(block, item.optional_vars)
+                self._add(block, [item])
+        return self._body(stmt.body, block)
+
+    _stmt_AsyncWith = _stmt_With
+
+    def _stmt_Match(self, stmt, block):
+        self._expr(block, stmt.subject)
+        after = self.cfg.new_block()
+        self.cfg.link(block, after)     # 没有分支匹配
+        for case in stmt.cases:
+            start = self.cfg.new_block()
+            self.cfg.link(block, start)
+            self._add(start, [case])
+            self._expr(start, case.guard)
+            self.cfg.link(self._body(case.body, start), after)
+        return after
+
+    def _stmt_FunctionDef(self, stmt, block):
+        # 装饰器与默认值在定义处求值，函数体在调用时执行，单独构建 CFG
+        self._exprs(block, stmt.decorator_list)
+        self._exprs(block, stmt.args.defaults)
+        self._exprs(block, [d for d in stmt.args.kw_defaults if d is not None])
+        self._add(block, [stmt])
+        self.functions.append((self._child_scope(stmt.name), stmt.body))
+        return block
+
+    _stmt_AsyncFunctionDef = _stmt_FunctionDef
+
+    def _stmt_ClassDef(self, stmt, block):
+        self._exprs(block, stmt.decorator_list)
+        self._exprs(block, stmt.bases)
+        self._exprs(block, [kw.value for kw in stmt.keywords])
+        self.classes.append(stmt.name)
+        block = self._body(stmt.body, block)
+        self.classes.pop()
+        if block is not None:
+            self._add(block, [stmt])
+        return block
+
+    def _child_scope(self, name):
+        parts = [] if self.scope == MODULE_SCOPE else [self.scope]
+        return '.'.join(parts + self.classes + [name])
@@ -0,0 +1,250 @@
+"""
+基于 CFG（见 cfg.py）的前向数据流框架。
+
+规则通过 Rule.facts 声明所需的事实（已测量比特、Simulator 宽度、变量常量值等），
+每个事实在每个文件中只用工作表算法求一次不动点：结果按基本块缓存入口值，
+块内各事件之前的值在首次查询时由入口值重放 transfer 得到并缓存，所有规则共用。
+"""
+import logging
+from bisect import bisect_right
+from collections import deque
+from collections.abc import Mapping
+
+from metrics import timed
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+class Fact:
+    """
+    前向数据流事实的基类，子类定义：
+      - name: 事实名称，规则在 facts 中按名称声明
+      - requires: transfer 中查询的其他事实名称，调度时先于本事实求解（见 rule_scheduler.py）
+      - initial(flow): 每个 CFG 入口处的值
+      - join(a, b): 汇合点的合并，须满足单调性以保证不动点收敛
+      - transfer(state, event, flow): 事件（ast.Call 或绑定语句）之后的值，不得修改 state
+    值之间用 == 判断是否收敛。
+    """
+    name = ''
+    requires = ()
+
+    def initial(self, flow):
+        raise NotImplementedError
+
+    def join(self, a, b):
+        raise NotImplementedError
+
+    def transfer(self, state, event, flow):
+        return state
+
+
+_MISSING = object()
+
+
+class _ChangeLog:
+    __slots__ = ('changes', 'version')
+
+    def __init__(self):
+        self.changes = {}   # 键 → ([版本...], [值...])，值为 _MISSING 表示删除
+        self.version = 0
+
+
+class PersistentDict(Mapping):
+    """
+    供 Fact 使用的不可变字典：set() / discard() 返回修改后的新字典，原字典不变。
+
+    同一条路径上依次产生的字典共享一份修改日志，每个字典只记录起点的基准字典与自己的版本号，
+    查找时在该键的修改记录中二分定位。在日志的最新版本上修改只追加一条记录，
+    代价与字典大小无关；从较早的版本再次修改（如分支的另一个后继）时才展开为新的基准字典。
+    """
+    __slots__ = ('_base', '_log', '_version', '_len')
+
+    def __init__(self, items=()):
+        self._base = dict(items)
+        self._log = None
+        self._version = 0
+        self._len = len(self._base)
+
+    def _lookup(self, key):
+        log = self._log
+        if log is not None:
+            entry = log.changes.get(key)
+            if entry is not None:
+                versions, values = entry
+                index = bisect_right(versions, self._version)
+                if index:
+                    return values[index - 1]
+        return self._base.get(key, _MISSING)
+
+    def set(self, key, value):
+        """ key 绑定为 value 后的字典，值（连同类型）未变化时返回自身 """
+        old = self._lookup(key)
+        if old is not _MISSING and type(old) is type(value) and old == value:
+            return self
+        return self._changed(key, value, self._len + (old is _MISSING))
+
+    def discard(self, key):
+        """ 删除 key 后的字典，key 不存在时返回自身 """
+        if self._lookup(key) is _MISSING:
+            return self
+        return self._changed(key, _MISSING, self._len - 1)
+
+    def _changed(self, key, value, length):
+        log, base = self._log, self._base
+        if log is None or log.version != self._version:
+            if log is not None:
+                base = dict(self.items())
+            log = _ChangeLog()
+        log.version += 1
+        versions, values = log.changes.setdefault(key, ([], []))
+        versions.append(log.version)
+        values.append(value)
+        result = PersistentDict.__new__(PersistentDict)
+        result._base, result._log, result._version, result._len = base, log, log.version, length
+        return result
+
+    def __getitem__(self, key):
+        value = self._lookup(key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def __contains__(self, key):
+        return self._lookup(key) is not _MISSING
+
+    def __iter__(self):
+        if self._log is None:
+            return iter(self._base)
+        base = self._base
+        keys = list(base) + [key for key in self._log.changes if key not in base]
+        return (key for key in keys if self._lookup(key) is not _MISSING)
+
+    def __len__(self):
+        return self._len
+
+    def __eq__(self, other):
+        return self is other or Mapping.__eq__(self, other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"PersistentDict({dict(self.items())!r})"
+
+
+class FlowAnalysis:
+    """
+    一个文件的数据流分析：持有文件的 CFG 与门调用表，按需求解并缓存各事实。
+
+    调用节点与门调用行通过 gate_ops 对应：gate_ops[i] 的调用节点为 op.node，
+    其展开的行为 table.chains[i]。链中前缀环节（如 Circuit().h(0).x(1) 中的 h(0)）
+    与内层调用共享同一个 GateCall，因此任意一行都能找到其程序点。
+    """
+
+    def __init__(self, context, facts, file_cfg, gate_ops):
+        self.context = context
+        self.facts = facts
+        self.cfg = file_cfg
+        self._rows = {}      # 调用节点 → 该调用对应的行（调用链的最后一环）
+        self._nodes = {}     # GateCall → 调用节点
+        for op, chain in zip(gate_ops, context.table.chains):
+            node = op.node
+            if node is None or not chain:
+                continue
+            self._rows[node] = chain[-1]
+            self._nodes[chain[-1].call] = node
+        self._instances = {}
+        self._entries = {}   # 事实名称 → {基本块: 入口值}
+        self._states = {}    # 事实名称 → {基本块: [各事件之前的值..., 出口值]}
+
+    def fact(self, name):
+        instance = self._instances.get(name)
+        if instance is None:
+            instance = self._instances[name] = self.facts[name]()
+        return instance
+
+    def row(self, node):
+        """ 调用节点对应的门调用行，没有时返回 None """
+        return self._rows.get(node)
+
+    def solve(self, name):
+        """ 求事实 name 的不动点（每个文件只求一次），返回 {基本块: 入口值} """
+        entries = self._entries.get(name)
+        if entries is not None:
+            return entries
+        fact = self.fact(name)
+        entries = {}
+        with timed(f"fact:{name}"):
+            for graph in self.cfg.graphs:
+                _solve_graph(graph, fact, self, entries)
+        self._entries[name] = entries
+        self._states[name] = {}
+        logger.debug("[INFO] 数据流事实 %s 求解完成", name)
+        return entries
+
+    def _block_states(self, name, block):
+        states = self._states[name].get(block)
+        if states is None:
+            fact = self.fact(name)
+            state = self._entries[name].get(block)
+            if state is None:
+                # 不可达的块没有入口值
+                state = fact.initial(self)
+            states = [state]
+            for event in block.events:
+                state = fact.transfer(state, event, self)
+                states.append(state)
+            self._states[name][block] = states
+        return states
+
+    def before(self, name, row):
+        """ 门调用行 row 执行之前事实 name 的值；行不在任何 CFG 中时返回入口值 """
+        self.solve(name)
+        node = self._nodes.get(row.call)
+        point = self.cfg.point(node) if node is not None else None
+        if point is None:
+            return self.fact(name).initial(self)
+        _, block, index = point
+        return self._block_states(name, block)[index]
+
+    def at_exit(self, name):
+        """ 各作用域出口处的值合并后的结果（整个文件执行结束时的值） """
+        entries = self.solve(name)
+        fact = self.fact(name)
+        result = fact.initial(self)
+        for graph in self.cfg.graphs:
+            if graph.exit in entries:
+                result = fact.join(result, entries[graph.exit])
+        return result
+
+
+def _solve_graph(graph, fact, flow, entries):
+    """ 工作表算法：块的出口值变化时，将其后继重新加入工作表 """
+    entries[graph.entry] = fact.initial(flow)
+    exits = {}
+    work = deque([graph.entry])
+    queued = {graph.entry}
+    while work:
+        block = work.popleft()
+        queued.discard(block)
+        state = entries[block]
+        for event in block.events:
+            state = fact.transfer(state, event, flow)
+        if block in exits and exits[block] == state:
+            continue
+        exits[block] = state
+        for succ in block.succs:
+            if succ in entries:
+                merged = fact.join(entries[succ], state)
+                if merged == entries[succ]:
+                    continue
+            else:
+                merged = state
+            entries[succ] = merged
+            if succ not in queued:
+                queued.add(succ)
+                work.append(succ)
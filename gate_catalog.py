@@ -0,0 +1,56 @@
+"""
+MindQuantum 门目录：所有规则使用的门名称表都由此处编译为 frozenset。
+"""
+
+# 门标签
+NONE_PARA = 'none_para'      # 无参数门，Circuit 方法签名为 (obj_qubits, ctrl_qubits)
+CONTROLLED = 'controlled'    # 受控门，至少需要两个量子比特
+MEASURE = 'measure'          # 测量操作
+
+GATE_CATALOG = {
+    "h":    (NONE_PARA,),
+    "x":    (NONE_PARA,),
+    "y":    (NONE_PARA,),
+    "z":    (NONE_PARA,),
+    "s":    (NONE_PARA,),
+    "t":    (NONE_PARA,),
+    "sx":   (NONE_PARA,),
+    "swap": (NONE_PARA,),
+    "iswap": (NONE_PARA,),
+    "cnot": (NONE_PARA, CONTROLLED),
+    "cs":   (CONTROLLED,),
+    "ch":   (CONTROLLED,),
+    "cx":   (CONTROLLED,),
+    "cp":   (CONTROLLED,),
+    "mcp":  (CONTROLLED,),
+    "rcx":  (CONTROLLED,),
+    "rccx": (CONTROLLED,),
+    "rcccx": (CONTROLLED,),
+    "crx":  (CONTROLLED,),
+    "cry":  (CONTROLLED,),
+    "crz":  (CONTROLLED,),
+    "csdg": (CONTROLLED,),
+    "cswap": (CONTROLLED,),
+    "csx":  (CONTROLLED,),
+    "cu":   (CONTROLLED,),
+    "ccx":  (CONTROLLED,),
+    "mcx":  (CONTROLLED,),
+    "cy":   (CONTROLLED,),
+    "cz":   (CONTROLLED,),
+    "ccz":  (CONTROLLED,),
+    "measure":     (MEASURE,),
+    "measure_all": (MEASURE,),
+    "Measure":     (MEASURE,),
+}
+
+
+def gates_with(tag):
+    """ 返回带有 tag 标签的全部门名称 """
+    return frozenset(name for name, tags in GATE_CATALOG.items() if tag in tags)
+
+
+NONE_PARA_GATES = gates_with(NONE_PARA)
+CONTROLLED_GATES = gates_with(CONTROLLED)
+MEASURE_GATES = gates_with(MEASURE)
+# Circuit 上签名为 (obj_qubits, ctrl_qubits) 的门方法
+QUBIT_METHODS = NONE_PARA_GATES | CONTROLLED_GATES
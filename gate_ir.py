@@ -0,0 +1,366 @@
+import ast
+
+from gate_catalog import QUBIT_METHODS
+from intervals import eval_expr, loop_env
+from qubits import qubit_mask
+
+
+class SymbolRef(str):
+    """
+    非字面量参数（变量名、属性、表达式等），保留其源码文本，
+    检查时再到变量表中解析其实际值。
+    """
+    __slots__ = ()
+
+
+class ExprRef(SymbolRef):
+    """
+    可以符号求值的表达式参数（如 i + 1、n - 1、range(n)），node 保存其 AST，
+    GateTable 在循环环境下将其求值为 int 或 Interval，无法求值时按 SymbolRef 处理。
+    """
+
+    def __new__(cls, text, node):
+        self = super().__new__(cls, text)
+        self.node = node
+        return self
+
+
+# 可以在循环环境下求值的表达式节点
+_EXPR_NODES = (ast.BinOp, ast.UnaryOp, ast.List, ast.Tuple)
+
+
+def _is_range_call(node):
+    """ range(...) 或 list(range(...)) """
+    if not isinstance(node, ast.Call) or not isinstance(node.func, ast.Name):
+        return False
+    if node.func.id == 'list' and len(node.args) == 1:
+        return _is_range_call(node.args[0])
+    return node.func.id == 'range'
+
+
+class GateCall:
+    """
+    调用链中的一个环节。
+    示例：
+        Circuit().h(0).x(1, 0) => Circuit(), h(0), x(1, 0)
+        CNOT.on(0, 1)          => CNOT, on(0, 1)
+    非调用环节（如 CNOT）的 args 为 None。
+    """
+    __slots__ = ('name', 'obj_qubits', 'ctrl_qubits', 'params', 'args', 'keywords', 'lineno')
+
+    def __init__(self, name, args=None, keywords=(), lineno=0):
+        self.name = name
+        self.args = args
+        self.keywords = keywords
+        self.lineno = lineno
+        self.obj_qubits = None
+        self.ctrl_qubits = None
+        self.params = ()
+        if args is None:
+            return
+        if name == 'on' or name in QUBIT_METHODS:
+            self.obj_qubits = self.arg(0, 'obj_qubits')
+            self.ctrl_qubits = self.arg(1, 'ctrl_qubits')
+        else:
+            self.params = args
+
+    @property
+    def is_call(self):
+        return self.args is not None
+
+    @property
+    def n_args(self):
+        """ 位置参数与关键字参数的总数 """
+        return len(self.args or ()) + len(self.keywords)
+
+    def arg(self, index, keyword=None, default=None):
+        """ 按位置或关键字取参数，不存在时返回 default """
+        if self.args is not None and index < len(self.args):
+            return self.args[index]
+        for key, value in self.keywords:
+            if key == keyword:
+                return value
+        return default
+
+    def all_values(self):
+        """ 位置参数与关键字参数的值 """
+        return list(self.args or ()) + [value for _, value in self.keywords]
+
+    def __repr__(self):
+        if self.args is None:
+            return self.name
+        parts = [repr(a) for a in self.args] + [f"{k}={v!r}" for k, v in self.keywords]
+        return f"{self.name}({', '.join(parts)})"
+
+
+class GateOp:
+    """
+    一条函数调用对应的完整调用链，与 MQ-Operations 中的一个字符串一一对应。
+    作为其他调用的参数出现时（如 Simulator(NoiseBackend(...))），text 保存其源码文本。
+    """
+    __slots__ = ('calls', 'lineno', 'scope', 'text', 'loops', 'node')
+
+    def __init__(self, calls, lineno, text=None, scope='<module>', loops=(), node=None):
+        self.calls = calls
+        self.lineno = lineno
+        self.scope = scope
+        self.text = text
+        self.loops = loops    # 外层循环绑定 (变量名, 迭代表达式, guarded)，由外到内
+        self.node = node      # 对应的 ast.Call 节点，用于在 CFG 中定位程序点
+
+    @property
+    def last(self):
+        """ 调用链最外层（最后执行）的调用 """
+        return self.calls[-1]
+
+    def __str__(self):
+        return self.text if self.text is not None else repr(self)
+
+    def __repr__(self):
+        return '.'.join(repr(call) for call in self.calls)
+
+
+def arg_value(node, memo=None):
+    """
+    将参数节点转换为 IR 中的值：
+      - 字面量 → Python 值
+      - range(...) / list(range(...)) 与算术表达式 → ExprRef（在 GateTable 中符号求值）
+      - 函数调用 → 嵌套的 GateOp
+      - 其他 → SymbolRef（源码文本）
+    """
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.Name):
+        return SymbolRef(node.id)
+    if isinstance(node, ast.Call):
+        if _is_range_call(node):
+            return ExprRef(ast.unparse(node), node)
+        return GateOp(_chain(node, memo), node.lineno, ast.unparse(node))
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError, RecursionError):
+        if isinstance(node, _EXPR_NODES):
+            return ExprRef(ast.unparse(node), node)
+        return SymbolRef(ast.unparse(node))
+
+
+def _chain(node, memo):
+    """
+    返回调用链上按从左到右顺序排列的各环节。
+    memo 以节点为键缓存已构建的链：Circuit().h(0).x(1) 的内层调用同样出现在
+    调用列表中，共享前缀即可避免重复构建。
+    """
+    if memo is not None:
+        cached = memo.get(node)
+        if cached is not None:
+            return cached
+
+    if isinstance(node, ast.Call):
+        func = node.func
+        if isinstance(func, ast.Attribute):
+            prefix = _chain(func.value, memo)
+            name = func.attr
+        elif isinstance(func, ast.Name):
+            prefix = ()
+            name = func.id
+        else:
+            # 如 gates[0](...) / f(1)(2)，只保留被调用对象本身
+            prefix = _chain(func, memo)
+            name = None
+        if name is None:
+            chain = prefix
+        else:
+            args = tuple(arg_value(arg, memo) for arg in node.args)
+            keywords = tuple((kw.arg, arg_value(kw.value, memo)) for kw in node.keywords)
+            chain = prefix + (GateCall(name, args, keywords, node.lineno),)
+    elif isinstance(node, ast.Attribute):
+        chain = _chain(node.value, memo) + (GateCall(node.attr, lineno=node.lineno),)
+    elif isinstance(node, ast.Name):
+        chain = (GateCall(node.id, lineno=node.lineno),)
+    else:
+        chain = (GateCall('', lineno=getattr(node, 'lineno', 0)),)
+
+    if memo is not None:
+        memo[node] = chain
+    return chain
+
+
+def build_gate_op(node, text=None, memo=None, scope='<module>', loops=()):
+    """ 由 ast.Call 节点构建 GateOp """
+    return GateOp(_chain(node, memo), node.lineno, text, scope, loops, node)
+
+
+def build_gate_ops(call_list, scopes=None, loops=None, memo=None):
+    """ 由函数调用节点列表构建 IR，顺序与 MQ-Operations 一致；memo 为调用链缓存，可与其他调用方共用 """
+    if memo is None:
+        memo = {}
+    if scopes is None:
+        return [build_gate_op(call, memo=memo) for call in call_list]
+    if loops is None:
+        return [build_gate_op(call, memo=memo, scope=scope) for call, scope in zip(call_list, scopes)]
+    return [build_gate_op(call, memo=memo, scope=scope, loops=loop)
+            for call, scope, loop in zip(call_list, scopes, loops)]
+
+
+def _is_scalar(value):
+    """ 可作为比特编号比较的值；dict、set 与嵌套列表等不可哈希的字面量视为未知 """
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+def flatten_qubits(values):
+    """ 将 int / list[int] 混合的比特参数展开为一维列表，忽略 None 与不可哈希的值 """
+    flat = []
+    for value in values:
+        if isinstance(value, (list, tuple)):
+            flat.extend(v for v in value if _is_scalar(v))
+        elif value is not None and value != 'None' and _is_scalar(value):
+            flat.append(value)
+    return flat
+
+
+def _as_list(value):
+    if isinstance(value, (list, tuple)):
+        return value
+    return () if value is None else (value,)
+
+
+class GateRow:
+    """
+    门调用表中的一行：调用链上的一个环节及其解析后的参数。
+    index 为该环节在调用链中的位置，chain 为同一调用链上的全部行。
+    """
+    __slots__ = ('pos', 'lineno', 'scope', 'index', 'name', 'call', 'chain',
+                 'args', 'keywords', 'obj_qubits', 'ctrl_qubits', 'qubits')
+
+    @property
+    def is_call(self):
+        return self.args is not None
+
+    @property
+    def n_args(self):
+        """ 位置参数与关键字参数的总数 """
+        return len(self.args or ()) + len(self.keywords)
+
+    def arg(self, index, keyword=None, default=None):
+        """ 按位置或关键字取解析后的参数，不存在时返回 default """
+        if self.args is not None and index < len(self.args):
+            return self.args[index]
+        for key, value in self.keywords:
+            if key == keyword:
+                return value
+        return default
+
+    @property
+    def ctrl_mask(self):
+        """ 控制位的比特掩码（见 qubits.qubit_mask） """
+        return qubit_mask(_as_list(self.ctrl_qubits))
+
+    @property
+    def obj_mask(self):
+        """ 作用位的比特掩码 """
+        return qubit_mask(_as_list(self.obj_qubits))
+
+    def neighbor(self, offset):
+        """ 调用链上相邻的环节，不存在时返回 None """
+        index = self.index + offset
+        if 0 <= index < len(self.chain):
+            return self.chain[index]
+        return None
+
+
+def _as_int(value):
+    """ 变量表中的整数值（可能以字符串保存），其他值返回 None """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and not isinstance(value, SymbolRef):
+        text = value.strip()
+        if text.lstrip('-').isdigit():
+            return int(text)
+    return None
+
+
+def _eval_node(node, env, lookup):
+    """ 列表 / 元组逐个元素求值，其余节点按区间表达式求值，任一元素失败则返回 None """
+    if isinstance(node, (ast.List, ast.Tuple)):
+        values = [_eval_node(elt, env, lookup) for elt in node.elts]
+        return None if any(value is None for value in values) else values
+    return eval_expr(node, env, lookup)
+
+
+def _op_resolver(op, resolve):
+    """ 返回解析 op 中参数值的函数：先在循环环境下符号求值，失败时交给 resolve """
+    lineno, scope = op.lineno, op.scope
+    lookup = lambda name: _as_int(resolve(SymbolRef(name), lineno, scope))
+    env = loop_env(op.loops, lookup) if op.loops else {}
+
+    def resolve_op(value):
+        if isinstance(value, ExprRef):
+            result = _eval_node(value.node, env, lookup)
+            if result is not None:
+                return result
+        elif env and isinstance(value, SymbolRef) and value in env:
+            return env[value]
+        return resolve(value, lineno, scope)
+    return resolve_op
+
+
+class GateTable:
+    """
+    每个文件计算一次的门调用表，所有规则共用。
+    rows 按 MQ-Operations 的顺序展开全部调用链，chains 保留每条调用链的行，
+    by_name 按门名称索引行，避免每条规则重复分解与解析参数。
+    """
+    __slots__ = ('rows', 'chains', 'by_name')
+
+    def __init__(self, gate_ops, resolve):
+        """
+        resolve(value, lineno, scope) 用于解析 SymbolRef，通常为 SymbolTable.resolve。
+        循环变量与 ExprRef 在外层循环环境下符号求值为 int / Interval。
+        """
+        self.rows = []
+        self.chains = []
+        self.by_name = {}
+        for op in gate_ops:
+            resolve_op = _op_resolver(op, resolve)
+            chain = []
+            for index, call in enumerate(op.calls):
+                row = GateRow()
+                row.pos = len(self.rows)
+                row.lineno = op.lineno
+                row.scope = op.scope
+                row.index = index
+                row.name = call.name
+                row.call = call
+                row.chain = chain
+                if call.args is None:
+                    row.args = None
+                    row.keywords = ()
+                    row.obj_qubits = row.ctrl_qubits = None
+                    row.qubits = []
+                else:
+                    row.args = tuple(resolve_op(v) for v in call.args)
+                    row.keywords = tuple((k, resolve_op(v)) for k, v in call.keywords)
+                    row.obj_qubits = resolve_op(call.obj_qubits)
+                    row.ctrl_qubits = resolve_op(call.ctrl_qubits)
+                    row.qubits = flatten_qubits(list(row.args) + [v for _, v in row.keywords])
+                    self.by_name.setdefault(call.name, []).append(row)
+                chain.append(row)
+                self.rows.append(row)
+            self.chains.append(chain)
+
+    def named(self, *names):
+        """ 按原顺序返回名称属于 names 的调用行 """
+        if len(names) == 1:
+            return self.by_name.get(names[0], [])
+        rows = [row for name in set(names) for row in self.by_name.get(name, ())]
+        rows.sort(key=lambda row: row.pos)
+        return rows
+
+    def __len__(self):
+        return len(self.rows)
@@ -0,0 +1,68 @@
+import os
+import subprocess
+
+
+class GitError(Exception):
+    """ git 命令执行失败 """
+
+
+def _git(args, cwd, input_bytes=None):
+    try:
+        proc = subprocess.run(['git', *args], cwd=cwd, input=input_bytes,
+                              stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except OSError as e:
+        raise GitError(f"无法执行 git：{e}") from e
+    if proc.returncode != 0:
+        raise GitError(proc.stderr.decode('utf-8', 'replace').strip())
+    return proc.stdout
+
+
+def git_toplevel(cwd='.'):
+    """ 返回 cwd 所在 git 仓库的根目录 """
+    return _git(['rev-parse', '--show-toplevel'], cwd).decode('utf-8').strip()
+
+
+def git_changed_files(toplevel, rev=None, staged=False, pathspec=None):
+    """
+    列出变化的 .py 与 .ipynb 文件（相对仓库根目录的路径，已排序）：
+      - staged=True：暂存区相对 HEAD 的变化
+      - rev：HEAD 相对 rev 的变化
+    只包含新增、复制、修改与重命名的文件，已删除的文件无需检查。
+    以 - 开头的 rev 会被 git 当作选项解析，抛出 GitError。
+    """
+    args = ['diff', '--name-only', '-z', '--diff-filter=ACMR']
+    if staged:
+        args.append('--cached')
+    else:
+        if not rev or rev.startswith('-'):
+            raise GitError(f"无效的版本：{rev!r}")
+        args += [rev, 'HEAD']
+    args.append('--')
+    args += [os.path.join(pathspec, pattern) if pathspec else pattern for pattern in ('*.py', '*.ipynb')]
+    output = _git(args, toplevel)
+    return sorted(path for path in output.decode('utf-8').split('\0') if path)
+
+
+def git_read_blobs(toplevel, paths, staged=False):
+    """
+    通过一次 git cat-file --batch 批量读取文件内容，返回 {path: bytes}。
+    staged=True 读取暂存区（:path），否则读取 HEAD 中的版本。
+    """
+    if not paths:
+        return {}
+    prefix = ':' if staged else 'HEAD:'
+    request = ''.join(f"{prefix}{path}\n" for path in paths).encode('utf-8')
+    output = _git(['cat-file', '--batch'], toplevel, request)
+
+    blobs = {}
+    offset = 0
+    for path in paths:
+        header_end = output.index(b'\n', offset)
+        header = output[offset:header_end]
+        offset = header_end + 1
+        if header.endswith((b' missing', b' ambiguous')):
+            continue
+        size = int(header.split()[2])
+        blobs[path] = output[offset:offset + size]
+        offset += size + 1  # 内容之后还有一个换行
+    return blobs
@@ -0,0 +1,226 @@
+"""
+常驻内存的增量文档分析（供 --lsp 使用）。
+
+文档按顶层语句切分为块（同一行上以分号分隔的语句归入同一块），每块缓存其 AST、
+MQCollector 的赋值 / 调用记录、变量属性与门操作 IR。编辑后只重新解析与提取
+被修改的块，其余块按行号偏移复用；规则依赖整个文件的事实（Simulator 宽度、
+测量顺序等），因此在缓存的 IR 上重新构建符号表、门调用表与 CFG 并运行检查。
+
+块内 AST 的行号相对于块所在的解析区域，base 为其到文件行号的偏移，
+块整体上下移动时只需修改 base，不必改写 AST 与 IR。
+"""
+import ast
+import gc
+import logging
+
+from ast_operations import MQCollector, get_attribute
+from cfg import build_cfgs
+from gate_ir import GateOp, build_gate_op
+from mindLint import MindLint
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+class _Chunk:
+    """ 一个或多个（同一行上的）顶层语句及其提取结果 """
+    __slots__ = ('start', 'end', 'base', 'stmts', 'assigns', 'calls', '_ops')
+
+    def __init__(self, stmts, base):
+        self.stmts = stmts
+        self.base = base
+        self.start = _first_line(stmts[0]) + base
+        self.end = stmts[-1].end_lineno + base
+        collector = MQCollector()
+        assigns, calls = collector.scan(ast.Module(body=stmts, type_ignores=[]))
+        # (深度, 赋值节点, 作用域, (变量名, 值), 字典键值对)
+        self.assigns = [(depth, node, scope) + get_attribute(node) for depth, node, scope, _ in assigns]
+        # (深度, 门操作 IR)，IR 的行号相对于 base
+        memo = {}
+        self.calls = [(depth, build_gate_op(node, memo=memo, scope=scope, loops=loops))
+                      for depth, node, scope, _, loops in calls]
+        self._ops = None
+
+    def gate_ops(self):
+        """ 行号换算为文件行号的 (深度, 门操作 IR)，块未移动时沿用上次的结果 """
+        if self._ops is None or self._ops[0] != self.base:
+            base = self.base
+            self._ops = base, [(depth, GateOp(op.calls, op.lineno + base, op.text, op.scope, op.loops, op.node))
+                               for depth, op in self.calls]
+        return self._ops[1]
+
+    def shift(self, delta):
+        self.start += delta
+        self.end += delta
+        self.base += delta
+
+
+def _first_line(stmt):
+    """ 语句的首行，含装饰器 """
+    decorators = getattr(stmt, 'decorator_list', None)
+    if decorators:
+        return min(stmt.lineno, min(d.lineno for d in decorators))
+    return stmt.lineno
+
+
+def _chunks(stmts, base):
+    """ 将同一次解析得到的顶层语句按行范围分块 """
+    chunks = []
+    group = []
+    group_end = 0
+    for stmt in stmts:
+        if group and _first_line(stmt) > group_end:
+            chunks.append(_Chunk(group, base))
+            group = []
+        group.append(stmt)
+        group_end = max(group_end, stmt.end_lineno)
+    if group:
+        chunks.append(_Chunk(group, base))
+    return chunks
+
+
+class IncrementalDocument:
+    """
+    一个打开的文档：update() 接收新的全文行列表，与上一版本比较公共前缀 / 后缀，
+    只重新解析其间被修改的块；修改区域无法单独解析时（如括号或字符串跨越块边界）
+    退回整篇解析。issues() 返回与 lint_api.lint_source 相同的结构化问题。
+    """
+
+    def __init__(self, text=''):
+        self.lines = []
+        self.chunks = None          # 存在语法错误时为 None，下次更新整篇解析
+        self.syntax_error = None
+        self._issues = []
+        self._events = {}           # 表达式节点 → CFG 事件，跨版本复用（见 cfg.build_cfgs）
+        self.full_parses = 0
+        self.partial_parses = 0
+        self.update(text.split('\n'))
+
+    @property
+    def text(self):
+        return '\n'.join(self.lines)
+
+    def update(self, lines):
+        """ 以新的行列表更新文档并重新分析，内容未变化时不做任何事 """
+        old = self.lines
+        if lines == old and self.chunks is not None:
+            return
+        if self.chunks is None:
+            self.lines = lines
+            self._parse_full()
+            self._analyze()
+            return
+
+        # 公共前缀 / 后缀之外的行即被修改的区域
+        limit = min(len(old), len(lines))
+        prefix = 0
+        while prefix < limit and old[prefix] == lines[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and old[-1 - suffix] == lines[-1 - suffix]:
+            suffix += 1
+        delta = len(lines) - len(old)
+        self.lines = lines
+
+        before, dirty, after = [], [], []
+        for chunk in self.chunks:
+            if chunk.end <= prefix:
+                before.append(chunk)
+            elif chunk.start > len(old) - suffix:
+                after.append(chunk)
+            else:
+                dirty.append(chunk)
+        start = min([prefix + 1] + [chunk.start for chunk in dirty])
+        end = max([len(old) - suffix] + [chunk.end for chunk in dirty]) + delta
+
+        try:
+            tree = ast.parse('\n'.join(lines[start - 1:end]))
+        except SyntaxError:
+            # 修改区域与相邻的块共同构成语句，或整篇存在语法错误
+            self._parse_full()
+            self._analyze()
+            return
+        self.partial_parses += 1
+        for chunk in dirty:
+            for stmt in chunk.stmts:
+                for node in ast.walk(stmt):
+                    self._events.pop(node, None)
+        for chunk in after:
+            chunk.shift(delta)
+        region = _chunks(tree.body, start - 1)
+        self.chunks = before + region + after
+
+        if delta == 0 and _same_statements(dirty, region):
+            # 只修改了注释、空白等不影响语法树的内容：沿用上次的问题，更新源码行
+            for issue in self._issues:
+                issue['source'] = self.lines[issue['line'] - 1]
+            return
+        self._analyze()
+
+    def _parse_full(self):
+        self.full_parses += 1
+        self._events = {}
+        try:
+            tree = ast.parse('\n'.join(self.lines))
+        except SyntaxError as e:
+            logger.debug("[INFO] 语法错误，暂不分析: %s", e)
+            self.chunks = None
+            self.syntax_error = e
+            return
+        self.syntax_error = None
+        self.chunks = _chunks(tree.body, 0)
+
+    def _analyze(self):
+        """ 由各块缓存的 IR 拼出整个文件的输入并运行全部规则 """
+        if self.chunks is None:
+            self._issues = []
+            return
+        # 上一版本的表与 CFG 在此期间成为垃圾，分代回收会反复扫描常驻的整篇 AST，暂停到检查结束
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self._check()
+        finally:
+            if enabled:
+                gc.enable()
+
+    def _check(self):
+        assigns = []
+        calls = []
+        stmts = []
+        for chunk in self.chunks:
+            base = chunk.base
+            assigns.extend((record, base) for record in chunk.assigns)
+            calls.extend(chunk.gate_ops())
+            stmts.extend(chunk.stmts)
+        # 与 MQCollector.collect 相同：按深度稳定排序即为 ast.walk 的顺序
+        assigns.sort(key=lambda item: item[0][0])
+        calls.sort(key=lambda item: item[0])
+
+        attributes, line_numbers, scopes = [], [], []
+        dict_assign = None
+        for (_, node, scope, attribute, pairs), base in assigns:
+            attributes.append(attribute)
+            line_numbers.append(node.lineno + base)
+            scopes.append(scope)
+            if pairs is not None:
+                dict_assign = pairs
+        if dict_assign:
+            attributes.extend(dict_assign)
+        gate_ops = [op for _, op in calls]
+        file_cfg = build_cfgs(ast.Module(body=stmts, type_ignores=[]), self._events)
+
+        checker = MindLint()
+        self._issues = list(checker.iter_check(attributes, line_numbers, gate_ops, self.lines,
+                                               scopes, file_cfg))
+
+    def issues(self):
+        """ 当前版本的结构化问题（rule / severity / line / message / source） """
+        return self._issues
+
+
+def _same_statements(old_chunks, new_chunks):
+    """ 两组块的语句是否相同（忽略行列号） """
+    old = [stmt for chunk in old_chunks for stmt in chunk.stmts]
+    new = [stmt for chunk in new_chunks for stmt in chunk.stmts]
+    return len(old) == len(new) and all(ast.dump(a) == ast.dump(b) for a, b in zip(old, new))
@@ -0,0 +1,268 @@
+"""
+循环变量与比特下标表达式的符号区间分析。
+
+for i in range(n) 中的 i 不逐次展开，而是表示为等差区间 {lo, lo+step, ..., hi}；
+下标表达式（i + 1、2 * i、(i + 1) % n 等）在区间上直接求值，
+分析代价与循环次数无关，只与表达式大小有关。
+
+exact 为 True 表示区间中的每个值都一定会被取到（循环必定完整执行、
+表达式为单个循环变量的仿射变换等）；为 False 时只保证取值落在 [lo, hi] 内，
+规则据此只对 exact 区间报告问题，避免误报。
+"""
+import ast
+from math import gcd
+
+
+class Interval:
+    """ 等差整数区间 {lo, lo + step, ..., hi}，step >= 1 """
+    __slots__ = ('lo', 'hi', 'step', 'exact')
+
+    def __init__(self, lo, hi, step=1, exact=True):
+        self.lo = lo
+        self.hi = hi
+        self.step = step
+        self.exact = exact
+
+    @property
+    def count(self):
+        return (self.hi - self.lo) // self.step + 1
+
+    def inexact(self):
+        return Interval(self.lo, self.hi, 1, False)
+
+    def mask(self, limit):
+        """
+        区间内小于 limit 的非负值组成的比特掩码。
+        step 为 1 时是一次移位运算，否则按倍增构造，代价为 O(log count) 次大整数运算。
+        """
+        lo, hi, step = self.lo, min(self.hi, limit - 1), self.step
+        if lo < 0:
+            lo += (-lo + step - 1) // step * step
+        if hi < lo:
+            return 0
+        if step == 1:
+            return ((1 << (hi - lo + 1)) - 1) << lo
+        # block 为 size 个间隔 step 的比特，按 count 的二进制位依次拼接
+        count = (hi - lo) // step + 1
+        mask, placed = 0, 0
+        block, size = 1, 1
+        while count:
+            if count & 1:
+                mask |= block << (placed * step)
+                placed += size
+            count >>= 1
+            if count:
+                block |= block << (size * step)
+                size *= 2
+        return mask << lo
+
+    def __add__(self, other):
+        if isinstance(other, int):
+            return Interval(self.lo + other, self.hi + other, self.step, self.exact)
+        if isinstance(other, Interval):
+            # 两个循环变量之和：取值范围正确，但不保证每个值都取到
+            return Interval(self.lo + other.lo, self.hi + other.hi, 1, False)
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __neg__(self):
+        return Interval(-self.hi, -self.lo, self.step, self.exact)
+
+    def __sub__(self, other):
+        if isinstance(other, (int, Interval)):
+            return self + (-other)
+        return NotImplemented
+
+    def __rsub__(self, other):
+        if isinstance(other, int):
+            return (-self) + other
+        return NotImplemented
+
+    def __mul__(self, other):
+        if isinstance(other, int):
+            if other == 0:
+                return 0
+            if other > 0:
+                return Interval(self.lo * other, self.hi * other, self.step * other, self.exact)
+            return Interval(self.hi * other, self.lo * other, self.step * -other, self.exact)
+        if isinstance(other, Interval):
+            corners = (self.lo * other.lo, self.lo * other.hi, self.hi * other.lo, self.hi * other.hi)
+            return Interval(min(corners), max(corners), 1, False)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __floordiv__(self, other):
+        if not isinstance(other, int) or other <= 0:
+            return NotImplemented
+        lo, hi = self.lo // other, self.hi // other
+        if self.step == 1:
+            return Interval(lo, hi, 1, self.exact)
+        if self.step % other == 0:
+            return Interval(lo, hi, self.step // other, self.exact)
+        return Interval(lo, hi, 1, False)
+
+    def __mod__(self, other):
+        if not isinstance(other, int) or other <= 0:
+            return NotImplemented
+        if self.count >= other and gcd(self.step, other) == 1:
+            # 连续 other 个以上的值（步长与模数互素）覆盖全部余数
+            return Interval(0, other - 1, 1, self.exact)
+        if self.lo >= 0 and self.hi < other:
+            return self
+        return Interval(0, other - 1, 1, False)
+
+    def __eq__(self, other):
+        return self is other
+
+    __hash__ = object.__hash__
+
+    def __repr__(self):
+        step = f", step={self.step}" if self.step != 1 else ""
+        exact = "" if self.exact else ", inexact"
+        return f"Interval({self.lo}..{self.hi}{step}{exact})"
+
+    __str__ = __repr__
+
+
+def make_interval(lo, hi, step=1, exact=True):
+    """ 构造区间，只有一个值时返回 int，为空时返回 None """
+    if hi < lo:
+        return None
+    if lo == hi:
+        return lo if exact else Interval(lo, hi, 1, False)
+    return Interval(lo, hi, step, exact)
+
+
+def range_interval(start, stop, step=1):
+    """
+    range(start, stop, step) 的取值区间，参数为 int 或 Interval（依赖外层循环变量）。
+    空区间返回 None；参数依赖外层循环时结果不再 exact。
+    """
+    if not all(isinstance(v, (int, Interval)) for v in (start, stop)):
+        return None
+    if not isinstance(step, int) or step == 0:
+        return None
+    if isinstance(start, Interval) or isinstance(stop, Interval):
+        start_lo = start.lo if isinstance(start, Interval) else start
+        start_hi = start.hi if isinstance(start, Interval) else start
+        stop_lo = stop.lo if isinstance(stop, Interval) else stop
+        stop_hi = stop.hi if isinstance(stop, Interval) else stop
+        if step > 0:
+            return make_interval(start_lo, stop_hi - 1, 1, False)
+        return make_interval(stop_lo + 1, start_hi, 1, False)
+    if step > 0:
+        if stop <= start:
+            return None
+        last = start + (stop - 1 - start) // step * step
+        return make_interval(start, last, step)
+    if stop >= start:
+        return None
+    last = start - (start - stop - 1) // -step * -step
+    return make_interval(last, start, -step)
+
+
+_BINOPS = {
+    ast.Add: lambda a, b: a + b,
+    ast.Sub: lambda a, b: a - b,
+    ast.Mult: lambda a, b: a * b,
+    ast.FloorDiv: lambda a, b: a // b,
+    ast.Mod: lambda a, b: a % b,
+    ast.Pow: lambda a, b: _pow(a, b),
+}
+
+# 幂运算的指数上限，避免 2 ** 10**9 之类的表达式在分析时生成巨大整数
+MAX_EXPONENT = 64
+
+
+def _pow(base, exponent):
+    if isinstance(base, int) and isinstance(exponent, int) and 0 <= exponent <= MAX_EXPONENT:
+        return base ** exponent
+    return None
+
+
+def eval_expr(node, env, lookup):
+    """
+    在循环环境 env（变量名 → int/Interval）下对表达式节点求值，
+    其余变量通过 lookup(name) 取整数值。无法求值时返回 None。
+    """
+    if isinstance(node, ast.Constant):
+        value = node.value
+        return value if isinstance(value, int) and not isinstance(value, bool) else None
+    if isinstance(node, ast.Name):
+        if node.id in env:
+            return env[node.id]
+        return lookup(node.id)
+    if isinstance(node, ast.UnaryOp):
+        operand = eval_expr(node.operand, env, lookup)
+        if operand is None:
+            return None
+        if isinstance(node.op, ast.USub):
+            return -operand
+        if isinstance(node.op, ast.UAdd):
+            return operand
+        return None
+    if isinstance(node, ast.BinOp):
+        op = _BINOPS.get(type(node.op))
+        if op is None:
+            return None
+        left = eval_expr(node.left, env, lookup)
+        if left is None:
+            return None
+        right = eval_expr(node.right, env, lookup)
+        if right is None:
+            return None
+        if isinstance(left, int) and isinstance(right, Interval) and type(node.op) in (ast.FloorDiv, ast.Mod):
+            return None
+        if isinstance(right, int) and right == 0 and type(node.op) in (ast.FloorDiv, ast.Mod):
+            return None
+        try:
+            result = op(left, right)
+        except TypeError:
+            return None
+        return None if result is None else _normalize(result)
+    if isinstance(node, ast.Call):
+        return eval_range_call(node, env, lookup)
+    return None
+
+
+def eval_range_call(node, env, lookup):
+    """ range(...) 或 list(range(...)) 调用的取值区间，其他调用返回 None """
+    func = node.func
+    if not isinstance(func, ast.Name) or node.keywords:
+        return None
+    if func.id == 'list' and len(node.args) == 1 and isinstance(node.args[0], ast.Call):
+        return eval_range_call(node.args[0], env, lookup)
+    if func.id != 'range' or not 1 <= len(node.args) <= 3:
+        return None
+    values = [eval_expr(arg, env, lookup) for arg in node.args]
+    if any(value is None for value in values):
+        return None
+    if len(values) == 1:
+        return range_interval(0, values[0])
+    return range_interval(*values)
+
+
+def _normalize(value):
+    if isinstance(value, Interval) and value.lo == value.hi:
+        return value.lo if value.exact else value
+    return value
+
+
+def loop_env(loops, lookup):
+    """
+    由外到内依次求出循环变量的区间。loops 为 (变量名, 迭代表达式节点, guarded) 序列，
+    guarded 表示调用处在循环体内的条件分支中或循环可能提前结束，此时区间不再 exact。
+    无法求值或循环不会执行的变量不放入环境。
+    """
+    env = {}
+    for name, iter_node, guarded in loops:
+        value = eval_expr(iter_node, env, lookup) if iter_node is not None else None
+        if isinstance(value, Interval):
+            env[name] = value.inexact() if guarded else value
+        elif isinstance(value, int):
+            env[name] = Interval(value, value, 1, False) if guarded else value
+        else:
+            env.pop(name, None)
+    return env
@@ -0,0 +1,47 @@
+"""
+按需构建的源码行索引：报告问题时才需要源码行，没有问题的文件不应为此切分整个文件。
+
+LineIndex 包装读入的 bytes（或 str），第一次取行时扫描一遍换行符，
+只记录每行的起始偏移（紧凑的整数数组），取行时再切片并解码，
+行号与 content.split('\\n') 一致（\\r\\n 与 \\r 按换行处理，与文本模式读取相同）。
+"""
+from array import array
+
+
+class LineIndex:
+    """ 只读的行序列：index[i] 为第 i 行（从 0 开始，不含换行符），len() 为行数 """
+    __slots__ = ('data', '_starts')
+
+    def __init__(self, data):
+        self.data = data
+        self._starts = None
+
+    def _build(self):
+        data = self.data
+        newline, cr = ('\n', '\r') if isinstance(data, str) else (b'\n', b'\r')
+        if cr in data:
+            # 少见的 \r\n / \r 换行：统一后再建索引（只在需要取行时发生）
+            data = self.data = data.replace(cr + newline, newline).replace(cr, newline)
+        starts = array('q', [0])
+        find = data.find
+        pos = find(newline)
+        while pos != -1:
+            starts.append(pos + 1)
+            pos = find(newline, pos + 1)
+        self._starts = starts
+        return starts
+
+    def __len__(self):
+        starts = self._starts if self._starts is not None else self._build()
+        return len(starts)
+
+    def __getitem__(self, index):
+        starts = self._starts if self._starts is not None else self._build()
+        count = len(starts)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError('line index out of range')
+        end = starts[index + 1] - 1 if index + 1 < count else len(self.data)
+        line = self.data[starts[index]:end]
+        return line if isinstance(line, str) else line.decode('utf-8', 'replace')
@@ -0,0 +1,99 @@
+"""
+以库的形式嵌入 MindLint 的流式接口。
+
+所有函数都是生成器：每分析完一个规则阶段就产出该文件已发现的问题，
+调用方可以边分析边消费，不需要等待整个语料完成，也不会在内存中累积报告。
+这里不向 stdout 输出，也不写任何文件（包括 result/ 目录与结果缓存）。
+
+每条问题是一个字典，字段与 --output 的 JSONL 记录一致：
+    {"file", "rule", "severity", "line", "message", "source"}
+notebook（.ipynb）中的问题另有 "cell" 字段，"line" 为单元内的行号。
+
+示例:
+    from lint_api import lint_source, lint_paths
+
+    for issue in lint_source(code, path='submission.py'):
+        print(issue['line'], issue['message'])
+
+    for issue in lint_paths(['data/']):
+        ...
+"""
+import logging
+import os
+
+from ast_operations import Ast_parser
+from line_index import LineIndex
+from notebook import SOURCE_SUFFIXES, NotebookError, is_notebook, read_notebook
+from mindLint import MindLint
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+SOURCE_PATH = '<string>'
+
+
+def lint_source(source, path=SOURCE_PATH, file_lines=None):
+    """
+    分析内存中的源码（str 或 bytes），逐条产出问题；存在语法错误时不产出任何问题。
+    file_lines 为问题定位所用的行索引，默认按 source 建立（notebook 使用 NotebookLines）。
+    """
+    ast_parser = Ast_parser()
+    if ast_parser.parser(source) is None:
+        return
+    collected = ast_parser.collect()
+    if file_lines is None:
+        file_lines = LineIndex(source)
+    checker = MindLint()
+    for issue in checker.iter_check(collected.attributes, collected.att_line_numbers,
+                                    collected.gate_ops, file_lines, collected.assign_scopes,
+                                    collected.cfgs):
+        record = {'file': path}
+        record.update(issue)
+        yield record
+
+
+def iter_py_files(path):
+    """ 惰性展开路径：文件直接返回，目录按名称顺序递归产出其中的 .py 与 .ipynb 文件 """
+    if not os.path.isdir(path):
+        yield path
+        return
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for file in sorted(files):
+            if file.endswith(SOURCE_SUFFIXES):
+                yield os.path.join(root, file)
+
+
+def lint_file(file_path):
+    """ 读取并分析单个文件，逐条产出问题；无法读取时记录日志并跳过 """
+    if is_notebook(file_path):
+        # notebook 从文件流式扫描，不把输出整个读入内存
+        try:
+            source, file_lines = read_notebook(file_path)
+        except OSError as e:
+            logger.error("[❌] 无法读取文件：%s，错误：%s", file_path, e)
+            return
+        except NotebookError as e:
+            logger.error("[❌] 无法解析 notebook：%s，错误：%s", file_path, e)
+            return
+        yield from lint_source(source, file_path, file_lines)
+        return
+    try:
+        with open(file_path, 'rb') as f:
+            source = f.read()
+    except OSError as e:
+        logger.error("[❌] 无法读取文件：%s，错误：%s", file_path, e)
+        return
+    yield from lint_source(source, file_path)
+
+
+def lint_paths(paths):
+    """
+    依次分析 paths 中的文件与目录（目录递归查找 .py 与 .ipynb 文件），逐条产出问题。
+    paths 可以是任意可迭代对象（包括生成器），同一时刻只持有一个文件的内容与报告。
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+    for path in paths:
+        for file_path in iter_py_files(os.fspath(path)):
+            yield from lint_file(file_path)
@@ -0,0 +1,226 @@
+"""
+MindLint 的 LSP（Language Server Protocol）服务，经 stdin / stdout 通信。
+
+    python main.py --lsp
+
+编辑器打开或修改文档时，服务在内存中维护每个文档的 IncrementalDocument（见 incremental.py），
+只重新解析被修改的语句，并以 textDocument/publishDiagnostics 推送 MindLint 的问题。
+支持的消息：initialize、initialized、shutdown、exit、textDocument/didOpen、didChange
+（全量或增量同步）、didSave、didClose。日志输出到 stderr，不干扰协议数据。
+"""
+import json
+import logging
+import sys
+import time
+
+from incremental import IncrementalDocument
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+SERVER_NAME = 'mindlint'
+SEVERITIES = {'error': 1, 'warning': 2}
+
+# JSON-RPC 错误码
+METHOD_NOT_FOUND = -32601
+INTERNAL_ERROR = -32603
+
+# TextDocumentSyncKind.Incremental
+SYNC_INCREMENTAL = 2
+
+
+def read_message(stream):
+    """ 读取一条以 Content-Length 头分帧的消息，输入结束时返回 None """
+    length = None
+    while True:
+        line = stream.readline()
+        if not line:
+            return None
+        line = line.strip()
+        if not line:
+            break
+        name, _, value = line.decode('ascii').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value.strip())
+    if length is None:
+        return None
+    body = stream.read(length)
+    if len(body) < length:
+        return None
+    return json.loads(body.decode('utf-8'))
+
+
+def write_message(stream, message):
+    body = json.dumps(message, ensure_ascii=False).encode('utf-8')
+    stream.write(b'Content-Length: %d\r\n\r\n' % len(body))
+    stream.write(body)
+    stream.flush()
+
+
+def handler_name(method):
+    """ JSON-RPC 方法名 → 处理方法名：textDocument/didOpen → on_textDocument_didOpen，$/cancelRequest → on_cancelRequest """
+    if method.startswith('$/'):
+        method = method[2:]
+    return 'on_' + method.replace('/', '_')
+
+
+def _utf16_len(text):
+    return len(text.encode('utf-16-le')) // 2
+
+
+def _column(line, character):
+    """ LSP 位置中的 UTF-16 列号 → Python 字符串下标 """
+    if character <= 0:
+        return 0
+    units = 0
+    for index, ch in enumerate(line):
+        units += 2 if ord(ch) > 0xFFFF else 1
+        if units > character:
+            return index
+        if units == character:
+            return index + 1
+    return len(line)
+
+
+def apply_change(lines, change):
+    """ 将 didChange 中的一项修改应用到行列表，返回新的行列表 """
+    if 'range' not in change:
+        return change['text'].split('\n')
+    start, end = change['range']['start'], change['range']['end']
+    start_line = min(start['line'], len(lines) - 1)
+    end_line = min(end['line'], len(lines) - 1)
+    head = lines[start_line][:_column(lines[start_line], start['character'])]
+    tail = lines[end_line][_column(lines[end_line], end['character']):]
+    replaced = (head + change['text'] + tail).split('\n')
+    return lines[:start_line] + replaced + lines[end_line + 1:]
+
+
+def to_diagnostic(issue, lines):
+    """ MindLint 的结构化问题 → LSP Diagnostic，范围为问题所在行的非空白部分 """
+    line = issue['line'] - 1
+    text = lines[line] if 0 <= line < len(lines) else ''
+    stripped = text.rstrip('\r')
+    indent = len(stripped) - len(stripped.lstrip())
+    return {
+        'range': {
+            'start': {'line': line, 'character': _utf16_len(stripped[:indent])},
+            'end': {'line': line, 'character': _utf16_len(stripped)},
+        },
+        'severity': SEVERITIES.get(issue['severity'], 2),
+        'source': SERVER_NAME,
+        'code': issue['rule'],
+        'message': issue['message'],
+    }
+
+
+class LanguageServer:
+    """ 按 JSON-RPC 方法名分派消息，documents 保存每个打开文档的增量分析状态 """
+
+    def __init__(self, output):
+        self.output = output
+        self.documents = {}
+        self.shutdown_requested = False
+        self.exit_code = None
+
+    def handle(self, message):
+        method = message.get('method')
+        if method is None:
+            return      # 客户端对服务端请求的响应，忽略
+        handler = getattr(self, handler_name(method), None)
+        is_request = 'id' in message
+        if handler is None:
+            if is_request:
+                self.respond_error(message['id'], METHOD_NOT_FOUND, f"未知方法: {method}")
+            return
+        try:
+            result = handler(message.get('params') or {})
+        except Exception as e:
+            logger.exception("[❌] 处理 %s 失败", method)
+            if is_request:
+                self.respond_error(message['id'], INTERNAL_ERROR, str(e))
+            return
+        if is_request:
+            write_message(self.output, {'jsonrpc': '2.0', 'id': message['id'], 'result': result})
+
+    def respond_error(self, request_id, code, text):
+        write_message(self.output, {'jsonrpc': '2.0', 'id': request_id,
+                                    'error': {'code': code, 'message': text}})
+
+    def notify(self, method, params):
+        write_message(self.output, {'jsonrpc': '2.0', 'method': method, 'params': params})
+
+    # —— 生命周期 —— #
+    def on_initialize(self, params):
+        return {
+            'capabilities': {
+                'textDocumentSync': {'openClose': True, 'change': SYNC_INCREMENTAL,
+                                     'save': {'includeText': False}},
+            },
+            'serverInfo': {'name': SERVER_NAME},
+        }
+
+    def on_initialized(self, params):
+        logger.info("[INFO] LSP 客户端已连接")
+
+    def on_shutdown(self, params):
+        self.shutdown_requested = True
+        return None
+
+    def on_exit(self, params):
+        self.exit_code = 0 if self.shutdown_requested else 1
+
+    def on_cancelRequest(self, params):
+        # 所有请求都按顺序同步处理，收到取消通知时对应的请求已经完成
+        logger.debug("[INFO] 请求 %s 已处理完毕，忽略取消", params.get('id'))
+
+    # —— 文档同步 —— #
+    def on_textDocument_didOpen(self, params):
+        document = params['textDocument']
+        uri = document['uri']
+        self.documents[uri] = self._timed(uri, IncrementalDocument, document['text'])
+        self.publish(uri)
+
+    def on_textDocument_didChange(self, params):
+        uri = params['textDocument']['uri']
+        doc = self.documents.get(uri)
+        if doc is None:
+            return
+        lines = doc.lines
+        for change in params['contentChanges']:
+            lines = apply_change(lines, change)
+        self._timed(uri, doc.update, lines)
+        self.publish(uri)
+
+    def on_textDocument_didSave(self, params):
+        pass    # 修改时已经分析过
+
+    def on_textDocument_didClose(self, params):
+        uri = params['textDocument']['uri']
+        self.documents.pop(uri, None)
+        self.notify('textDocument/publishDiagnostics', {'uri': uri, 'diagnostics': []})
+
+    def publish(self, uri):
+        doc = self.documents[uri]
+        diagnostics = [to_diagnostic(issue, doc.lines) for issue in doc.issues()]
+        self.notify('textDocument/publishDiagnostics', {'uri': uri, 'diagnostics': diagnostics})
+
+    @staticmethod
+    def _timed(uri, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        logger.debug("[INFO] 分析 %s 用时 %.1f ms", uri, (time.perf_counter() - start) * 1000)
+        return result
+
+
+def serve(stdin=None, stdout=None):
+    """ 运行 LSP 服务直到收到 exit 或输入结束，返回进程退出码 """
+    stdin = stdin or sys.stdin.buffer
+    stdout = stdout or sys.stdout.buffer
+    server = LanguageServer(stdout)
+    logger.info("[INFO] MindLint LSP 服务已启动")
+    while server.exit_code is None:
+        message = read_message(stdin)
+        if message is None:
+            return 0 if server.shutdown_requested else 1
+        server.handle(message)
+    return server.exit_code
@@ -1,8 +1,52 @@
 import os
+import io
 import sys
+import time
 import argparse
-from mindLint import MindLint
-from ast_operations import Ast_parser, get_attributes, get_operations
+import contextlib
+import functools
+import logging
+from mindLint import Facts, MindLint, ruleset_version
+from ast_operations import Ast_parser
+from line_index import LineIndex
+from notebook import NOTEBOOK_SUFFIX, SOURCE_SUFFIXES, NotebookError, is_notebook, load_notebook, read_notebook
+from result_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, ResultCache
+from prefilter import PREFILTER
+from report_writer import REPORT_WRITERS, open_report_writer
+from metrics import METRICS, timed, write_json, write_prometheus
+from rule_registry import REGISTRY
+from rule_scheduler import schedule_for
+# 进程池（multiprocessing）、git、监听与 LSP 模块只在对应模式下导入，
+# 单文件 / 少量文件的运行（如 pre-commit）不为用不到的功能付出启动时间
+
+logger = logging.getLogger('mindlint')
+
+# 日志级别：--quiet 只输出错误；默认（批处理）只保留警告与报告文件；-v 输出进度与报告；-vv 输出提取信息与规则细节
+LOG_LEVELS = [logging.ERROR, logging.WARNING, logging.INFO, logging.DEBUG]
+
+
+def configure_logging(level, stream=None):
+    """配置根日志记录器：消息原样输出到 stream（默认 stdout），各模块的 logger 都会传递到这里。"""
+    handler = logging.StreamHandler(stream or sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(level)
+
+
+@contextlib.contextmanager
+def capture_logs(buffer):
+    """临时把根日志记录器的输出重定向到 buffer（供进程池工作进程回传日志）。"""
+    root = logging.getLogger()
+    saved = root.handlers[:]
+    handler = logging.StreamHandler(buffer)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    root.handlers[:] = [handler]
+    try:
+        yield buffer
+    finally:
+        root.handlers[:] = saved
+
 
 def save_report(report: dict, file_path: str):
     """将结构化报告保存为可读性强的文本文件（根据错误/警告自动加后缀）."""
@@ -11,7 +55,13 @@ def save_report(report: dict, file_path: str):
     os.makedirs(result_dir, exist_ok=True)
 
     # 确定基本文件名
-    filename = os.path.basename(file_path).replace('.py', '')
+    filename = os.path.basename(file_path)
+    if is_notebook(filename):
+        # 与同名 .py 文件的报告区分
+        filename = filename[:-len(NOTEBOOK_SUFFIX)] + '_ipynb'
+    else:
+        filename = filename.replace('.py', '')
+    base_filename = filename
 
     # 根据错误/警告情况修改文件名
     if report["errors"]:
@@ -23,6 +73,12 @@ def save_report(report: dict, file_path: str):
 
     result_file_path = os.path.join(result_dir, f"result_{filename}.txt")
 
+    # 删除同一源文件上一次结果留下的其他后缀报告，避免新旧报告并存
+    for suffix in ("", "_e", "_w"):
+        stale_path = os.path.join(result_dir, f"result_{base_filename}{suffix}.txt")
+        if stale_path != result_file_path and os.path.exists(stale_path):
+            os.remove(stale_path)
+
     # 构建人类可读文本内容
     report_text = ""
 
@@ -46,91 +102,450 @@ def save_report(report: dict, file_path: str):
     try:
         with open(result_file_path, 'w', encoding='utf-8') as f:
             f.write(report_text)
-        print(f"📄 报告已保存至：{result_file_path}")
+        logger.info("📄 报告已保存至：%s", result_file_path)
     except Exception as e:
-        print(f"[❌] 报告保存失败：{e}")
+        logger.error("[❌] 报告保存失败：%s", e)
 
 
 def read_file(file_path):
-    """读取单个文件内容。"""
+    """
+    以字节一次读入单个文件内容：预筛选、结果缓存键与 ast.parse 都直接使用 bytes
+    （ast.parse 按 UTF-8 / 编码声明解码），不另外生成解码后的字符串与行列表。
+    """
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            content = file.read()
-            return content, content.split('\n')
+        with open(file_path, 'rb') as file:
+            return file.read()
     except Exception as e:
-        print(f"[❌] 无法读取文件：{file_path}，错误：{e}")
-        return None, None
+        logger.error("[❌] 无法读取文件：%s，错误：%s", file_path, e)
+        return None
+
+
+def empty_report():
+    """预筛选跳过的文件的报告：与没有发现问题的检查结果相同。"""
+    return {"errors": [], "warnings": [], "issues": []}
 
 
 def parse_ast(file_content):
-    """构建AST并提取变量赋值与函数调用。"""
+    """构建AST并单次遍历提取变量赋值与函数调用。"""
     ast_parser = Ast_parser()
-    root = ast_parser.parser(file_content)
-    assign_list = ast_parser.extract_variable_assign()
-    call_list = ast_parser.extract_function_calls()
-    return assign_list, call_list
-
-def analyze_file(file_path):
-    """分析单个文件流程。"""
-    print(f"\n📂 分析文件: {file_path}")
-    file_content, file_lines = read_file(file_path)
-    if not file_content:
-        return
+    with timed('parse'):
+        ast_parser.parser(file_content)
+    with timed('extract'):
+        return ast_parser.collect()
 
-    assign_list, call_list = parse_ast(file_content)
-    attributes, att_line_numbers = get_attributes(assign_list)
-    operations, opt_line_numbers = get_operations(call_list)
+# 每个工作进程处理的文件数上限，超过后由新进程替换以限制内存增长
+WORKER_MAX_TASKS = 200
 
-    # 输出提取信息
-    print('\n📌 MQ_Attributes:')
-    print('==========================================')
-    print(attributes, '\n')
 
-    print('📌 MQ_Operations:')
-    print('==========================================')
-    print(operations, '\n')
+def lint_file(file_path, result_cache=None):
+    """
+    分析单个文件并返回结构化报告（不保存），无法读取时返回 None。
+    给定 result_cache 时，内容未变化的文件直接返回缓存的报告。
+    """
+    logger.info("\n📂 分析文件: %s", file_path)
+    start = time.perf_counter()
+    if is_notebook(file_path):
+        # notebook 从文件流式扫描，输出中的大块数据边读边丢弃，不整个读入内存
+        report = lint_notebook(file_path, read_notebook, file_path, result_cache=result_cache)
+    else:
+        with timed('read'):
+            data = read_file(file_path)
+        if not data:
+            return None
+        report = lint_data(file_path, data, result_cache)
+    if METRICS.enabled:
+        METRICS.record_file(file_path, time.perf_counter() - start)
+    return report
+
+def lint_data(file_path, data, result_cache=None):
+    """
+    分析已读入的文件内容（bytes）：notebook 先取出代码单元，再经预筛选与 lint_source。
+    没有可分析的内容（空 notebook、notebook 格式错误）时返回 None。
+    """
+    if is_notebook(file_path):
+        return lint_notebook(file_path, load_notebook, data, result_cache=result_cache)
+    # 源码行只在报告问题时按需建立索引
+    return lint_prefiltered(data, LineIndex(data), result_cache)
+
+def lint_notebook(file_path, load, source, result_cache=None):
+    """
+    由 load(source)（load_notebook 或 read_notebook）取出 notebook 的代码单元并分析。
+    空 notebook、无法读取或格式错误时返回 None。
+    """
+    with timed('notebook'):
+        try:
+            text, file_lines = load(source)
+        except OSError as e:
+            logger.error("[❌] 无法读取文件：%s，错误：%s", file_path, e)
+            return None
+        except NotebookError as e:
+            logger.error("[❌] 无法解析 notebook：%s，错误：%s", file_path, e)
+            return None
+    data = text.encode('utf-8')
+    if not data:
+        return None
+    # 问题按单元定位，单元的位置变化（如插入 Markdown 单元）同样使缓存失效
+    key_data = data + b'\0' + repr(list(zip(file_lines.cells, file_lines.cell_starts))).encode('ascii')
+    return lint_prefiltered(data, file_lines, result_cache, key_data)
+
+def lint_prefiltered(data, file_lines, result_cache=None, key_data=None):
+    """ 预筛选判定与 MindQuantum 无关时返回空报告，否则执行 lint_source """
+    with timed('prefilter'):
+        relevant = PREFILTER.relevant(data)
+    if not relevant:
+        logger.info("[INFO] 未发现 MindQuantum 相关调用，跳过解析")
+        return empty_report()
+    return lint_source(data, file_lines, result_cache, key_data)
+
+def lint_source(file_content, file_lines, result_cache=None, key_data=None):
+    """
+    对已读入的源码（bytes 或 str）执行 parse_ast → MindLint.check 流程，返回结构化报告。
+    file_lines 为可按下标取行的序列（LineIndex 或行列表），只用于问题中的源码行；
+    key_data 为计算结果缓存键的内容，默认为 file_content。
+    """
+    cache_key = None
+    if result_cache is not None:
+        with timed('cache'):
+            cache_key = result_cache.key(file_content if key_data is None else key_data)
+            report = result_cache.get(cache_key)
+        if report is not None:
+            logger.info('[INFO] 文件内容未变化，使用缓存的检查报告')
+            logger.debug('\n📋 检查报告:\n==========================================\n%s', report)
+            return report
+
+    collected = parse_ast(file_content)
+    attributes, att_line_numbers = collected.attributes, collected.att_line_numbers
+
+    # 输出提取信息（列表可能很长，MQ-Operations 也只在 DEBUG 级别才构建）
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug('\n📌 MQ_Attributes:\n==========================================\n%s\n', attributes)
+        logger.debug('📌 MQ_Operations:\n==========================================\n%s\n', collected.operations)
 
     checker = MindLint()
-    checker.check(attributes, att_line_numbers, operations, opt_line_numbers, file_lines)
+    checker.check(attributes, att_line_numbers, collected.gate_ops, file_lines, collected.assign_scopes,
+                  collected.cfgs)
+
+    with timed('report'):
+        report = checker.get_report()
+    logger.debug('\n📋 检查报告:\n==========================================\n%s', report)
+
+    if result_cache is not None:
+        with timed('cache'):
+            result_cache.put(cache_key, report)
+    return report
+
+def guarded_lint(file_path, lint, *args):
+    """
+    串行分析与进程池共用的容错包装：lint(file_path, *args) 抛出异常时记录错误并返回 None，
+    一个文件分析失败不会中断整个运行（--jobs 只影响速度，不影响行为）。
+    """
+    try:
+        return lint(file_path, *args)
+    except Exception as e:
+        logger.error("[❌] 分析失败：%s，错误：%s", file_path, e)
+        return None
+
+def analyze_file(file_path, result_cache=None, save=save_report):
+    """分析单个文件流程，save 为报告输出函数（默认写入 result/ 目录）。"""
+    report = guarded_lint(file_path, lint_file, result_cache)
+    if report is not None:
+        with timed('save'):
+            save(report, file_path)  # ✅ 保存报告
 
-    report = checker.get_report()
-    print('\n📋 检查报告:')
-    print('==========================================')
-    print(report)
+def _init_worker(log_level, metrics_enabled=False, prefilter_enabled=True,
+                 manifests=(), selected=None):
+    """进程池初始化：同步日志级别、性能统计与预筛选开关，以及规则清单与选中的规则。"""
+    for path in manifests:
+        REGISTRY.add_manifest(path)
+    if selected is not None:
+        REGISTRY.select(selected)
+    configure_logging(log_level)
+    METRICS.enabled = metrics_enabled
+    PREFILTER.enabled = prefilter_enabled
 
-    save_report(report, file_path)  # ✅ 保存报告
+def _lint_worker(file_path, result_cache=None):
+    """进程池工作函数：捕获日志，只返回路径、报告、日志文本、缓存命中与写入量、预筛选标记、性能统计等紧凑结果。"""
+    buffer = io.StringIO()
+    hits = result_cache.hits if result_cache is not None else 0
+    written = result_cache.written if result_cache is not None else 0
+    checked, skipped = PREFILTER.checked, PREFILTER.skipped
+    METRICS.reset()
+    with capture_logs(buffer):
+        report = guarded_lint(file_path, lint_file, result_cache)
+    cached = result_cache is not None and result_cache.hits > hits
+    written = result_cache.written - written if result_cache is not None else 0
+    filtered = (PREFILTER.checked - checked, PREFILTER.skipped - skipped)
+    metrics = METRICS.snapshot() if METRICS.enabled else None
+    return file_path, report, buffer.getvalue(), cached, written, filtered, metrics
 
-def analyze_folder(folder_path):
-    """分析文件夹内所有 Python 文件。"""
-    print(f"\n📁 分析文件夹: {folder_path}")
+def find_py_files(folder_path):
+    """递归收集文件夹内的 Python 文件与 notebook，按路径排序以保证输出顺序稳定。"""
+    py_files = []
     for root, _, files in os.walk(folder_path):
         for file in files:
-            if file.endswith('.py'):
-                file_path = os.path.join(root, file)
-                analyze_file(file_path)
+            if file.endswith(SOURCE_SUFFIXES):
+                py_files.append(os.path.join(root, file))
+    return sorted(py_files)
+
+def analyze_folder(folder_path, jobs=1, result_cache=None, save=save_report):
+    """分析文件夹内所有 Python 文件，jobs > 1 时使用进程池并按路径顺序合并结果。"""
+    logger.info("\n📁 分析文件夹: %s", folder_path)
+    py_files = find_py_files(folder_path)
+    if jobs <= 1 or len(py_files) <= 1:
+        for file_path in py_files:
+            analyze_file(file_path, result_cache, save)
+        return
+
+    import multiprocessing
+    chunksize = max(1, min(32, len(py_files) // (jobs * 4)))
+    with multiprocessing.Pool(jobs, initializer=_init_worker,
+                              initargs=(logging.getLogger().level, METRICS.enabled,
+                                        PREFILTER.enabled, tuple(REGISTRY.manifests), REGISTRY.selected),
+                              maxtasksperchild=WORKER_MAX_TASKS) as pool:
+        # imap 按输入顺序返回结果，输出与报告写入顺序不受进程调度影响
+        worker = functools.partial(_lint_worker, result_cache=result_cache)
+        results = pool.imap(worker, py_files, chunksize)
+        for file_path, report, log, cached, written, filtered, metrics in results:
+            if log:
+                sys.stdout.write(log)
+            # 工作进程中的预筛选计数同样在主进程中汇总
+            PREFILTER.checked += filtered[0]
+            PREFILTER.skipped += filtered[1]
+            if metrics is not None:
+                METRICS.merge(metrics)
+            if result_cache is not None:
+                # 工作进程中的命中计数与写入量不会回传，在主进程中汇总（prune 据此判断是否需要遍历）
+                if cached:
+                    result_cache.hits += 1
+                else:
+                    result_cache.misses += 1
+                result_cache.written += written
+            if report is not None:
+                with timed('save'):
+                    save(report, file_path)
+
+
+def analyze_git_changes(rev=None, staged=False, pathspec=None, result_cache=None, save=save_report):
+    """
+    只分析相对 rev（或暂存区）变化的 .py 与 .ipynb 文件。
+    文件内容通过一次 git cat-file --batch 从对象库批量读取，不逐个打开工作区文件。
+    """
+    from git_source import GitError, git_changed_files, git_read_blobs, git_toplevel
+    try:
+        toplevel = git_toplevel()
+        if pathspec:
+            pathspec = os.path.relpath(os.path.abspath(pathspec), toplevel)
+            pathspec = '' if pathspec == '.' else pathspec
+        paths = git_changed_files(toplevel, rev=rev, staged=staged, pathspec=pathspec)
+        blobs = git_read_blobs(toplevel, paths, staged=staged)
+    except GitError as e:
+        logger.error("[❌] git 命令失败：%s", e)
+        return
+
+    source = '暂存区' if staged else f'{rev}..HEAD'
+    logger.info("\n🔀 分析 %s 中变化的 %d 个 Python / notebook 文件", source, len(paths))
+    for path in paths:
+        file_path = os.path.relpath(os.path.join(toplevel, path))
+        logger.info("\n📂 分析文件: %s", file_path)
+        if path not in blobs:
+            logger.error("[❌] 无法从 git 对象库读取：%s", path)
+            continue
+        start = time.perf_counter()
+        if not blobs[path]:
+            continue
+        report = guarded_lint(file_path, lint_data, blobs[path], result_cache)
+        if METRICS.enabled:
+            METRICS.record_file(file_path, time.perf_counter() - start)
+        if report is not None:
+            with timed('save'):
+                save(report, file_path)
+
+
+def watch(path, result_cache=None, interval=1.0, watcher=None):
+    """监听模式：保持进程与缓存常驻，只重新分析修改过的文件。"""
+    if watcher is None:
+        from watch import TreeWatcher
+        watcher = TreeWatcher(path, SOURCE_SUFFIXES)
+    logger.info("\n👀 监听 %s 的修改（Ctrl+C 退出）", path)
+    try:
+        while True:
+            time.sleep(interval)
+            changed, removed = watcher.poll()
+            for file_path in changed:
+                analyze_file(file_path, result_cache)
+            for file_path in removed:
+                logger.info("[INFO] 文件已删除：%s", file_path)
+    except KeyboardInterrupt:
+        logger.info("\n[INFO] 停止监听")
+
+
+def _rule_codes(value):
+    """逗号分隔的规则代码列表。"""
+    return [code.strip() for code in value.split(',') if code.strip()]
 
 
 def parse_args():
     """命令行参数解析。"""
     parser = argparse.ArgumentParser(description='MindQuantum量子代码静态分析器')
-    parser.add_argument('--mode', type=int, choices=[0, 1], required=True, help='模式选择：0为文件夹模式，1为单文件模式')
-    parser.add_argument('--path', type=str, required=True, help='目标文件或文件夹路径')
-    return parser.parse_args()
+    parser.add_argument('--mode', type=int, choices=[0, 1], help='模式选择：0为文件夹模式，1为单文件模式')
+    parser.add_argument('--path', type=str, help='目标文件或文件夹路径（git 模式下用于限定子目录）')
+    git_group = parser.add_mutually_exclusive_group()
+    git_group.add_argument('--changed-since', metavar='REV', type=str,
+                           help='只分析 HEAD 相对 REV 变化的 .py / .ipynb 文件（内容取自 HEAD）')
+    git_group.add_argument('--staged', action='store_true',
+                           help='只分析暂存区中变化的 .py / .ipynb 文件（内容取自暂存区），适用于 pre-commit')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='文件夹模式下并行分析的进程数（默认 1，即串行）')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='不读取也不写入磁盘结果缓存')
+    parser.add_argument('--result-cache-dir', type=str, default=DEFAULT_CACHE_DIR,
+                        help=f'磁盘结果缓存目录（默认 {DEFAULT_CACHE_DIR}）')
+    parser.add_argument('--result-cache-mb', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help='磁盘结果缓存容量上限（MB），超出后淘汰最久未使用的条目')
+    parser.add_argument('--select', metavar='CODES', type=_rule_codes,
+                        help='只启用这些规则，逗号分隔（如 IIS,IM），默认启用全部已登记的规则')
+    parser.add_argument('--ignore', metavar='CODES', type=_rule_codes,
+                        help='不启用这些规则，逗号分隔')
+    parser.add_argument('--rules-manifest', metavar='PATH', action='append', default=[],
+                        help='登记清单文件（JSON）中的插件规则，可重复指定')
+    parser.add_argument('--no-prefilter', action='store_true',
+                        help='不做预筛选，对不含 mindquantum 与相关调用的文件也完整解析')
+    parser.add_argument('--lsp', action='store_true',
+                        help='作为 LSP 服务运行（经 stdin/stdout 通信），编辑器中实时显示检查结果')
+    parser.add_argument('--watch', action='store_true',
+                        help='完成首次分析后继续监听，只重新分析被修改的文件')
+    parser.add_argument('--watch-interval', type=float, default=1.0,
+                        help='监听模式下的轮询间隔（秒，默认 1.0）')
+    parser.add_argument('--output', '-o', type=str,
+                        help='将所有文件的检查结果写入单个聚合报告文件，不再生成 result/ 目录')
+    parser.add_argument('--output-format', choices=sorted(REPORT_WRITERS),
+                        help='聚合报告格式（默认按 --output 扩展名推断：.sarif 为 SARIF，其余为 JSONL）')
+    parser.add_argument('--metrics-json', metavar='PATH', type=str,
+                        help='记录各阶段/各规则的耗时与调用次数，并以 JSON 导出到 PATH')
+    parser.add_argument('--metrics-prom', metavar='PATH', type=str,
+                        help='同上，以 Prometheus textfile collector 格式导出到 PATH（.prom）')
+    verbosity = parser.add_mutually_exclusive_group()
+    verbosity.add_argument('--quiet', '-q', action='store_true',
+                           help='只输出错误信息')
+    verbosity.add_argument('--verbose', '-v', action='count', default=0,
+                           help='输出分析进度与检查报告，-vv 额外输出提取信息与规则细节')
+    args = parser.parse_args()
+    git_mode = args.staged or args.changed_since is not None
+    if args.lsp:
+        if git_mode or args.watch or args.output:
+            parser.error('--lsp 不能与 --watch / --output / --changed-since / --staged 同时使用')
+    elif not git_mode and (args.mode is None or args.path is None):
+        parser.error('需要指定 --mode 与 --path，或使用 --changed-since / --staged')
+    if args.changed_since is not None and (not args.changed_since or args.changed_since.startswith('-')):
+        parser.error(f'--changed-since 的版本不能为空或以 - 开头：{args.changed_since!r}')
+    if git_mode and args.watch:
+        parser.error('--watch 不能与 --changed-since / --staged 同时使用')
+    if args.watch and args.output:
+        parser.error('--watch 不能与 --output 同时使用')
+    if args.output_format and not args.output:
+        parser.error('--output-format 需要与 --output 一起使用')
+    try:
+        for path in args.rules_manifest:
+            REGISTRY.add_manifest(path)
+        REGISTRY.select(args.select, args.ignore)
+    except OSError as e:
+        parser.error(f'无法读取规则清单：{e}')
+    except ValueError as e:
+        parser.error(str(e))
+    except KeyError as e:
+        parser.error(f'未登记的规则：{e.args[0]}')
+    if not REGISTRY.selected:
+        parser.error('没有启用任何规则')
+    try:
+        # 规则依赖成环等声明错误在分析任何文件之前报告
+        schedule_for(REGISTRY.rules(), Facts)
+    except ImportError as e:
+        parser.error(f'无法导入规则：{e}')
+    except ValueError as e:
+        parser.error(str(e))
+    return args
+
+
+def export_metrics(json_path=None, prom_path=None):
+    """导出汇总后的分阶段/分规则性能统计。"""
+    summary = METRICS.summary()
+    for path, write in ((json_path, write_json), (prom_path, write_prometheus)):
+        if not path:
+            continue
+        try:
+            write(path, summary)
+            logger.info("📊 性能统计已保存至：%s", path)
+        except OSError as e:
+            logger.error("[❌] 性能统计保存失败：%s", e)
 
 
 def main():
     args = parse_args()
+    if args.lsp:
+        # stdout 用于协议数据，日志输出到 stderr
+        configure_logging(LOG_LEVELS[0 if args.quiet else min(1 + args.verbose, len(LOG_LEVELS) - 1)],
+                          sys.stderr)
+        from lsp_server import serve
+        sys.exit(serve())
+    if args.quiet:
+        level = LOG_LEVELS[0]
+    else:
+        # 监听模式是交互式的，默认输出进度
+        level = LOG_LEVELS[min(1 + args.verbose + args.watch, len(LOG_LEVELS) - 1)]
+    configure_logging(level)
+    METRICS.enabled = bool(args.metrics_json or args.metrics_prom)
+    PREFILTER.enabled = not args.no_prefilter
+    result_cache = None
+    if not args.no_cache:
+        result_cache = ResultCache(args.result_cache_dir, args.result_cache_mb * 1024 * 1024,
+                                   ruleset_version())
+
+    # 监听模式下先建立快照，首次分析期间的修改也能在之后被发现
+    watcher = None
+    if args.watch:
+        from watch import TreeWatcher
+        watcher = TreeWatcher(args.path, SOURCE_SUFFIXES)
+
+    with contextlib.ExitStack() as stack:
+        save = save_report
+        if args.output:
+            # 所有文件的结果经同一个带缓冲的写入器流式写入单个文件
+            writer = stack.enter_context(open_report_writer(args.output, args.output_format))
+            save = writer
+
+        if args.staged or args.changed_since is not None:
+            analyze_git_changes(args.changed_since, args.staged, args.path, result_cache, save)
+        elif args.mode == 1:
+            if os.path.isfile(args.path):
+                analyze_file(args.path, result_cache, save)
+            else:
+                logger.error("[❌] 文件路径不存在或不是文件：%s", args.path)
+                return
+        elif args.mode == 0:
+            if os.path.isdir(args.path):
+                analyze_folder(args.path, jobs=args.jobs, result_cache=result_cache, save=save)
+            else:
+                logger.error("[❌] 文件夹路径不存在或不是目录：%s", args.path)
+                return
+
+        if args.output:
+            logger.info("📄 聚合报告已保存至：%s（%d 个文件，%d 条问题）",
+                        writer.path, writer.files, writer.issues)
+
+    if watcher is not None:
+        watch(args.path, result_cache, args.watch_interval, watcher)
+
+    if PREFILTER.checked:
+        logger.info("[INFO] 预筛选: 共 %d 个文件，跳过 %d 个与 MindQuantum 无关的文件",
+                    PREFILTER.checked, PREFILTER.skipped)
+
+    if result_cache is not None:
+        removed = result_cache.prune()
+        logger.info("[INFO] 结果缓存: 命中 %d / 未命中 %d%s", result_cache.hits, result_cache.misses,
+                    f"，淘汰 {removed} 条" if removed else "")
 
-    if args.mode == 1:
-        if os.path.isfile(args.path):
-            analyze_file(args.path)
-        else:
-            print(f"[❌] 文件路径不存在或不是文件：{args.path}")
-    elif args.mode == 0:
-        if os.path.isdir(args.path):
-            analyze_folder(args.path)
-        else:
-            print(f"[❌] 文件夹路径不存在或不是目录：{args.path}")
+    if METRICS.enabled:
+        export_metrics(args.metrics_json, args.metrics_prom)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,170 @@
+import os
+import threading
+import time
+
+# 导出时列出的最慢文件数
+DEFAULT_TOP_FILES = 20
+
+PROMETHEUS_PREFIX = 'mindlint'
+
+
+class _Timer:
+    """ 计时上下文：退出时把墙钟时间与 CPU 时间累加到注册表的 phase 上 """
+    __slots__ = ('registry', 'phase', 'wall', 'cpu')
+
+    def __init__(self, registry, phase):
+        self.registry = registry
+        self.phase = phase
+
+    def __enter__(self):
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.add(self.phase, time.perf_counter() - self.wall, time.process_time() - self.cpu)
+
+
+class _NullTimer:
+    """ 未启用统计时使用的空计时器，不读取时钟 """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class MetricsRegistry:
+    """
+    分阶段性能统计：每个阶段（parse、extract、rule:IIS、save 等）累计
+    调用次数、墙钟时间与 CPU 时间，并记录每个文件的总耗时。
+    未启用时 timed() 返回空计时器，热路径上没有额外的时钟调用。
+    进程池中每个任务取 snapshot() 回传，由主进程 merge() 汇总。
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._phases = {}   # phase -> [calls, wall, cpu]
+        self._files = {}    # file -> wall
+        self._lock = threading.Lock()
+
+    def timed(self, phase):
+        return _Timer(self, phase) if self.enabled else _NULL_TIMER
+
+    def add(self, phase, wall, cpu, calls=1):
+        with self._lock:
+            stats = self._phases.get(phase)
+            if stats is None:
+                self._phases[phase] = [calls, wall, cpu]
+            else:
+                stats[0] += calls
+                stats[1] += wall
+                stats[2] += cpu
+
+    def record_file(self, file_path, wall):
+        with self._lock:
+            self._files[file_path] = self._files.get(file_path, 0.0) + wall
+
+    def reset(self):
+        with self._lock:
+            self._phases.clear()
+            self._files.clear()
+
+    def snapshot(self):
+        """ 返回可序列化（可跨进程传递）的统计数据 """
+        with self._lock:
+            return {
+                'phases': {phase: list(stats) for phase, stats in self._phases.items()},
+                'files': dict(self._files),
+            }
+
+    def merge(self, snapshot):
+        for phase, (calls, wall, cpu) in snapshot['phases'].items():
+            self.add(phase, wall, cpu, calls)
+        for file_path, wall in snapshot['files'].items():
+            self.record_file(file_path, wall)
+
+    def summary(self, top_files=DEFAULT_TOP_FILES):
+        """ 汇总结果：各阶段按墙钟时间降序，另列出最慢的 top_files 个文件 """
+        with self._lock:
+            phases = sorted(self._phases.items(), key=lambda item: item[1][1], reverse=True)
+            files = sorted(self._files.items(), key=lambda item: item[1], reverse=True)
+            return {
+                'phases': {phase: {'calls': calls, 'wall_seconds': wall, 'cpu_seconds': cpu}
+                           for phase, (calls, wall, cpu) in phases},
+                'files': {
+                    'count': len(files),
+                    'wall_seconds': sum(wall for _, wall in files),
+                    'slowest': [{'file': file_path, 'wall_seconds': wall}
+                                for file_path, wall in files[:top_files]],
+                },
+            }
+
+
+def _escape_label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_prometheus(summary):
+    """ 按 Prometheus 文本格式输出汇总结果（供 node_exporter textfile collector 读取） """
+    p = PROMETHEUS_PREFIX
+    lines = []
+    for metric, field, help_text in (
+            ('phase_calls_total', 'calls', '各阶段的调用次数'),
+            ('phase_wall_seconds_total', 'wall_seconds', '各阶段累计墙钟时间（秒）'),
+            ('phase_cpu_seconds_total', 'cpu_seconds', '各阶段累计 CPU 时间（秒）')):
+        lines.append(f"# HELP {p}_{metric} {help_text}")
+        lines.append(f"# TYPE {p}_{metric} counter")
+        for phase, stats in summary['phases'].items():
+            lines.append(f'{p}_{metric}{{phase="{_escape_label(phase)}"}} {stats[field]}')
+
+    files = summary['files']
+    lines.append(f"# HELP {p}_files_total 分析的文件数")
+    lines.append(f"# TYPE {p}_files_total counter")
+    lines.append(f"{p}_files_total {files['count']}")
+    lines.append(f"# HELP {p}_file_wall_seconds 最慢文件的分析耗时（秒）")
+    lines.append(f"# TYPE {p}_file_wall_seconds gauge")
+    for entry in files['slowest']:
+        lines.append(f'{p}_file_wall_seconds{{file="{_escape_label(entry["file"])}"}} {entry["wall_seconds"]}')
+    return "\n".join(lines) + "\n"
+
+
+def _write_atomic(path, text):
+    # textfile collector 可能随时读取，先写临时文件再原子替换
+    directory = os.path.dirname(path) or '.'
+    import tempfile     # 只在导出时需要，不计入启动时间
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        # mkstemp 创建的文件只有属主可读，collector 可能以其他用户运行
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_json(path, summary):
+    import json
+    _write_atomic(path, json.dumps(summary, indent=2, ensure_ascii=False) + "\n")
+
+
+def write_prometheus(path, summary):
+    _write_atomic(path, format_prometheus(summary))
+
+
+# **📌 进程内共享的统计注册表**
+METRICS = MetricsRegistry()
+
+
+def timed(phase):
+    """ 对 phase 计时：with timed('parse'): ... """
+    return METRICS.timed(phase)
@@ -1,571 +1,727 @@
-import ast
-import logging
-import re
-
-
-def get_args(opt):
-    """
-    解析函数调用字符串，提取参数列表，支持嵌套函数调用和链式方法调用。
-    """
-    if isinstance(opt, int) or isinstance(opt, float):  # ✅ 处理数值类型
-        return [str(opt)]  # 直接转换为字符串返回
-
-    if not isinstance(opt, str):  # ✅ 确保 opt 是字符串
-        print(f"[ERROR] get_args() 期望字符串，但接收到 {type(opt)}: {opt}")
-        return []
-
-    try:
-        tree = ast.parse(opt.strip(), mode='eval')
-        if isinstance(tree.body, ast.Call):
-            return extract_args_from_call(tree.body)
-        else:
-            print(f"[ERROR] 无法解析的函数调用字符串: {opt}")
-            return []
-    except SyntaxError as e:
-        print(f"[ERROR] 语法错误: {e}，字符串: {opt}")
-        return []
-    except Exception as e:
-        print(f"[ERROR] 解析 {opt} 失败，异常: {e}")
-        return []
-
-def extract_args_from_call(node):
-    """
-    提取函数调用的参数，支持位置参数和关键字参数。
-    """
-    args = []
-
-    # 解析位置参数
-    for arg in node.args:
-        if isinstance(arg, ast.Constant):
-            args.append(repr(arg.value))  # 处理 "字符串" 和 数值
-        elif isinstance(arg, ast.Name):
-            args.append(arg.id)  # 变量名
-        elif isinstance(arg, ast.Call):
-            func_name = get_func_name(arg.func)
-            nested_args = extract_args_from_call(arg)
-            full_call = f"{func_name}({', '.join(nested_args)})"
-            args.append(full_call)
-        else:
-            args.append(ast.unparse(arg))  # 其他情况转换回字符串
-
-    # **解析关键字参数**
-    kwargs = extract_kwargs_from_call(node)
-
-    return args + kwargs  # ✅ 位置参数 + 关键字参数 一起返回
-
-def extract_kwargs_from_call(node):
-    """
-    提取函数调用中的关键字参数（key=value）。
-    """
-    return [f"{kw.arg}={ast.unparse(kw.value)}" for kw in node.keywords]
-
-def get_func_name(func_node):
-    """
-    获取函数名称，支持嵌套结构。
-    """
-    if isinstance(func_node, ast.Name):
-        return func_node.id
-    elif isinstance(func_node, ast.Attribute):
-        return f"{get_func_name(func_node.value)}.{func_node.attr}"
-    return ast.unparse(func_node)  # 其他情况转换回字符串
-
-
-def get_values(args, var_list):
-    """
-    获取参数的实际值，如果参数是变量，则从 var_list 中查找其值。
-    """
-    values = []
-    for arg in args:
-        try:
-            # 尝试将参数解析为字面量
-            value = ast.literal_eval(arg)
-        except (ValueError, SyntaxError):
-            # 如果解析失败，认为参数是变量名，从 var_list 中查找其值
-            value = next((assign[1] for assign in var_list if assign[0] == arg), arg)
-        values.append(value)
-    return values
-
-def get_keywords(args, values):
-    """
-    将参数和对应的值分为位置参数和关键字参数。
-    """
-    new_args = []
-    new_values = []
-    for arg, value in zip(args, values):
-        if '=' in arg:
-            key, val = arg.split('=', 1)
-            new_args.append(key.strip())
-            new_values.append(val.strip())
-        else:
-            new_args.append(arg)
-            new_values.append(value)
-    return new_args, new_values
-# 实际上这个函数对于所有的链式调用都可以使用
-
-
-def extract_all_gates(opt):
-    """
-    提取调用链中的所有函数和类名
-    示例：
-        Circuit().h(0).cx(1,0) => ['Circuit()', 'h(0)', 'cx(1,0)']
-        CNOT.on(0, 1) => ['CNOT', 'on(0, 1)']
-    """
-    opt = opt.replace(" ", "")
-    results = []
-
-    # 特例处理 CNOT.on(0, 1) => ['CNOT', 'on(0, 1)']
-    if "." in opt and not opt.startswith("Circuit()"):
-        parts = opt.split(".")
-        if "(" in parts[0]:  # 说明类似 CNOT(...)，不需要拆
-            pass
-        elif len(parts) >= 2:
-            results.append(parts[0])  # 类名
-            call = ".".join(parts[1:])  # 剩下是链式
-            matches = re.findall(r'\w+\([^()]*\)', call)
-            results.extend(matches)
-            return results
-
-    # 常规链式调用，如 Circuit().h(0).x(1)
-    matches = re.findall(r'\w+\([^()]*\)', opt)
-    # 补上最前面的类名调用，如 Circuit()
-    prefix_match = re.match(r'^\w+\(\)', opt)
-    if prefix_match:
-        class_call = prefix_match.group(0)
-        if class_call not in matches:
-            matches.insert(0, class_call)
-
-    return matches
-
-
-
-# **📌 全局变量存储 Simulator 量子比特数**
-simulator_qubits = 999
-
-# 全局变量：存储当前线路最大量子比特数
-simulator_qubits = 999
-
-def checker_IIS(var_list, att_line_numbers, opt_list, opt_line_numbers):
-    """
-    IIS 检查器：检查 Simulator 初始化及后续量子门是否超出初始状态范围。
-      1. Simulator(...) 的 n_qubits 参数：
-         - float → Error（不接受小数）
-         - 非 int/float → Warning（请检查参数）
-         - int <= 0 → Error（非正整数）
-         - int > 0 → 合法，更新 simulator_qubits
-      2. NoiseBackend(...) 同上
-      3. 普遍性检查：on() 与无参门调用时，量子比特编号不得 >= simulator_qubits
-      4. 特例：当 simulator_qubits==1 时，不得使用受控门
-    """
-    global simulator_qubits
-    valid_backends = ['mqvector', 'mqvector_gpu', 'mqmatrix']
-    issues = []
-
-    # —— 1. 初始化 Simulator 参数检查 —— #
-    for opt, lineno in zip(opt_list, opt_line_numbers):
-        if 'Simulator' in opt:
-            args = get_args(opt)
-            values = get_values(args, var_list)
-
-            # 参数不足
-            if not values:
-                msg = f"[ERROR] Simulator 初始化参数不足 (行 {lineno})"
-                issues.append({"type": "Error", "lineno": lineno, "msg": msg})
-                print(msg)
-                continue
-
-            backend = values[0].strip('"').strip("'")
-            print(f"[INFO] 解析到 backend 参数: {backend} (行 {lineno})")
-
-            # —— 1.1 NoiseBackend 分支 —— #
-            if backend.startswith('NoiseBackend('):
-                noise_args = get_args(backend)
-                noise_values = get_values(noise_args, var_list)
-
-                if len(noise_values) < 3:
-                    msg = (f"[ERROR] NoiseBackend 初始化参数不足 (行 {lineno})，"
-                           f"参数: {noise_args}，值: {noise_values}")
-                    issues.append({"type": "Error", "lineno": lineno, "msg": msg})
-                    print(msg)
-                    continue
-
-                base_sim = noise_values[0].strip('"').strip("'")
-                n_qubits = noise_values[1]
-                # adder = noise_values[2]  # 可忽略
-
-                if base_sim not in valid_backends:
-                    msg = f"[ERROR] 无效的 base_sim: {base_sim} (行 {lineno})"
-                    issues.append({"type": "Error", "lineno": lineno, "msg": msg})
-                    print(msg)
-
-                # —— 新增对 float 的检测 —— #
-                if isinstance(n_qubits, float):
-                    msg = (f"[ERROR] n_qubits 参数为小数，不接受小数 (行 {lineno})，值: {n_qubits}")
-                    issues.append({"type": "Error", "lineno": lineno, "msg": msg})
-                    print(msg)
-                # 非 int/float 再作为 Warning
-                elif not isinstance(n_qubits, int):
-                    msg = (f"[WARNING] n_qubits 参数非字面量整数，无法确定大小，请检查 (行 {lineno})，值: {n_qubits}")
-                    issues.append({"type": "Warning", "lineno": lineno, "msg": msg})
-                    print(msg)
-                else:
-                    if n_qubits <= 0:
-                        msg = f"[ERROR] n_qubits 不是正整数 (行 {lineno})，值: {n_qubits}"
-                        issues.append({"type": "Error", "lineno": lineno, "msg": msg})
-                        print(msg)
-                    else:
-                        simulator_qubits = n_qubits
-                        print(f"[INFO] 记录全局变量: simulator_qubits = {simulator_qubits}")
-
-            # —— 1.2 普通 Simulator 分支 —— #
-            else:
-                if backend not in valid_backends:
-                    msg = f"[ERROR] 无效的 backend: {backend} (行 {lineno})"
-                    issues.append({"type": "Error", "lineno": lineno, "msg": msg})
-                    print(msg)
-
-                if len(values) >= 2:
-                    n_qubits = values[1]
-
-                    if isinstance(n_qubits, float):
-                        msg = (f"[ERROR] n_qubits 参数为小数，不接受小数 (行 {lineno})，值: {n_qubits}")
-                        issues.append({"type": "Error", "lineno": lineno, "msg": msg})
-                        print(msg)
-                    elif not isinstance(n_qubits, int):
-                        msg = (f"[WARNING] n_qubits 参数非字面量整数，无法确定大小，请检查 (行 {lineno})，值: {n_qubits}")
-                        issues.append({"type": "Warning", "lineno": lineno, "msg": msg})
-                        print(msg)
-                    else:
-                        if n_qubits <= 0:
-                            msg = f"[ERROR] n_qubits 不是正整数 (行 {lineno})，值: {n_qubits}"
-                            issues.append({"type": "Error", "lineno": lineno, "msg": msg})
-                            print(msg)
-                        else:
-                            simulator_qubits = n_qubits
-                            print(f"[INFO] 记录全局变量: simulator_qubits = {simulator_qubits}")
-
-    # —— 2. 普遍性检查：超出范围的 on() 与无参门 —— #
-    none_para_gates = ["h","x","y","z","s","t","sx","swap","iswap","cnot"]
-    for opt, lineno in zip(opt_list, opt_line_numbers):
-        calls = extract_all_gates(opt)
-        for call in calls:
-            # on(...)
-            if call.startswith("on("):
-                vals = []
-                for v in get_values(get_args(call), var_list):
-                    if isinstance(v, list):
-                        vals.extend(v)
-                    elif v != 'None':
-                        vals.append(v)
-                ivals = [i for i in vals if isinstance(i, int)]
-                if ivals and max(ivals) >= simulator_qubits:
-                    msg = (f"[ERROR] `on()` 调用了 {max(ivals)} 号比特，"
-                           f"超出最大支持的量子比特 {simulator_qubits} (行 {lineno})")
-                    issues.append({"type": "Error", "lineno": lineno, "msg": msg})
-                    print(msg)
-
-            # none-para 门
-            if "(" in call:
-                g = call.split("(")[0]
-                if g in none_para_gates:
-                    vals = []
-                    for v in get_values(get_args(call), var_list):
-                        if isinstance(v, list):
-                            vals.extend(v)
-                        elif v != 'None':
-                            vals.append(v)
-                    ivals = [i for i in vals if isinstance(i, int)]
-                    if ivals and max(ivals) >= simulator_qubits:
-                        msg = (f"[ERROR] {g} 门调用了 {max(ivals)} 号比特，"
-                               f"超出最大支持的量子比特 {simulator_qubits} (行 {lineno})")
-                        issues.append({"type": "Error", "lineno": lineno, "msg": msg})
-                        print(msg)
-
-    # —— 3. 特例：单比特时不得使用受控门 —— #
-    if simulator_qubits == 1:
-        controlled = ["cs","ch","cx","cnot","cp","mcp","rcx","rccx","rcccx",
-                      "crx","cry","crz","csdg","cswap","csx","cu","ccx",
-                      "mcx","cy","cz","ccz"]
-        for opt, lineno in zip(opt_list, opt_line_numbers):
-            for call in extract_all_gates(opt):
-                if "(" in call and call.split("(")[0] in controlled:
-                    msg = (f"[ERROR] 受控门 {call.split('(')[0]} 被单量子比特线路调用 (行 {lineno})")
-                    issues.append({"type": "Error", "lineno": lineno, "msg": msg})
-                    print(msg)
-
-    print("[INFO] IIS 规则检查结束")
-    return issues
-
-def checker_IM(var_list, att_line_numbers, opt_list, opt_line_numbers):
-    """
-    📌 Incorrect Measurement检查器：
-    检查量子比特被测量后是否继续作为控制位被使用。
-    """
-    issues = []
-    measured_qubits = set()
-    controlled_gate = [
-        "h", "x", "y", "z", "s", "t", "sx", "swap", "iswap",
-        "cs", "ch", "cx","cnot", "cp", "mcp", "rcx", "rccx", "rcccx",
-        "crx", "cry", "crz", "csdg", "cswap", "csx", "cu",
-        "ccx", "mcx", "cy", "cz", "ccz"
-    ]
-
-    for opt, lineno in zip(opt_list, opt_line_numbers):
-        gate_calls = extract_all_gates(opt)
-        for idx, chainCall in enumerate(gate_calls):
-            gate_name = chainCall.split("(")[0]  # 保持大小写敏感
-
-            # ✅ 处理 measure_all
-            if gate_name == "measure_all":
-                for i in range(simulator_qubits):
-                    measured_qubits.add(i)
-                continue
-
-            # ✅ 处理 measure(...),measure的第二个参数不代表控制位
-            if gate_name == "measure":
-                args = get_args(chainCall)
-                values = get_values(args, var_list)
-                v = values[0]
-                if isinstance(v, list):
-                    msg = f"[ERROR] measure 门只能定义在一个qubit上 (行 {lineno})"
-                    print(msg)
-                    issues.append({"type": "Error", "lineno": lineno, "msg": msg})
-                else:
-                    try:
-                        measured_qubits.add(int(v))
-                    except Exception:
-                        continue
-                continue
-
-            # ✅ 处理 Measure(...)
-            if gate_name == "Measure":
-                # 若下一个调用为 on(...)，则需要一并分析
-                next_call = gate_calls[idx + 1] if idx + 1 < len(gate_calls) else ""
-                if next_call.startswith("on("):
-                    on_args = get_args(next_call)
-                    on_values = get_values(on_args, var_list)
-                    if isinstance(on_values[0], list):
-                        msg = f"[ERROR] measure 门只能定义在一个qubit上 (行 {lineno})"
-                        print(msg)
-                        issues.append({"type": "Error", "lineno": lineno, "msg": msg})
-                    if len(on_values) >= 2:
-                        msg = f"[ERROR] Measure 门不应包含控制位 (行 {lineno})"
-                        print(msg)
-                        issues.append({"type": "Error", "lineno": lineno, "msg": msg})
-
-                    # 记录 obj_qubits 被测量
-                    obj_part = on_values[0] if on_values else None
-                    if isinstance(obj_part, list):
-                        measured_qubits.update([int(q) for q in obj_part if isinstance(q, int)])
-                    elif isinstance(obj_part, int):
-                        measured_qubits.add(obj_part)
-                continue
-
-            # ✅ 检查控制门是否作用于 measured_qubits
-            if gate_name in controlled_gate:
-                args = get_args(chainCall)
-                values = get_values(args, var_list)
-                if len(values) > 1:
-                    ctrl_candidates = values[1]
-
-                    if isinstance(ctrl_candidates, list):
-                        for ctrl in ctrl_candidates:
-                            if isinstance(ctrl, int) and ctrl in measured_qubits:
-                                msg = f"[WARNING] 被测量的 qubit {ctrl} 被用作控制位 ({gate_name}) (行 {lineno})"
-                                print(msg)
-                                issues.append({"type": "Warning", "lineno": lineno, "msg": msg})
-                    else:
-                        try:
-                            if int(ctrl_candidates) in measured_qubits:
-                                msg = f"[WARNING] 被测量的 qubit {ctrl_candidates} 被用作控制位 ({gate_name}) (行 {lineno})"
-                                print(msg)
-                                issues.append({"type": "Warning", "lineno": lineno, "msg": msg})
-                        except Exception:
-                            continue
-
-            # ✅ 检查 Gate().on(obj, ctrl) 的调用
-            if gate_name == "on" and idx > 0:
-                prev_gate = gate_calls[idx - 1].split("(")[0]
-                args = get_args(chainCall)
-                values = get_values(args, var_list)
-                if prev_gate != "Measure":
-                    if len(values) >= 2:
-                        ctrl_part = values[1]
-                        if isinstance(ctrl_part, list):
-                            for ctrl in ctrl_part:
-                                if isinstance(ctrl, int) and ctrl in measured_qubits:
-                                    msg = f"[WARNING] 被测量的 qubit {ctrl} 被用作控制位 (.on 调用) (行 {lineno})"
-                                    print(msg)
-                                    issues.append({"type": "Warning", "lineno": lineno, "msg": msg})
-                        else:
-                            try:
-                                if int(ctrl_part) in measured_qubits:
-                                    msg = f"[WARNING] 被测量的 qubit {ctrl_part} 被用作控制位 (.on 调用) (行 {lineno})"
-                                    print(msg)
-                                    issues.append({"type": "Warning", "lineno": lineno, "msg": msg})
-                            except Exception:
-                                pass
-    print("[INFO] IM 规则检查完成")
-    return issues
-
-def checker_PE(var_list, att_line_numbers, opt_list, opt_line_numbers):
-    issues = []
-    # 检查量子比特是否在控制位和受控位上重复
-    none_para_gates = ["h","x","y","z","s","t","sx","swap","iswap","cnot"]
-    for opt, lineno in zip(opt_list, opt_line_numbers):
-        gate_calls = extract_all_gates(opt)  # ✅ 获取所有量子门
-        for chainCall in gate_calls:
-            if chainCall.startswith("on("):
-                on_args = get_args(chainCall)
-                on_values = get_values(on_args, var_list)
-                # 控制位和受控位可能是int也可能是list[int]
-                flat_values = []
-                if len(on_args) > 2 :
-                    msg = f"[ERROR] On的调用有多余的参数"
-                    print(msg)
-                    issues.append({"type": "Error", "lineno": lineno, "msg": msg})
-                for val in on_values:
-                    if isinstance(val, list):
-                        flat_values.extend(val)
-                    elif val != 'None':
-                        flat_values.append(val)
-
-                if flat_values:
-                    if len(flat_values) != len(set(flat_values)):
-                        msg = f"[ERROR] 控制位和受控位当中有元素重复"
-                        print(msg)
-                        issues.append({"type": "Error", "lineno": lineno, "msg": msg})
-
-            # ✅ 提取门名和参数部分，如 h(0), swap(1,2) 等
-            if "(" in chainCall:
-                gate_name = chainCall.split("(")[0]
-                args = get_args(chainCall)
-                values = get_values(args, var_list)
-                flat_values = []
-                for val in values:
-                    if isinstance(val, list):
-                        flat_values.extend(val)
-                    elif val != 'None':
-                        flat_values.append(val)
-                # ✅ 检查不带额外参数的门
-                if gate_name in none_para_gates and flat_values:
-                    if len(flat_values) != len(set(flat_values)):
-                        msg = f"[ERROR] 控制位和受控位当中有元素重复"
-                        print(msg)
-                        issues.append({"type": "Error", "lineno": lineno, "msg": msg})
-    print("[INFO] PE 规则检查完成")
-    return issues
-
-def checker_CE(var_list, att_line_numbers, opt_list, opt_line_numbers):
-    issues = []
-
-    print("[INFO] CE 规则检查完成")
-    return issues
-
-# **📌 规则检查字典**
-Rules = {
-    'IIS': checker_IIS,
-    'IM' : checker_IM,
-    'PE' : checker_PE,
-}
-
-# **📌 规则描述**
-Description = {
-    'IIS': 'Incorrect Initial State',
-    'IM': 'Incorrect Measurement',
-    'PE' : 'Parameters Error',
-}
-
-# **📌 结果存储**
-Results = {rule: False for rule in Rules.keys()}
-
-# **📌 MindQuantum 静态分析类**
-from concurrent.futures import ThreadPoolExecutor
-
-class MindLint:
-    def __init__(self):
-        self.rules = Rules
-        self.results = {key: False for key in Rules.keys()}
-        self.report_errors = []
-        self.report_warnings = []
-
-    def check(self, var_list, att_line_numbers, opt_list, opt_line_numbers, file_lines):
-        print("\n========================= 🚀 开始代码分析 🚀 =========================\n")
-        global simulator_qubits
-        simulator_qubits = 999
-        # 优先执行 IIS
-        if "IIS" in self.rules:
-            print("[INFO] 先运行 `checker_IIS` 以确保 `simulator_qubits` 变量存储")
-            issues = self.rules["IIS"](var_list, att_line_numbers, opt_list, opt_line_numbers)
-            for issue in issues:
-                self._record_issue("IIS", issue, file_lines)
-
-        # 执行其他规则
-        remaining_rules = [k for k in self.rules if k != "IIS"]
-
-        with ThreadPoolExecutor() as executor:
-            results = executor.map(
-                lambda task: (task, self.rules[task](var_list, att_line_numbers, opt_list, opt_line_numbers)),
-                remaining_rules
-            )
-            for task, issues in results:
-                if issues is None:
-                    continue
-                elif isinstance(issues, int):
-                    # 直接是一个错误行号
-                    self._record_issue(task, issues, file_lines)
-                elif isinstance(issues, list):
-                    # 是一个包含多个警告的列表
-                    for issue in issues:
-                        self._record_issue(task, issue, file_lines)
-                else:
-                    print(f"[WARNING] 无法识别的返回值类型来自规则 {task}：{issues}")
-
-
-        print("\n========================= ✅ 代码分析完成 ✅ =========================\n")
-
-    def _record_issue(self, task, issue, file_lines):
-        self.results[task] = True
-        line = file_lines[int(issue["lineno"]) - 1]
-        msg = f"Type: {task} - {Description[task]}\n{issue['type']} at line {issue['lineno']}: {line}\n{issue['msg']}"
-
-        if issue["type"] == "Error":
-            self.report_errors.append(msg)
-            print(f"[❌] 错误: {msg}")
-        elif issue["type"] == "Warning":
-            self.report_warnings.append(msg)
-            print(f"[⚠️] 警告: {msg}")
-    def get_report(self):
-        """
-        生成错误与警告报告，打印输出并返回结构化结果。
-
-        返回值:
-            {
-                "errors": List[str],
-                "warnings": List[str]
-            }
-        """
-        print("\n========================= 📋 检查报告 =========================\n")
-
-        report_errors = getattr(self, "report_errors", [])
-        report_warnings = getattr(self, "report_warnings", [])
-
-        if report_errors:
-            print("❌ 错误列表（Errors）:")
-            for i, err in enumerate(report_errors, 1):
-                print(f"{i}. {err}\n")
-        else:
-            print("✅ 没有发现错误（Errors）\n")
-
-        if report_warnings:
-            print("⚠️ 警告列表（Warnings）:")
-            for i, warn in enumerate(report_warnings, 1):
-                print(f"{i}. {warn}\n")
-        else:
-            print("✅ 没有发现警告（Warnings）\n")
-
-        print("========================= 🧾 报告结束 =========================\n")
-
-        return {
-            "errors": report_errors,
-            "warnings": report_warnings
-        }
\ No newline at end of file
+import ast
+import hashlib
+import importlib
+import logging
+import re
+import sys
+import time
+
+from cfg import bound_names, linear_cfg
+from dataflow import Fact, FlowAnalysis, PersistentDict
+from gate_catalog import CONTROLLED_GATES, NONE_PARA_GATES, QUBIT_METHODS
+from gate_ir import ExprRef, GateOp, GateTable, SymbolRef, flatten_qubits
+from metrics import METRICS, timed
+from intervals import Interval, eval_expr
+from qubits import MAX_MASK_QUBITS, QubitSet, has_duplicates
+from rule_registry import active_rules
+from rule_scheduler import fact_closure, schedule_for
+from symbol_table import SymbolTable
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# **📌 未声明 Simulator 时默认的量子比特数**
+DEFAULT_SIMULATOR_QUBITS = 999
+
+
+class LintContext:
+    """
+    单次检查（一个文件）的分析上下文，代替模块级全局变量在规则之间传递事实：
+      - flow: 基于控制流图的数据流分析（见 dataflow.py），规则按程序点查询 Facts 中的事实
+      - simulator_qubits: 文件执行结束时 Simulator 声明的量子比特数（simulator_width 事实）
+      - backend: Simulator 使用的后端（IIS 产出，见 Rule.produces）
+    没有控制流图时按 gate_ops 的顺序视为一个基本块。
+    每次 MindLint.check 创建新的上下文，多个文件可以在不同线程中同时检查。
+    """
+
+    def __init__(self, symbols, table, gate_ops=(), file_cfg=None):
+        self.symbols = symbols
+        self.table = table
+        self.backend = None
+        if file_cfg is None:
+            file_cfg = linear_cfg([op.node for op in gate_ops])
+        self.flow = FlowAnalysis(self, Facts, file_cfg, gate_ops)
+
+    @property
+    def simulator_qubits(self):
+        width = self.flow.at_exit('simulator_width')
+        return DEFAULT_SIMULATOR_QUBITS if width is None else width
+
+
+class Rule:
+    """
+    规则基类：规则通过 events 按门名称订阅事件（门名称 → 处理方法名），
+    RuleEngine 单次遍历门调用表，只把订阅的门事件分派给规则。
+    facts 声明规则查询的数据流事实（Facts 中的名称），在分派事件前求解，各规则共用。
+    produces / consumes 声明规则写入 / 读取的上下文值，调度器保证消费者在生产者之后运行；
+    triggers 为触发门名称（默认为 events 的键），文件中一个都没有时跳过该规则（见 rule_scheduler.py）。
+    每个文件创建一个新实例，事件结束后调用 finish() 取得 issues。
+    """
+    code = ''
+    description = ''
+    events = {}
+    facts = ()
+    produces = ()
+    consumes = ()
+    triggers = None
+
+    def __init__(self, context):
+        self.context = context
+        self.symbols = context.symbols
+        self.table = context.table
+        self.issues = []
+
+    def finish(self):
+        return self.issues
+
+    def report(self, kind, lineno, msg):
+        self.issues.append({"type": kind, "lineno": lineno, "msg": msg})
+        logger.debug(msg)
+
+
+def _subscribe(names, method):
+    return {name: method for name in names}
+
+
+def _max_qubit(values):
+    """ 整数比特与 exact 区间上界中的最大值，没有时返回 None """
+    highs = [v.hi if isinstance(v, Interval) else v for v in values
+             if isinstance(v, int) or isinstance(v, Interval) and v.exact]
+    return max(highs) if highs else None
+
+
+VALID_BACKENDS = frozenset(['mqvector', 'mqvector_gpu', 'mqmatrix'])
+
+
+def _check_n_qubits(n_qubits, lineno, problems):
+    """ 检查 n_qubits 参数，合法时返回其值，否则记录问题并返回 None """
+    if isinstance(n_qubits, float):
+        problems.append(("Error", f"[ERROR] n_qubits 参数为小数，不接受小数 (行 {lineno})，值: {n_qubits}"))
+    # 非 int/float 再作为 Warning
+    elif not isinstance(n_qubits, int):
+        problems.append(("Warning",
+                         f"[WARNING] n_qubits 参数非字面量整数，无法确定大小，请检查 (行 {lineno})，值: {n_qubits}"))
+    elif n_qubits <= 0:
+        problems.append(("Error", f"[ERROR] n_qubits 不是正整数 (行 {lineno})，值: {n_qubits}"))
+    else:
+        return n_qubits
+    return None
+
+
+def _constant(context, row, raw, default):
+    """ 变量参数 raw 在 row 之前的常量值（constants 事实），不是常量时返回 default """
+    if isinstance(raw, SymbolRef) and not isinstance(raw, ExprRef):
+        constants = context.flow.before('constants', row)
+        if raw in constants:
+            return constants[raw]
+    return default
+
+
+def parse_simulator(row, context):
+    """
+    解析 Simulator(...) 调用行，返回 (backend, n_qubits, problems)：
+      - backend: 后端名称或 NoiseBackend 的 GateOp，缺少参数时为 None
+      - n_qubits: 合法的量子比特数，否则为 None
+      - problems: 参数问题 (类型, 消息) 列表，由 IIS 报告
+    变量形式的 n_qubits 优先取数据流中的常量值，否则取符号表中的值。
+    """
+    problems = []
+    if row.index != len(row.chain) - 1:
+        return None, None, problems
+    lineno = row.lineno
+    backend = row.arg(0, 'backend')
+
+    # 参数不足
+    if backend is None:
+        problems.append(("Error", f"[ERROR] Simulator 初始化参数不足 (行 {lineno})"))
+        return None, None, problems
+
+    # —— NoiseBackend 分支 —— #
+    # 以变量保存的 NoiseBackend(...) 在变量表中即为其 GateOp（见 ast_operations.get_attribute）
+    if isinstance(backend, GateOp) and backend.last.name == 'NoiseBackend':
+        noise_call = backend.last
+        resolve = context.symbols.resolve
+        if noise_call.n_args < 3:
+            noise_values = [resolve(v, lineno, row.scope) for v in noise_call.all_values()]
+            problems.append(("Error", (f"[ERROR] NoiseBackend 初始化参数不足 (行 {lineno})，"
+                                       f"参数: {backend}，值: {noise_values}")))
+            return backend, None, problems
+
+        base_sim = str(resolve(noise_call.arg(0, 'base_sim'), lineno, row.scope))
+        base_sim = base_sim.strip('"').strip("'")
+        raw = noise_call.arg(1, 'n_qubits')
+        n_qubits = _constant(context, row, raw, resolve(raw, lineno, row.scope))
+
+        if base_sim not in VALID_BACKENDS:
+            problems.append(("Error", f"[ERROR] 无效的 base_sim: {base_sim} (行 {lineno})"))
+
+    # —— 普通 Simulator 分支 —— #
+    else:
+        backend = str(backend).strip('"').strip("'")
+        if backend not in VALID_BACKENDS:
+            problems.append(("Error", f"[ERROR] 无效的 backend: {backend} (行 {lineno})"))
+
+        n_qubits = row.arg(1, 'n_qubits')
+        if n_qubits is None:
+            return backend, None, problems
+        n_qubits = _constant(context, row, row.call.arg(1, 'n_qubits'), n_qubits)
+
+    return backend, _check_n_qubits(n_qubits, lineno, problems), problems
+
+
+class checker_IIS(Rule):
+    """
+    IIS 检查器：检查 Simulator 初始化及后续量子门是否超出初始状态范围。
+      1. Simulator(...) 的 n_qubits 参数（见 parse_simulator）：
+         - float → Error（不接受小数）
+         - 非 int/float → Warning（请检查参数）
+         - int <= 0 → Error（非正整数）
+         - int > 0 → 合法，计入 simulator_width 事实
+      2. NoiseBackend(...) 同上
+      3. 普遍性检查：on()、无参门与 UN(...) 调用时，量子比特编号不得 >= simulator_qubits
+         （循环变量与 range(...) 按区间上界判断，见 intervals.py）
+      4. 特例：当 simulator_qubits==1 时，不得使用受控门
+    3、4 依赖文件执行结束时的 simulator_qubits，因此先记录，在 finish() 中统一判断。
+    """
+    code = 'IIS'
+    description = 'Incorrect Initial State'
+    valid_backends = VALID_BACKENDS
+    range_gates = NONE_PARA_GATES | {"on"}
+    events = {
+        **_subscribe(range_gates | CONTROLLED_GATES, 'on_gate'),
+        'Simulator': 'on_simulator',
+        'UN': 'on_un',
+    }
+    facts = ('constants', 'simulator_width')
+    produces = ('backend',)
+
+    def __init__(self, context):
+        super().__init__(context)
+        self.range_rows = []        # (row, 最大比特号)
+        self.controlled_rows = []
+
+    # —— 1. 初始化 Simulator 参数检查 —— #
+    def on_simulator(self, sim_row):
+        backend, n_qubits, problems = parse_simulator(sim_row, self.context)
+        if backend is not None:
+            self.context.backend = backend
+            logger.debug("[INFO] 解析到 backend 参数: %s (行 %s)", backend, sim_row.lineno)
+        for kind, msg in problems:
+            self.report(kind, sim_row.lineno, msg)
+        if n_qubits is not None:
+            logger.debug("[INFO] 记录上下文: simulator_qubits = %s", n_qubits)
+
+    def on_gate(self, row):
+        if row.name in self.range_gates:
+            max_qubit = _max_qubit(row.qubits)
+            if max_qubit is not None:
+                self.range_rows.append((row, max_qubit))
+        if row.name in CONTROLLED_GATES:
+            self.controlled_rows.append(row)
+
+    def on_un(self, row):
+        # UN(gate, maps_obj, maps_ctrl)：maps_obj 为整数 n 时作用于 0 .. n-1
+        if not row.is_call:
+            return
+        maps_obj = row.arg(1, 'maps_obj')
+        if isinstance(maps_obj, int) and not isinstance(maps_obj, bool):
+            maps_obj = maps_obj - 1 if maps_obj > 0 else None
+        max_qubit = _max_qubit(flatten_qubits([maps_obj, row.arg(2, 'maps_ctrl')]))
+        if max_qubit is not None:
+            self.range_rows.append((row, max_qubit))
+
+    def finish(self):
+        simulator_qubits = self.context.simulator_qubits
+        # —— 2. 普遍性检查：超出范围的 on() 与无参门 —— #
+        for row, max_qubit in self.range_rows:
+            if max_qubit >= simulator_qubits:
+                g = "`on()` 调用" if row.name == "on" else f"{row.name} 门调用"
+                self.report("Error", row.lineno, (f"[ERROR] {g}了 {max_qubit} 号比特，"
+                                                  f"超出最大支持的量子比特 {simulator_qubits} (行 {row.lineno})"))
+
+        # —— 3. 特例：单比特时不得使用受控门 —— #
+        if simulator_qubits == 1:
+            for row in self.controlled_rows:
+                self.report("Error", row.lineno, f"[ERROR] 受控门 {row.name} 被单量子比特线路调用 (行 {row.lineno})")
+
+        logger.debug("[INFO] IIS 规则检查结束")
+        return self.issues
+
+
+class checker_IM(Rule):
+    """
+    📌 Incorrect Measurement检查器：
+    检查量子比特被测量后是否继续作为控制位被使用。
+    "被测量后"按执行顺序判断：控制位在调用之前的 measured_qubits 事实中（任一路径上已测量）即报告，
+    分支、循环与函数体由控制流图区分，同一表达式中写在后面的测量不影响前面的门。
+    """
+    code = 'IM'
+    description = 'Incorrect Measurement'
+    events = {
+        **_subscribe(QUBIT_METHODS, 'on_controlled'),
+        'on': 'on_on',
+        'measure': 'on_measure',
+        'Measure': 'on_Measure',
+    }
+    facts = ('measured_qubits',)
+    # 没有任何测量时 measured_qubits 恒为空，控制位检查不会报告
+    triggers = ('measure', 'Measure', 'measure_all')
+
+    # ✅ 处理 measure(...),measure的第二个参数不代表控制位
+    def on_measure(self, row):
+        if row.args and isinstance(row.args[0], list):
+            self.report("Error", row.lineno, f"[ERROR] measure 门只能定义在一个qubit上 (行 {row.lineno})")
+
+    # ✅ 处理 Measure(...)
+    def on_Measure(self, row):
+        lineno = row.lineno
+        # 若下一个调用为 on(...)，则需要一并分析
+        next_row = row.neighbor(1)
+        if next_row is None or next_row.name != "on" or not next_row.args:
+            return
+        if isinstance(next_row.args[0], list):
+            self.report("Error", lineno, f"[ERROR] measure 门只能定义在一个qubit上 (行 {lineno})")
+        if next_row.n_args >= 2:
+            self.report("Error", lineno, f"[ERROR] Measure 门不应包含控制位 (行 {lineno})")
+
+    # ✅ 检查控制门是否作用于 measured_qubits
+    def on_controlled(self, row):
+        if row.ctrl_qubits is not None:
+            self._check_ctrl(row, row.ctrl_qubits, row.name)
+
+    # ✅ 检查 Gate().on(obj, ctrl) 的调用
+    def on_on(self, row):
+        if row.index == 0 or row.ctrl_qubits is None:
+            return
+        if row.neighbor(-1).name != "Measure":
+            self._check_ctrl(row, row.ctrl_qubits, ".on 调用")
+
+    def _check_ctrl(self, row, ctrl_part, where):
+        measured = self.context.flow.before('measured_qubits', row)
+        if not measured:
+            return
+        if isinstance(ctrl_part, list):
+            # 先用位图判断是否与已测量比特相交，相交时再按原顺序逐个报告
+            if not measured.intersects(ctrl_part, row.ctrl_mask):
+                return
+            for ctrl in ctrl_part:
+                if isinstance(ctrl, int) and ctrl in measured:
+                    self.report("Warning", row.lineno,
+                                f"[WARNING] 被测量的 qubit {ctrl} 被用作控制位 ({where}) (行 {row.lineno})")
+                elif isinstance(ctrl, Interval):
+                    self._check_ctrl_interval(row, measured, ctrl, where)
+        elif isinstance(ctrl_part, Interval):
+            self._check_ctrl_interval(row, measured, ctrl_part, where)
+        else:
+            try:
+                if int(ctrl_part) in measured:
+                    self.report("Warning", row.lineno,
+                                f"[WARNING] 被测量的 qubit {ctrl_part} 被用作控制位 ({where}) (行 {row.lineno})")
+            except Exception:
+                pass
+
+    def _check_ctrl_interval(self, row, measured, interval, where):
+        # 循环中的控制位：区间内任一比特已被测量即报告（只报告编号最小的一个）
+        if not interval.exact:
+            return
+        ctrl = measured.first_common(interval.mask(MAX_MASK_QUBITS))
+        if ctrl is not None:
+            self.report("Warning", row.lineno,
+                        f"[WARNING] 被测量的 qubit {ctrl} 被用作控制位 ({where}) (行 {row.lineno})")
+
+    def finish(self):
+        logger.debug("[INFO] IM 规则检查完成")
+        return self.issues
+
+
+class checker_PE(Rule):
+    """
+    📌 Parameters Error检查器：
+    检查量子比特是否在控制位和受控位上重复，以及 on() 是否有多余参数。
+    """
+    code = 'PE'
+    description = 'Parameters Error'
+    events = _subscribe(NONE_PARA_GATES | {"on"}, 'on_gate')
+
+    def on_gate(self, row):
+        lineno = row.lineno
+        if row.name == "on" and row.n_args > 2:
+            self.report("Error", lineno, "[ERROR] On的调用有多余的参数")
+        # 控制位和受控位可能是int也可能是list[int]
+        flat_values = row.qubits
+        if flat_values and has_duplicates(flat_values):
+            self.report("Error", lineno, "[ERROR] 控制位和受控位当中有元素重复")
+
+    def finish(self):
+        logger.debug("[INFO] PE 规则检查完成")
+        return self.issues
+
+
+class MeasuredQubits(Fact):
+    """
+    已被测量的量子比特：measure(q)、Measure(...).on(q) 与 measure_all()（按 simulator_qubits）。
+    任一路径上测量过即计入，汇合点取并集。
+    """
+    name = 'measured_qubits'
+    requires = ('simulator_width',)
+
+    def initial(self, flow):
+        return QubitSet()
+
+    def join(self, a, b):
+        return a | b
+
+    def transfer(self, state, event, flow):
+        row = flow.row(event)
+        if row is None or not row.is_call:
+            return state
+        if row.name == 'measure_all':
+            state = state.copy()
+            state.add_range(flow.context.simulator_qubits)
+        elif row.name == 'measure' and row.args:
+            value = row.args[0]
+            if isinstance(value, Interval):
+                # 循环中逐个测量：区间内的比特都被测量
+                state = state.copy()
+                state.add_interval(value)
+            elif not isinstance(value, list):
+                try:
+                    qubit = int(value)
+                except Exception:
+                    return state
+                state = state.copy()
+                state.add(qubit)
+        elif row.name == 'on' and row.args and row.index > 0 and row.neighbor(-1).name == 'Measure':
+            value = row.args[0]
+            if isinstance(value, list):
+                state = state.copy()
+                state.update([int(q) for q in value if isinstance(q, int)])
+            elif isinstance(value, int):
+                state = state.copy()
+                state.add(value)
+            elif isinstance(value, Interval):
+                state = state.copy()
+                state.add_interval(value)
+        return state
+
+
+class SimulatorWidth(Fact):
+    """
+    Simulator 声明的量子比特数（见 parse_simulator），后声明的覆盖先声明的，没有声明时为 None。
+    分支汇合时取较大者，IIS 只报告在任何分支下都越界的比特。
+    """
+    name = 'simulator_width'
+    requires = ('constants',)
+
+    def initial(self, flow):
+        return None
+
+    def join(self, a, b):
+        if a is None:
+            return b
+        if b is None:
+            return a
+        return max(a, b)
+
+    def transfer(self, state, event, flow):
+        row = flow.row(event)
+        if row is None or row.name != 'Simulator':
+            return state
+        _, n_qubits, _ = parse_simulator(row, flow.context)
+        return state if n_qubits is None else n_qubits
+
+
+# 常量传播只保留不可变的标量值
+_CONSTANT_TYPES = (int, float, complex, str, bool, type(None))
+_NOT_CONSTANT = object()
+
+
+class ConstantValues(Fact):
+    """
+    变量在程序点上的常量值 {变量名: 值}，只有所有路径上取值相同时才保留。
+    字面量与整数算术（n = 2、n += 1、m = n * 2）可以求值，其余绑定使变量失效；
+    在函数中以 global / nonlocal 声明的变量可能在任意调用处改变，不跟踪。
+    值为 PersistentDict：每次绑定只追加一条修改记录，而不是复制整个字典，
+    上千个参数变量的文件中求解仍为线性。
+    """
+    name = 'constants'
+
+    def initial(self, flow):
+        return PersistentDict()
+
+    def join(self, a, b):
+        if a is b:
+            return a
+        return PersistentDict((name, value) for name, value in a.items()
+                              if type(b.get(name, _NOT_CONSTANT)) is type(value) and b[name] == value)
+
+    def transfer(self, state, event, flow):
+        if isinstance(event, ast.Call):
+            return state
+        names = bound_names(event)
+        if not names:
+            return state
+        value = _NOT_CONSTANT
+        if isinstance(event, ast.AugAssign):
+            # 只有原值为常量时才可能仍为常量（如 circ += ... 直接跳过）
+            if names[0] in state:
+                value = _constant_value(ast.BinOp(ast.Name(names[0], ast.Load()), event.op, event.value), state)
+        elif isinstance(event, (ast.Assign, ast.AnnAssign, ast.NamedExpr)) and event.value is not None:
+            targets = event.targets if isinstance(event, ast.Assign) else [event.target]
+            if all(isinstance(target, ast.Name) for target in targets):
+                value = _constant_value(event.value, state)
+        for name in names:
+            if value is _NOT_CONSTANT or name in flow.cfg.globals:
+                state = state.discard(name)
+            else:
+                state = state.set(name, value)
+        return state
+
+
+def _constant_value(node, constants):
+    """ 表达式在 constants 下的常量值，无法确定时返回 _NOT_CONSTANT """
+    if isinstance(node, ast.Constant):
+        value = node.value
+        return value if isinstance(value, _CONSTANT_TYPES) else _NOT_CONSTANT
+    if isinstance(node, ast.Name):
+        return constants.get(node.id, _NOT_CONSTANT)
+    if isinstance(node, ast.Call):
+        return _NOT_CONSTANT
+    try:
+        value = ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        lookup = lambda name: _int_constant(constants.get(name))
+        value = eval_expr(node, {}, lookup)
+        return value if isinstance(value, int) else _NOT_CONSTANT
+    return value if isinstance(value, _CONSTANT_TYPES) else _NOT_CONSTANT
+
+
+def _int_constant(value):
+    return value if isinstance(value, int) and not isinstance(value, bool) else None
+
+
+class RuleEngine:
+    """
+    事件分派引擎：订阅关系在构造时编译为 门名称 → 处理方法 的字典，
+    运行时只遍历一次被订阅的门调用行，并分派给订阅该门的规则。
+    """
+
+    def __init__(self, rules):
+        self.rules = rules
+        subscriptions = {}
+        for code, rule in rules.items():
+            for name, method in rule.events.items():
+                subscriptions.setdefault(name, []).append((code, method))
+        self.subscriptions = {name: tuple(subs) for name, subs in subscriptions.items()}
+
+    def run(self, context, codes=None, facts=None):
+        """
+        运行 codes 中的规则（默认为全部），返回 {规则代码: issues}。
+        facts 为需要求解的事实（依赖在前），默认由规则的 facts 声明推出。
+        """
+        codes = self.rules if codes is None else codes
+        instances = {code: self.rules[code](context) for code in codes}
+        if facts is None:
+            facts = fact_closure([name for code in instances for name in self.rules[code].facts],
+                                 context.flow.facts)
+        # 规则声明的数据流事实先求解（每个文件只求一次，规则之间共用）
+        for name in facts:
+            context.flow.solve(name)
+        dispatch = {}
+        for name, subs in self.subscriptions.items():
+            handlers = tuple(getattr(instances[code], method) for code, method in subs if code in instances)
+            if handlers:
+                dispatch[name] = handlers
+        if METRICS.enabled:
+            return self._run_timed(context, instances, dispatch)
+        for row in context.table.named(*dispatch):
+            for handler in dispatch[row.name]:
+                handler(row)
+        return {code: rule.finish() for code, rule in instances.items()}
+
+    def _run_timed(self, context, instances, dispatch):
+        """ 与 run 相同，但按规则累计事件处理与 finish 的调用次数、墙钟与 CPU 时间 """
+        perf_counter, process_time = time.perf_counter, time.process_time
+        totals = {code: [0, 0.0, 0.0] for code in instances}
+        codes = {name: tuple(code for code, _ in subs if code in instances)
+                 for name, subs in self.subscriptions.items()}
+        for row in context.table.named(*dispatch):
+            for code, handler in zip(codes[row.name], dispatch[row.name]):
+                wall, cpu = perf_counter(), process_time()
+                handler(row)
+                stats = totals[code]
+                stats[0] += 1
+                stats[1] += perf_counter() - wall
+                stats[2] += process_time() - cpu
+
+        results = {}
+        for code, rule in instances.items():
+            wall, cpu = perf_counter(), process_time()
+            results[code] = rule.finish()
+            calls, event_wall, event_cpu = totals[code]
+            METRICS.add(f"rule:{code}", event_wall + perf_counter() - wall,
+                        event_cpu + process_time() - cpu, calls + 1)
+        return results
+
+
+# **📌 内置规则（在 rule_registry.BUILTIN_RULES 中登记，运行时按 --select / --ignore 选用）**
+Rules = {
+    'IIS': checker_IIS,
+    'IM' : checker_IM,
+    'PE' : checker_PE,
+}
+
+# **📌 数据流事实（规则通过 facts 声明，见 dataflow.py）**
+Facts = {fact.name: fact for fact in (MeasuredQubits, SimulatorWidth, ConstantValues)}
+
+# **📌 规则描述**
+Description = {code: rule.description for code, rule in Rules.items()}
+
+# **📌 结果存储**
+Results = {rule: False for rule in Rules.keys()}
+
+# **📌 规则集版本：修改规则语义时递增，结果缓存随之失效**
+RULESET_VERSION = '4'
+
+# 影响检查结果的前端与规则模块，其源码变化同样使结果缓存失效
+_PIPELINE_MODULES = ('ast_operations', 'cfg', 'dataflow', 'gate_catalog', 'gate_ir', 'intervals',
+                     'qubits', 'rule_scheduler', 'symbol_table')
+_ruleset_versions = {}
+
+def ruleset_version(rules=None):
+    """
+    返回规则集版本摘要：RULESET_VERSION、启用的规则代码以及
+    前端与规则模块源码的 SHA-256，任一变化都会得到新的版本号。
+    """
+    rules = active_rules() if rules is None else rules
+    codes = tuple(sorted(rules))
+    version = _ruleset_versions.get(codes)
+    if version is not None:
+        return version
+
+    digest = hashlib.sha256(f"{RULESET_VERSION}:{','.join(codes)}".encode('utf-8'))
+    modules = {importlib.import_module(name) for name in _PIPELINE_MODULES}
+    modules.update(sys.modules[rule.__module__] for rule in rules.values())
+    for path in sorted(getattr(module, '__file__', None) or '' for module in modules):
+        if path:
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    version = digest.hexdigest()[:16]
+    _ruleset_versions[codes] = version
+    return version
+
+# 规则消息开头的 [ERROR] / [WARNING] 标记，结构化记录中由 severity 字段表示
+_SEVERITY_TAG = re.compile(r'^\[(?:ERROR|WARNING)\]\s*')
+
+# **📌 MindQuantum 静态分析类**
+class MindLint:
+    def __init__(self, rules=None):
+        # 默认使用注册表中选中的规则（见 rule_registry.py）
+        self.rules = active_rules() if rules is None else rules
+        self.results = {key: False for key in self.rules}
+        self.report_errors = []
+        self.report_warnings = []
+        self.report_issues = []
+        self.context = None
+        # 按规则声明的依赖分阶段，互不依赖的规则在同一阶段中一起分派（见 rule_scheduler.py）
+        self.schedule = schedule_for(self.rules, Facts)
+        self.engines = [RuleEngine(stage) for stage in self.schedule.stages]
+
+    def check(self, var_list, att_line_numbers, gate_ops, file_lines, att_scopes=None, file_cfg=None):
+        for _ in self.iter_check(var_list, att_line_numbers, gate_ops, file_lines, att_scopes, file_cfg):
+            pass
+
+    def iter_check(self, var_list, att_line_numbers, gate_ops, file_lines, att_scopes=None, file_cfg=None):
+        """
+        check 的生成器形式：每个规则阶段结束后立即逐条产出结构化 issue
+        （rule / severity / line / message / source），同时照常记录到报告中。
+        文件中没有触发门调用的规则被跳过，其事实也不求解。
+        file_cfg 为文件的控制流图（MQCollector.cfgs），未提供时按 gate_ops 的顺序分析。
+        """
+        logger.debug("\n========================= 🚀 开始代码分析 🚀 =========================\n")
+        # 每个文件构建一次符号表与门调用表，所有规则通过上下文共用
+        with timed('tables'):
+            symbols = SymbolTable(var_list, att_line_numbers, att_scopes)
+            self.context = LintContext(symbols, GateTable(gate_ops, symbols.resolve), gate_ops, file_cfg)
+
+        schedule = self.schedule
+        for engine in self.engines:
+            codes = schedule.runnable(engine.rules, self.context.table)
+            if not codes:
+                continue
+            for task, issues in engine.run(self.context, codes, schedule.facts_for(codes)).items():
+                for issue in issues:
+                    yield self._record_issue(task, issue, file_lines)
+
+        logger.debug("\n========================= ✅ 代码分析完成 ✅ =========================\n")
+
+    def _record_issue(self, task, issue, file_lines):
+        self.results[task] = True
+        lineno = int(issue["lineno"])
+        line = file_lines[lineno - 1]
+        text, where, cell = issue['msg'], f"line {lineno}", None
+        # notebook 的行索引（notebook.NotebookLines）把拼接后的行号换算为单元与单元内的行号
+        locate = getattr(file_lines, 'locate', None)
+        if locate is not None:
+            cell, cell_line = locate(lineno)
+            if cell is not None:
+                where = f"cell {cell}, line {cell_line}"
+                text = text.replace(f"(行 {lineno})", f"(单元格 {cell} 行 {cell_line})")
+                lineno = cell_line
+        msg = f"Type: {task} - {self.rules[task].description}\n{issue['type']} at {where}: {line}\n{text}"
+
+        record = {
+            "rule": task,
+            "severity": issue["type"].lower(),
+            "line": lineno,
+            "message": _SEVERITY_TAG.sub('', text, count=1),
+            "source": line,
+        }
+        if cell is not None:
+            record["cell"] = cell
+        self.report_issues.append(record)
+
+        if issue["type"] == "Error":
+            self.report_errors.append(msg)
+            logger.debug("[❌] 错误: %s", msg)
+        elif issue["type"] == "Warning":
+            self.report_warnings.append(msg)
+            logger.debug("[⚠️] 警告: %s", msg)
+        return record
+
+    def get_report(self):
+        """
+        生成错误与警告报告，在 INFO 级别输出并返回结构化结果。
+
+        返回值:
+            {
+                "errors": List[str],
+                "warnings": List[str],
+                "issues": List[dict]    # rule / severity / line / message / source 字段
+            }
+        """
+        report_errors = getattr(self, "report_errors", [])
+        report_warnings = getattr(self, "report_warnings", [])
+
+        # 报告文本较长，只有日志级别允许输出时才拼接
+        if logger.isEnabledFor(logging.INFO):
+            lines = ["\n========================= 📋 检查报告 =========================\n"]
+            if report_errors:
+                lines.append("❌ 错误列表（Errors）:")
+                lines.extend(f"{i}. {err}\n" for i, err in enumerate(report_errors, 1))
+            else:
+                lines.append("✅ 没有发现错误（Errors）\n")
+
+            if report_warnings:
+                lines.append("⚠️ 警告列表（Warnings）:")
+                lines.extend(f"{i}. {warn}\n" for i, warn in enumerate(report_warnings, 1))
+            else:
+                lines.append("✅ 没有发现警告（Warnings）\n")
+            lines.append("========================= 🧾 报告结束 =========================\n")
+            logger.info("\n".join(lines))
+
+        return {
+            "errors": report_errors,
+            "warnings": report_warnings,
+            "issues": self.report_issues,
+        }
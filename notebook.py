@@ -0,0 +1,285 @@
+"""
+Jupyter Notebook（.ipynb）支持：流式扫描 notebook 的 JSON，只取出代码单元的源码。
+
+notebook 中的输出（图片、HTML 等）往往比代码大几个数量级。这里不用 json.load 构建整个文档，
+而是从文件按块（CHUNK_SIZE）读入，在 bytes 上逐个跳过不需要的值：字符串用 bytes.find 查找结束引号，
+对象与数组只统计括号深度，已跳过的部分随即丢弃，因此输出中的大块数据不会整个留在内存中；
+只有 cell_type 与 source 会被解码。
+
+代码单元按顺序拼接为一个源码文本一起分析（与 Jupyter 中依次执行一致），
+NotebookLines 记录每个单元在拼接文本中的起始行，问题据此定位到「第几个单元的第几行」。
+单元编号按 notebook 中的位置从 1 开始计数（包括 Markdown 单元）。
+IPython 魔法命令（%、!）不是 Python 语法，对应的行替换为 pass，保持行号不变；
+单元魔法（%%）中 %%time、%%timeit、%%capture 等的单元体仍是 Python 代码，只替换魔法所在的行，
+%%bash、%%html 等其他单元魔法的单元体不是 Python，整个单元替换为 pass。
+"""
+import io
+import json
+import re
+from array import array
+from bisect import bisect_right
+
+from line_index import LineIndex
+
+NOTEBOOK_SUFFIX = '.ipynb'
+# 文件夹模式、监听模式与 git 模式分析的源码文件
+SOURCE_SUFFIXES = ('.py', NOTEBOOK_SUFFIX)
+
+_WHITESPACE = re.compile(rb'[ \t\r\n]*')
+_STRUCTURAL = re.compile(rb'["\[\]{}]')
+_SCALAR = re.compile(rb'[^,}\]\s]+')
+_MAGIC = re.compile(r'^(\s*)[%!]')
+_CELL_MAGIC = re.compile(r'^\s*%%(\w+)')
+
+# 单元体为 Python 代码的单元魔法
+PYTHON_CELL_MAGICS = frozenset(['time', 'timeit', 'capture', 'prun', 'debug', 'python', 'python3'])
+
+# 每次从文件读入的字节数
+CHUNK_SIZE = 1 << 16
+
+_QUOTE, _BACKSLASH = 0x22, 0x5C
+_OPENERS = (0x7B, 0x5B)     # { [
+
+
+class NotebookError(ValueError):
+    """ notebook 的 JSON 结构不完整或不合法 """
+
+
+def is_notebook(path):
+    return path.endswith(NOTEBOOK_SUFFIX)
+
+
+class _Scanner:
+    """
+    从二进制流按块读入的 JSON 扫描器，只解码调用方要求的值。
+    buf 只保留尚未扫描的部分（value() 解码期间保留值的开头），已跳过的数据随即丢弃。
+    """
+
+    def __init__(self, stream, chunk_size=CHUNK_SIZE):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buf = b''
+        self.pos = 0
+        self.offset = 0         # buf[0] 在文件中的偏移，用于错误信息
+        self.eof = False
+        self._mark = None       # value() 正在解码的值的开头，丢弃数据时保留
+        while len(self.buf) < 3 and self._fill():
+            pass
+        if self.buf.startswith(b'\xef\xbb\xbf'):
+            self.pos = 3
+
+    def _fill(self):
+        """ 读入下一块并丢弃已扫描的前缀，已到文件末尾时返回 False """
+        if self.eof:
+            return False
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        keep = self.pos if self._mark is None else min(self.pos, self._mark)
+        if keep:
+            self.buf = self.buf[keep:]
+            self.offset += keep
+            self.pos -= keep
+            if self._mark is not None:
+                self._mark -= keep
+        self.buf += chunk
+        return True
+
+    def _error(self, what):
+        return NotebookError(f"{what}（偏移 {self.offset + self.pos}）")
+
+    def _peek(self):
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or not self._fill():
+                return self.buf[self.pos:self.pos + 1]
+
+    def _expect(self, char):
+        if self._peek() != char:
+            raise self._error(f"应为 {char.decode()}")
+        self.pos += 1
+
+    def _skip_string(self):
+        """ 从 pos 处的开始引号前进到结束引号之后 """
+        search = self.pos + 1
+        while True:
+            buf = self.buf
+            end = buf.find(b'"', search)
+            if end == -1:
+                # 只保留末尾连续的反斜杠及其前一个字节（判断下一块开头的引号是否被转义）
+                k = len(buf)
+                while buf[k - 1] == _BACKSLASH:
+                    k -= 1
+                self.pos = k - 1
+                if not self._fill():
+                    raise self._error("字符串没有结束")
+                search = self.pos + 1
+                continue
+            # 结束引号前的反斜杠为偶数个时才是真正的结束（buf[pos] 不是反斜杠，回溯不会越界）
+            k = end - 1
+            while buf[k] == _BACKSLASH:
+                k -= 1
+            if (end - 1 - k) % 2 == 0:
+                self.pos = end + 1
+                return
+            search = end + 1
+
+    def skip(self):
+        """ 跳过一个值 """
+        char = self._peek()
+        if char == b'"':
+            self._skip_string()
+        elif char in (b'{', b'['):
+            depth = 0
+            while True:
+                match = _STRUCTURAL.search(self.buf, self.pos)
+                if match is None:
+                    self.pos = len(self.buf)
+                    if not self._fill():
+                        raise self._error("对象或数组没有结束")
+                    continue
+                self.pos = match.start()
+                byte = self.buf[self.pos]
+                if byte == _QUOTE:
+                    self._skip_string()
+                    continue
+                self.pos += 1
+                depth += 1 if byte in _OPENERS else -1
+                if depth == 0:
+                    return
+        else:
+            while True:
+                match = _SCALAR.match(self.buf, self.pos)
+                # 标量可能被块边界截断，直到其后还有字节或文件结束
+                if match is not None and match.end() < len(self.buf) or not self._fill():
+                    break
+            if match is None:
+                raise self._error("缺少值")
+            self.pos = match.end()
+
+    def value(self):
+        """ 解码一个值（只用于键名、cell_type、source 等小值） """
+        self._peek()
+        self._mark = self.pos
+        try:
+            self.skip()
+            return json.loads(self.buf[self._mark:self.pos])
+        finally:
+            self._mark = None
+
+    def members(self):
+        """ 依次产出对象的键，调用方须在取下一个键之前读取或跳过对应的值 """
+        self._expect(b'{')
+        if self._peek() == b'}':
+            self.pos += 1
+            return
+        while True:
+            if self._peek() != b'"':
+                raise self._error("应为键名")
+            key = self.value()
+            self._expect(b':')
+            yield key
+            char = self._peek()
+            self.pos += 1
+            if char == b'}':
+                return
+            if char != b',':
+                raise self._error("应为 , 或 }")
+
+    def elements(self):
+        """ 依次产出数组元素的序号，调用方须读取或跳过每个元素 """
+        self._expect(b'[')
+        if self._peek() == b']':
+            self.pos += 1
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            char = self._peek()
+            self.pos += 1
+            if char == b']':
+                return
+            if char != b',':
+                raise self._error("应为 , 或 ]")
+
+
+def _stream(source):
+    return io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+
+
+def iter_code_cells(source, chunk_size=CHUNK_SIZE):
+    """
+    流式产出 notebook（nbformat 4）中的代码单元：(单元编号, 源码)，单元编号从 1 开始。
+    source 为 notebook 的 bytes 或以二进制模式打开的文件对象。
+    """
+    scanner = _Scanner(_stream(source), chunk_size)
+    for key in scanner.members():
+        if key != 'cells':
+            scanner.skip()
+            continue
+        for index in scanner.elements():
+            cell_type = cell_source = None
+            for cell_key in scanner.members():
+                if cell_key == 'cell_type':
+                    cell_type = scanner.value()
+                elif cell_key == 'source':
+                    cell_source = scanner.value()
+                else:
+                    scanner.skip()      # outputs、attachments、metadata 等
+            if cell_type == 'code' and cell_source:
+                yield index + 1, ''.join(cell_source) if isinstance(cell_source, list) else cell_source
+
+
+def _code_lines(source):
+    """ 单元源码的行，魔法命令行替换为同样缩进的 pass """
+    lines = source.split('\n')
+    if lines and lines[-1] == '':
+        lines.pop()
+    magic = _CELL_MAGIC.match(lines[0]) if lines else None
+    if magic is not None and magic.group(1) not in PYTHON_CELL_MAGICS:
+        # %%bash、%%html 等：整个单元都不是 Python 代码
+        return ['pass'] + [''] * (len(lines) - 1)
+    return [_MAGIC.sub(r'\1pass  #', line) if _MAGIC.match(line) else line for line in lines]
+
+
+class NotebookLines(LineIndex):
+    """ 拼接后源码的行索引，locate(lineno) 返回 (单元编号, 单元内行号) """
+    __slots__ = ('cell_starts', 'cells')
+
+    def __init__(self, source, cell_starts, cells):
+        super().__init__(source)
+        self.cell_starts = cell_starts
+        self.cells = cells
+
+    def locate(self, lineno):
+        index = bisect_right(self.cell_starts, lineno) - 1
+        if index < 0:
+            return None, lineno
+        return self.cells[index], lineno - self.cell_starts[index] + 1
+
+
+def load_notebook(source):
+    """
+    由 notebook 的 bytes 或二进制文件对象得到 (拼接后的源码, NotebookLines)。
+    JSON 结构不合法时抛出 NotebookError。
+    """
+    lines = []
+    cell_starts = array('q')
+    cells = []
+    for cell, code in iter_code_cells(source):
+        code = _code_lines(code)
+        if not code:
+            continue
+        cell_starts.append(len(lines) + 1)
+        cells.append(cell)
+        lines.extend(code)
+    text = '\n'.join(lines)
+    return text, NotebookLines(text, cell_starts, cells)
+
+
+def read_notebook(path):
+    """ 从文件流式读取 notebook，返回值与 load_notebook 相同；无法打开时抛出 OSError """
+    with open(path, 'rb') as f:
+        return load_notebook(f)
@@ -0,0 +1,57 @@
+"""
+解析前的字节级预筛选：在不构建 AST 的情况下判断文件是否可能与 MindQuantum 相关。
+
+规则只处理门调用表中名称被订阅的行（见 Rule.events），且文件中没有任何触发门调用时
+整条规则被跳过（见 Rule.triggers 与 rule_scheduler.py），而每一行都来自一个调用，
+因此源码中既没有 mindquantum，也没有任何以触发名称开头的调用（如 Simulator(、.h(、.on(）
+的文件不可能产生问题，可以直接跳过 ast.parse 与全部规则。
+筛选是保守的：命中关键字的文件照常完整分析，误判只会多解析文件，不会漏报。
+"""
+import re
+
+from rule_registry import active_rules
+from rule_scheduler import triggers_of
+
+
+def event_names(rules=None):
+    """ 所有规则（默认为选中的规则）的触发门 / 调用名称 """
+    names = set()
+    for rule in (active_rules() if rules is None else rules).values():
+        names.update(triggers_of(rule))
+    return names
+
+
+def relevance_pattern(names):
+    """ 匹配 mindquantum 或「订阅名称 + 左括号」的字节正则 """
+    alternatives = '|'.join(re.escape(name) for name in sorted(names, key=len, reverse=True))
+    return re.compile(rb'\b(?:mindquantum\b|(?:' + alternatives.encode('ascii') + rb')\s*\()')
+
+
+class Prefilter:
+    """
+    预筛选器及其计数：checked 为检查过的文件数，skipped 为判定无关而跳过的文件数。
+    未给定 names 时在首次使用时按选中的规则编译正则，因此须在 --select / --ignore 生效之后使用。
+    """
+
+    def __init__(self, names=None):
+        self.names = names
+        self._pattern = None
+        self.enabled = True
+        self.checked = 0
+        self.skipped = 0
+
+    def relevant(self, data):
+        """ data（bytes）是否可能与 MindQuantum 相关；未启用时总是返回 True """
+        if not self.enabled:
+            return True
+        self.checked += 1
+        if self._pattern is None:
+            self._pattern = relevance_pattern(event_names() if self.names is None else self.names)
+        # 绝大多数相关文件都直接导入 mindquantum，先用子串查找快速判断
+        if b'mindquantum' in data or self._pattern.search(data) is not None:
+            return True
+        self.skipped += 1
+        return False
+
+
+PREFILTER = Prefilter()
@@ -0,0 +1,157 @@
+"""
+量子比特集合的位图表示：编号为 q 的比特对应整数掩码的第 q 位，
+并集、交集与重复检查都是整数的按位运算。
+
+过大的编号（超过 MAX_MASK_QUBITS）与负数编号不适合放入掩码，
+放在旁路的普通集合中，保证与 set 语义一致。
+"""
+
+from intervals import Interval
+
+# 掩码可表示的比特编号上限，避免用户代码中的超大编号生成巨大的整数
+MAX_MASK_QUBITS = 1 << 16
+
+
+def _as_index(value):
+    """ 将比特参数规范为 int（与 set 一致，1.0 与 1 视为相同），非整数值返回 None """
+    if isinstance(value, int):
+        return int(value)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return None
+
+
+def qubit_mask(values):
+    """
+    返回 values 中可放入掩码的整数比特编号组成的掩码，exact 区间按其全部取值计入，
+    其余值忽略
+    """
+    mask = 0
+    for value in values:
+        if isinstance(value, int):
+            if 0 <= value < MAX_MASK_QUBITS:
+                mask |= 1 << value
+        elif isinstance(value, Interval) and value.exact:
+            mask |= value.mask(MAX_MASK_QUBITS)
+    return mask
+
+
+def has_duplicates(values):
+    """ 判断 values 中是否有重复元素，等价于 len(values) != len(set(values)) """
+    mask = 0
+    others = None
+    for value in values:
+        q = _as_index(value)
+        if q is not None and 0 <= q < MAX_MASK_QUBITS:
+            bit = 1 << q
+            if mask & bit:
+                return True
+            mask |= bit
+            continue
+        if others is None:
+            others = set()
+        key = value if q is None else q
+        if key in others:
+            return True
+        others.add(key)
+    return False
+
+
+class QubitSet:
+    """
+    比特集合：mask 保存编号在 [0, MAX_MASK_QUBITS) 内的比特，其余编号放在 extra 中。
+    add_range(n)（measure_all）只需一次按位或；n 超过掩码上限时，
+    超出部分由 prefix 表示 [0, prefix) 全部在集合中，不逐个展开。
+    """
+    __slots__ = ('mask', 'prefix', 'extra')
+
+    def __init__(self, qubits=()):
+        self.mask = 0
+        self.prefix = 0
+        self.extra = None
+        self.update(qubits)
+
+    def add(self, qubit):
+        if 0 <= qubit < MAX_MASK_QUBITS:
+            self.mask |= 1 << qubit
+        else:
+            if self.extra is None:
+                self.extra = set()
+            self.extra.add(qubit)
+
+    def update(self, qubits):
+        for qubit in qubits:
+            self.add(qubit)
+
+    def copy(self):
+        other = QubitSet()
+        other.mask = self.mask
+        other.prefix = self.prefix
+        other.extra = None if self.extra is None else set(self.extra)
+        return other
+
+    def __or__(self, other):
+        """ 并集（返回新集合），数据流分析在汇合点使用 """
+        if other.mask | self.mask == self.mask and other.prefix <= self.prefix and not other.extra:
+            return self
+        result = self.copy()
+        result.mask |= other.mask
+        result.prefix = max(self.prefix, other.prefix)
+        if other.extra:
+            result.extra = (result.extra or set()) | other.extra
+        return result
+
+    def __eq__(self, other):
+        if not isinstance(other, QubitSet):
+            return NotImplemented
+        return (self.mask == other.mask and self.prefix == other.prefix
+                and (self.extra or set()) == (other.extra or set()))
+
+    __hash__ = None
+
+    def add_interval(self, interval):
+        """ 加入 exact 区间的全部取值（掩码范围内的部分），非 exact 区间忽略 """
+        if interval.exact:
+            self.mask |= interval.mask(MAX_MASK_QUBITS)
+
+    def first_common(self, mask):
+        """ 与 mask 的公共比特中编号最小的一个，没有时返回 None """
+        common = self.mask & mask
+        if not common:
+            return None
+        return (common & -common).bit_length() - 1
+
+    def add_range(self, n):
+        """ 加入 0 .. n-1 全部比特 """
+        if n <= 0:
+            return
+        self.mask |= (1 << min(n, MAX_MASK_QUBITS)) - 1
+        if n > self.prefix:
+            self.prefix = n
+
+    def overlaps(self, mask):
+        """ 与掩码 mask 是否有公共比特 """
+        return bool(self.mask & mask)
+
+    def intersects(self, values, mask=None):
+        """
+        values 中是否有整数比特在集合中（非整数值忽略）。
+        先用掩码做一次按位与，只有集合含掩码范围外的比特时才逐个检查范围外的值。
+        """
+        if mask is None:
+            mask = qubit_mask(values)
+        if self.mask & mask:
+            return True
+        if self.extra is None and self.prefix <= MAX_MASK_QUBITS:
+            return False
+        return any(isinstance(q, int) and not 0 <= q < MAX_MASK_QUBITS and q in self for q in values)
+
+    def __contains__(self, qubit):
+        if 0 <= qubit < MAX_MASK_QUBITS:
+            return bool(self.mask >> qubit & 1)
+        if 0 <= qubit < self.prefix:
+            return True
+        return self.extra is not None and qubit in self.extra
+
+    def __bool__(self):
+        return bool(self.mask or self.extra)
@@ -0,0 +1,162 @@
+import json
+import os
+from pathlib import Path
+from urllib.parse import quote
+
+from rule_registry import active_rules
+
+# 输出文件的写缓冲大小，大量小记录合并为少量 write 系统调用
+BUFFER_SIZE = 1 << 20
+
+SARIF_SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
+SARIF_VERSION = '2.1.0'
+SARIF_LEVELS = {'error': 'error', 'warning': 'warning'}
+
+
+class ReportWriter:
+    """
+    聚合报告写入器基类：整个运行只打开一个带缓冲的输出文件，
+    每分析完一个文件调用 write(report, file_path) 追加其 issues，结束时 close()。
+    """
+    format = ''
+
+    def __init__(self, path):
+        self.path = path
+        self.files = 0
+        self.issues = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'w', encoding='utf-8', buffering=BUFFER_SIZE)
+        self._begin()
+
+    def _begin(self):
+        pass
+
+    def _end(self):
+        pass
+
+    def _write_issue(self, uri, issue):
+        raise NotImplementedError
+
+    def _uri(self, file_path):
+        return file_path.replace(os.sep, '/')
+
+    def write(self, report, file_path):
+        self.files += 1
+        uri = self._uri(file_path)
+        for issue in report.get('issues', ()):
+            self._write_issue(uri, issue)
+            self.issues += 1
+
+    def close(self):
+        if self._file is None:
+            return
+        self._end()
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __call__(self, report, file_path):
+        """ 与 save_report 签名一致，可直接作为报告输出函数传入 """
+        self.write(report, file_path)
+
+
+class JsonlReportWriter(ReportWriter):
+    """ 每个 issue 一行 JSON：file / rule / severity / line / message / source（notebook 另有 cell） """
+    format = 'jsonl'
+
+    def _write_issue(self, uri, issue):
+        record = {'file': uri}
+        record.update(issue)
+        self._file.write(json.dumps(record, ensure_ascii=False))
+        self._file.write('\n')
+
+
+class SarifReportWriter(ReportWriter):
+    """
+    SARIF 2.1.0 输出：文件头（工具与规则元数据）在打开时写出，
+    results 数组随分析逐条追加，close() 时补全数组与对象结尾。
+    """
+    format = 'sarif'
+
+    def __init__(self, path, rules=None):
+        self.rules = active_rules() if rules is None else rules
+        self._rule_index = {code: i for i, code in enumerate(self.rules)}
+        super().__init__(path)
+
+    def _begin(self):
+        driver = {
+            'name': 'MindLint',
+            'rules': [{'id': code, 'name': rule.description,
+                       'shortDescription': {'text': rule.description}}
+                      for code, rule in self.rules.items()],
+        }
+        header = json.dumps({'$schema': SARIF_SCHEMA, 'version': SARIF_VERSION}, ensure_ascii=False)
+        self._file.write(header[:-1])
+        self._file.write(', "runs": [{"tool": {"driver": ')
+        self._file.write(json.dumps(driver, ensure_ascii=False))
+        self._file.write('}, "results": [')
+        self._first = True
+
+    def _uri(self, file_path):
+        return artifact_uri(file_path)
+
+    def _write_issue(self, uri, issue):
+        result = {
+            'ruleId': issue['rule'],
+            'level': SARIF_LEVELS.get(issue['severity'], 'note'),
+            'message': {'text': issue['message']},
+            'locations': [{'physicalLocation': {
+                'artifactLocation': {'uri': uri},
+                'region': {'startLine': issue['line'], 'snippet': {'text': issue['source']}},
+            }}],
+        }
+        if issue['rule'] in self._rule_index:
+            result['ruleIndex'] = self._rule_index[issue['rule']]
+        if 'cell' in issue:
+            # notebook：startLine 为单元内的行号，单元编号放在 properties 中
+            result['properties'] = {'cell': issue['cell']}
+        if not self._first:
+            self._file.write(',')
+        self._first = False
+        self._file.write('\n')
+        self._file.write(json.dumps(result, ensure_ascii=False))
+
+    def _end(self):
+        self._file.write('\n]}]}\n')
+
+
+def artifact_uri(file_path):
+    """
+    SARIF artifactLocation.uri：绝对路径为 file:// URI，
+    相对路径为以 / 分隔、百分号编码的相对 URI（空格、非 ASCII 字符与 : 等都会被编码）
+    """
+    path = Path(file_path)
+    if path.is_absolute():
+        return path.as_uri()
+    return quote(path.as_posix())
+
+
+REPORT_WRITERS = {
+    JsonlReportWriter.format: JsonlReportWriter,
+    SarifReportWriter.format: SarifReportWriter,
+}
+
+
+def guess_format(path):
+    """ 根据扩展名推断输出格式：.sarif / .sarif.json 为 SARIF，其余为 JSONL """
+    name = path.lower()
+    if name.endswith(('.sarif', '.sarif.json')):
+        return SarifReportWriter.format
+    return JsonlReportWriter.format
+
+
+def open_report_writer(path, fmt=None):
+    """ 创建聚合报告写入器，fmt 为 None 时按扩展名推断 """
+    return REPORT_WRITERS[fmt or guess_format(path)](path)
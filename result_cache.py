@@ -0,0 +1,137 @@
+import hashlib
+import json
+import logging
+import os
+
+# 默认缓存目录与容量上限
+DEFAULT_CACHE_DIR = '.mindlint_cache'
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# 记录缓存总大小的文件（位于缓存根目录，条目都在子目录中）
+SIZE_FILE = 'size'
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+class ResultCache:
+    """
+    持久化的检查结果缓存：以“文件内容哈希 + 规则集版本”为键，
+    保存 MindLint.get_report() 返回的结构化报告（JSON）。
+
+    目录结构为 <cache_dir>/<键前两位>/<键>.json，写入先落临时文件再原子替换，
+    多个工作进程可以同时读写。命中时更新文件 mtime，prune() 按 mtime 淘汰
+    最久未使用的条目，直到总大小不超过 max_bytes。
+
+    缓存根目录下的 size 文件记录上次统计的总大小，written 为本次运行写入的字节数，
+    prune() 只在两者之和超过上限时才遍历整个缓存目录。
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, version=''):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self.written = 0
+
+    def key(self, content):
+        """ 计算缓存键，content 为 str 或 bytes """
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        digest = hashlib.sha256(self.version.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(content)
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key):
+        """ 返回缓存的报告，未命中返回 None """
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                report = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return report
+
+    def put(self, key, report):
+        import tempfile     # 连带导入 shutil、random 等，只在写入缓存时需要
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            data = json.dumps(report, ensure_ascii=False).encode('utf-8')
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("[WARNING] 结果缓存写入失败：%s", e)
+            return
+        self.written += len(data)
+
+    def _size_path(self):
+        return os.path.join(self.cache_dir, SIZE_FILE)
+
+    def _read_size(self):
+        try:
+            with open(self._size_path(), 'r', encoding='ascii') as f:
+                return int(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def _write_size(self, total):
+        try:
+            with open(self._size_path(), 'w', encoding='ascii') as f:
+                f.write(str(total))
+        except OSError as e:
+            logger.warning("[WARNING] 结果缓存写入失败：%s", e)
+
+    def prune(self):
+        """
+        按最久未使用淘汰条目，使缓存总大小不超过 max_bytes，返回删除的条目数。
+        本次运行没有写入，或记录的总大小加上写入量仍未超过上限时，只更新记录而不遍历目录；
+        记录缺失或损坏时按实际遍历的结果重建。
+        """
+        if not self.written:
+            return 0
+        recorded = self._read_size()
+        if recorded is not None and recorded + self.written <= self.max_bytes:
+            # 覆盖写入同一条目时会重复计数，高估只会使下一次提前遍历并校正
+            self._write_size(recorded + self.written)
+            self.written = 0
+            return 0
+
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for file in files:
+                if root == self.cache_dir and file == SIZE_FILE:
+                    continue
+                path = os.path.join(root, file)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+        removed = 0
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        self._write_size(total)
+        self.written = 0
+        return removed
@@ -0,0 +1,127 @@
+"""
+规则注册表：规则以「代码 → 模块:类名」登记，插件规则只有被选中（--select / --ignore）时才会导入
+（内置规则与规则引擎同在 mindLint.py 中，总是随引擎一起加载）。
+
+规则来源：
+  - 内置规则：BUILTIN_RULES（定义在 mindLint.py）
+  - 清单文件：--rules-manifest 指定的 JSON，格式为
+        {"rules": [{"code": "XX", "target": "my_rules:checker_XX", "description": "..."}]}
+  - 入口点：已安装包在 mindlint.rules 组中登记的入口点（名称为规则代码，值为 模块:类名）。
+    扫描入口点需要读取全部已安装包的元数据，代价远高于启动本身，
+    因此只在 --select 中出现清单里没有的代码时才扫描。
+规则类的接口见 mindLint.Rule。
+"""
+import importlib
+import logging
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+ENTRY_POINT_GROUP = 'mindlint.rules'
+
+
+class RuleSpec:
+    """ 一条规则的登记信息：code 为规则代码，target 为 '模块:类名' """
+    __slots__ = ('code', 'target', 'description')
+
+    def __init__(self, code, target, description=''):
+        self.code = code
+        self.target = target
+        self.description = description
+
+    def load(self):
+        module_name, _, attr = self.target.partition(':')
+        rule = getattr(importlib.import_module(module_name), attr)
+        if getattr(rule, 'code', self.code) != self.code:
+            raise ValueError(f"规则 {self.target} 的 code 为 {rule.code}，与登记的 {self.code} 不一致")
+        return rule
+
+
+BUILTIN_RULES = (
+    RuleSpec('IIS', 'mindLint:checker_IIS', 'Incorrect Initial State'),
+    RuleSpec('IM', 'mindLint:checker_IM', 'Incorrect Measurement'),
+    RuleSpec('PE', 'mindLint:checker_PE', 'Parameters Error'),
+)
+
+
+class RuleRegistry:
+    """
+    已登记的规则（按登记顺序）与当前选中的规则代码。
+    rules() 返回选中规则的 {代码: 规则类}，首次调用时才导入规则所在的模块。
+    """
+
+    def __init__(self, specs=BUILTIN_RULES):
+        self.specs = {spec.code: spec for spec in specs}
+        self.manifests = []
+        self.selected = None        # None 表示全部已登记的规则
+        self._entry_points_loaded = False
+        self._loaded = {}
+
+    def register(self, spec):
+        if spec.code in self.specs and self.specs[spec.code].target != spec.target:
+            logger.warning("[WARNING] 规则 %s 重复登记，使用 %s", spec.code, spec.target)
+        self.specs[spec.code] = spec
+        self._loaded.pop(spec.code, None)
+
+    def add_manifest(self, path):
+        """ 登记清单文件中的规则，文件格式错误时抛出 ValueError """
+        import json
+        with open(path, 'r', encoding='utf-8') as f:
+            try:
+                entries = json.load(f).get('rules', [])
+                specs = [RuleSpec(entry['code'], entry['target'], entry.get('description', ''))
+                         for entry in entries]
+            except (ValueError, AttributeError, KeyError, TypeError) as e:
+                raise ValueError(f"规则清单格式错误：{path}，{e}") from None
+        for spec in specs:
+            self.register(spec)
+        self.manifests.append(path)
+
+    def load_entry_points(self):
+        """ 登记已安装包在 mindlint.rules 组中声明的规则（只扫描一次） """
+        if self._entry_points_loaded:
+            return
+        self._entry_points_loaded = True
+        from importlib.metadata import entry_points
+        for entry in entry_points(group=ENTRY_POINT_GROUP):
+            if entry.name not in self.specs:
+                self.register(RuleSpec(entry.name, entry.value))
+
+    def select(self, select=None, ignore=None):
+        """
+        设置选中的规则：select 为要启用的代码（None 为全部已登记规则），再去掉 ignore 中的代码。
+        出现未登记的代码时先扫描入口点，仍找不到则抛出 KeyError。
+        """
+        select, ignore = list(select or ()), set(ignore or ())
+        unknown = [code for code in select + sorted(ignore) if code not in self.specs]
+        if unknown:
+            self.load_entry_points()
+            unknown = [code for code in unknown if code not in self.specs]
+            if unknown:
+                raise KeyError(', '.join(unknown))
+        # 结果按登记顺序排列，与命令行中代码的顺序无关
+        self.selected = [code for code in self.specs
+                         if (not select or code in select) and code not in ignore]
+        return self.selected
+
+    @property
+    def codes(self):
+        return list(self.specs) if self.selected is None else self.selected
+
+    def rule(self, code):
+        rule = self._loaded.get(code)
+        if rule is None:
+            rule = self._loaded[code] = self.specs[code].load()
+        return rule
+
+    def rules(self):
+        """ 选中规则的 {代码: 规则类}，按登记顺序 """
+        return {code: self.rule(code) for code in self.codes}
+
+
+REGISTRY = RuleRegistry()
+
+
+def active_rules():
+    """ 当前选中的规则（--select / --ignore 之后） """
+    return REGISTRY.rules()
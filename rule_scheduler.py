@@ -0,0 +1,134 @@
+"""
+依赖感知的规则调度：规则与数据流事实声明各自产出与依赖的事实，调度器据此构建有向无环图。
+
+声明方式（见 mindLint.Rule 与 dataflow.Fact）：
+  - Rule.facts: 规则查询的数据流事实；Fact.requires: 事实的 transfer 依赖的其他事实
+  - Rule.produces / Rule.consumes: 规则在上下文中写入 / 读取的值（如 IIS 写入的 backend），
+    消费者须在生产者 finish() 之后运行
+  - Rule.triggers: 文件中至少出现其中一个门调用时规则才可能报告问题，
+    都不出现时整条规则（连同只有它需要的事实）被跳过；默认为订阅的事件名称
+
+互不依赖的规则编入同一阶段，由一个 RuleEngine 单次遍历门调用表一起分派；
+事实按依赖顺序求解，每个文件只求一次。依赖成环时在构建调度时抛出 ValueError。
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+def fact_closure(names, facts):
+    """ names 及其依赖的全部事实，依赖在前；未知事实抛出 KeyError，循环依赖抛出 ValueError """
+    order = []
+    state = {}      # 名称 → 'visiting' / 'done'
+
+    def visit(name, path):
+        if state.get(name) == 'done':
+            return
+        if state.get(name) == 'visiting':
+            raise ValueError(f"数据流事实之间存在循环依赖：{' → '.join(path + [name])}")
+        if name not in facts:
+            raise KeyError(name)
+        state[name] = 'visiting'
+        for dep in facts[name].requires:
+            visit(dep, path + [name])
+        state[name] = 'done'
+        order.append(name)
+
+    for name in names:
+        visit(name, [])
+    return order
+
+
+def triggers_of(rule):
+    """ 规则的触发门名称：显式声明的 triggers，否则为订阅的事件名称 """
+    return frozenset(rule.events if rule.triggers is None else rule.triggers)
+
+
+class RuleSchedule:
+    """
+    一组规则的执行计划：stages 为按依赖分层的 {代码: 规则类} 列表，
+    同一阶段内保持规则的登记顺序（即报告中的顺序）。
+    """
+
+    def __init__(self, rules, facts):
+        self.rules = rules
+        self.facts = facts
+        self.triggers = {code: triggers_of(rule) for code, rule in rules.items()}
+        self.fact_order = {}
+        for code, rule in rules.items():
+            try:
+                self.fact_order[code] = fact_closure(rule.facts, facts)
+            except KeyError as e:
+                raise ValueError(f"规则 {code} 声明了未知的数据流事实 {e.args[0]}") from None
+        self.depends = self._dependencies()
+        levels = self._levels()
+        self.stages = [{code: rules[code] for code in rules if levels[code] == level}
+                       for level in range(max(levels.values(), default=-1) + 1)]
+
+    def _dependencies(self):
+        """ 规则代码 → 须先完成的规则代码（produces / consumes 连边）"""
+        producers = {}
+        for code, rule in self.rules.items():
+            for name in rule.produces:
+                producers.setdefault(name, []).append(code)
+        depends = {}
+        for code, rule in self.rules.items():
+            deps = []
+            for name in rule.consumes:
+                if name not in producers:
+                    # 生产者未被选中时视为未产出，上下文中保持默认值
+                    logger.debug("[INFO] 规则 %s 依赖的 %s 没有选中的规则产出", code, name)
+                deps.extend(p for p in producers.get(name, ()) if p != code and p not in deps)
+            depends[code] = deps
+        return depends
+
+    def _levels(self):
+        """ 每条规则所在的阶段：依赖的规则所在阶段的最大值 + 1 """
+        levels = {}
+        visiting = set()
+
+        def level(code, path):
+            if code in levels:
+                return levels[code]
+            if code in visiting:
+                raise ValueError(f"规则之间存在循环依赖：{' → '.join(path + [code])}")
+            visiting.add(code)
+            result = max((level(dep, path + [code]) + 1 for dep in self.depends[code]), default=0)
+            visiting.discard(code)
+            levels[code] = result
+            return result
+
+        for code in self.rules:
+            level(code, [])
+        return levels
+
+    def runnable(self, stage, table):
+        """ 阶段中在该文件里会被触发的规则代码（门调用表中出现了任一触发门名称） """
+        by_name = table.by_name
+        codes = []
+        for code in stage:
+            triggers = self.triggers[code]
+            if not triggers or any(name in by_name for name in triggers):
+                codes.append(code)
+            else:
+                logger.debug("[INFO] 跳过规则 %s：文件中没有 %s", code, ' / '.join(sorted(triggers)))
+        return codes
+
+    def facts_for(self, codes):
+        """ 规则 codes 需要的全部事实，按依赖顺序 """
+        order = []
+        for code in codes:
+            order.extend(name for name in self.fact_order[code] if name not in order)
+        return order
+
+
+_schedules = {}
+
+def schedule_for(rules, facts):
+    """ 同一组规则只构建一次调度（MindLint 每个文件创建一次） """
+    key = (tuple(rules.items()), id(facts))
+    schedule = _schedules.get(key)
+    if schedule is None:
+        schedule = _schedules[key] = RuleSchedule(rules, facts)
+    return schedule
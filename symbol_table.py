@@ -0,0 +1,73 @@
+from bisect import bisect_left, bisect_right
+
+from gate_ir import SymbolRef
+
+MODULE_SCOPE = '<module>'
+
+
+class SymbolTable:
+    """
+    每个文件构建一次的变量符号表。
+
+    结构为 {变量名: {作用域: ([行号...], [值...])}}，同一作用域内按行号有序，
+    查找时用二分定位“使用处之前的最后一次赋值”，代替对 var_list 的线性扫描。
+    作用域名与 MQCollector 一致，如 '<module>'、'U_operator'、'Cls.method'。
+    """
+
+    def __init__(self, var_list=(), line_numbers=(), scopes=None):
+        self._table = {}
+        for i, (name, value) in enumerate(var_list):
+            # get_attributes 追加的字典键值对没有行号，视为模块级、全程可见
+            lineno = line_numbers[i] if i < len(line_numbers) else 0
+            scope = scopes[i] if scopes is not None and i < len(scopes) else MODULE_SCOPE
+            self.add(name, value, lineno, scope)
+
+    def add(self, name, value, lineno, scope=MODULE_SCOPE):
+        lines, values = self._table.setdefault(name, {}).setdefault(scope, ([], []))
+        if not lines or lines[-1] <= lineno:
+            lines.append(lineno)
+            values.append(value)
+        else:
+            index = bisect_right(lines, lineno)
+            lines.insert(index, lineno)
+            values.insert(index, value)
+
+    def lookup(self, name, lineno=None, scope=MODULE_SCOPE, default=None):
+        """
+        查找 name 在第 lineno 行、scope 作用域中可见的值：
+          1. 当前作用域内 lineno 之前的最后一次赋值
+          2. 逐层向外的作用域（函数体在调用时才执行，取 lineno 之前的最后一次赋值，
+             若没有则取该作用域内的最后一次赋值）
+        lineno 为 None 时取各作用域的最后一次赋值。
+        """
+        scopes = self._table.get(name)
+        if scopes is None:
+            return default
+
+        current = scope
+        while True:
+            entry = scopes.get(current)
+            if entry is not None:
+                lines, values = entry
+                if lineno is None:
+                    return values[-1]
+                index = bisect_left(lines, lineno)
+                if index:
+                    return values[index - 1]
+                if current != scope:
+                    return values[-1]
+            if current == MODULE_SCOPE:
+                return default
+            current = current.rpartition('.')[0] or MODULE_SCOPE
+
+    def resolve(self, value, lineno=None, scope=MODULE_SCOPE):
+        """ 解析 IR 中的值：SymbolRef 查表，未找到时返回其文本 """
+        if isinstance(value, SymbolRef):
+            return self.lookup(value, lineno, scope, str(value))
+        return value
+
+    def __contains__(self, name):
+        return name in self._table
+
+    def __len__(self):
+        return len(self._table)
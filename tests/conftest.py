@@ -0,0 +1,7 @@
+"""
+测试共用的配置：项目模块位于仓库根目录（平铺结构），测试前加入 sys.path。
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,102 @@
+"""
+measured_qubits 事实按控制流图求解：IM 规则只在控制位被测量之后（任一路径上）使用时报告。
+constants 事实以 PersistentDict 表示，修改不影响先前的状态，分支汇合时只保留各路径相同的值。
+"""
+import ast
+import random
+
+from ast_operations import Ast_parser
+from cfg import build_cfgs
+from dataflow import PersistentDict
+from lint_api import lint_source
+
+HEADER = "from mindquantum import *\nsim = Simulator('mqvector', 3)\nc = Circuit()\n"
+
+
+def issues(body):
+    return [(issue['rule'], issue['line']) for issue in lint_source(HEADER + body)]
+
+
+def test_measure_after_gate_in_same_expression():
+    assert issues("c = Circuit().x(1, 0).measure(0)\n") == []
+    assert issues("c = Circuit().x(1, 0).measure_all()\n") == []
+
+
+def test_measure_before_control():
+    assert issues("c.measure(0)\nc.x(1, 0)\n") == [('IM', 5)]
+    assert issues("c.measure(0)\nc.x(1, 2)\n") == []
+
+
+def test_branches():
+    assert issues("if flag:\n    c.measure(0)\nc.x(1, 0)\n") == [('IM', 6)]
+    assert issues("if flag:\n    c.measure(0)\nelse:\n    c.x(1, 0)\n") == []
+
+
+def test_function_bodies_are_separate_graphs():
+    assert issues("def f(c):\n    c.x(1, 0)\nc.measure(0)\n") == []
+
+
+def test_loops():
+    # 第二次迭代时 0 号比特已被测量
+    assert issues("for k in range(2):\n    c.x(1, 0)\n    c.measure(0)\n") == [('IM', 5)]
+    assert issues("for i in range(3):\n    c += Measure().on(i)\nc += X.on(2, 1)\n") == [('IM', 6)]
+
+
+def test_persistent_dict_matches_dict_model():
+    rng = random.Random(0)
+    states = [(PersistentDict(), {})]
+    for _ in range(3000):
+        # 从任意较早的状态继续修改，覆盖日志追加与分叉两种情况
+        state, model = states[rng.randrange(len(states))] if rng.random() < 0.3 else states[-1]
+        key = rng.choice('abcdefgh')
+        if rng.random() < 0.3:
+            state, model = state.discard(key), {k: v for k, v in model.items() if k != key}
+        else:
+            value = rng.choice([0, 1, 1.0, True, 'x'])
+            state, model = state.set(key, value), {**model, key: value}
+        states.append((state, model))
+    for state, model in states:
+        assert dict(state.items()) == model
+        assert len(state) == len(model)
+        assert all(type(state[key]) is type(value) for key, value in model.items())
+        assert state == PersistentDict(model)
+
+
+def test_persistent_dict_unchanged_binding_returns_same_state():
+    state = PersistentDict({'n': 2})
+    assert state.set('n', 2) is state
+    assert state.set('n', 2.0) is not state
+    assert state.discard('m') is state
+    assert 'n' not in state.discard('n') and state['n'] == 2
+
+
+def test_constants_across_branches():
+    source = "n = 3\n{}sim = Simulator('mqvector', n)\nc += H.on(5)\n"
+    assert issues(source.format("")) == [('IIS', 6)]
+    assert issues(source.format("n += 4\n")) == []
+    assert issues(source.format("if flag:\n    n = 3\n")) == [('IIS', 8)]
+    # 两条路径上的值不同，n 不再是常量，Simulator 按非字面量参数报告
+    assert ('IIS', 7) in issues(source.format("if flag:\n    n = 8\n"))
+    assert ('IIS', 7) not in issues(source.format("if flag:\n    n = 3\n"))
+
+
+def test_collector_events_match_cfg_walk():
+    # collect 在遍历时记录的表达式事件与 build_cfgs 单独遍历得到的 CFG 相同
+    source = (HEADER
+              + "@wrap(f(1))\ndef g(a=h(x), *, b=k()):\n    global c\n    return c.x(1, 0)\n"
+              + "class K(Base(), meta=m(2)):\n    y = f(z := g(1))\n"
+              + "try:\n    c.measure(0)\nexcept err(1) as e:\n    log(e)\n"
+              + "with open(p(1)) as fh, lock(q()):\n    c += [X.on(i) for i in range(n(3))]\n"
+              + "while cond(c.h(0)):\n    c.x(1, 0) if w(1) else c.z(1)\n"
+              + "x, y[f(1)] = a(1), b(lambda v: v(2))\n")
+    parser = Ast_parser()
+    parser.parser(source)
+    expected = build_cfgs(parser.root)
+    actual = parser.collect().cfgs
+    assert actual.globals == expected.globals == {'c'}
+    assert len(actual.graphs) == len(expected.graphs)
+    for graph, other in zip(actual.graphs, expected.graphs):
+        assert graph.scope == other.scope
+        assert [block.events for block in graph.blocks] == [block.events for block in other.blocks]
+    assert actual.points.keys() == expected.points.keys()
+    assert len(actual.points) == sum(isinstance(node, ast.Call) for node in ast.walk(parser.root))
@@ -0,0 +1,55 @@
+"""
+门调用 IR 的比特参数：dict / set / 嵌套列表等字面量不是比特编号，按未知值忽略，不得使规则崩溃。
+以变量保存的调用（如 NoiseBackend(...)）在变量表中即为 IR，不再以字符串重新解析。
+"""
+from ast_operations import Ast_parser
+from gate_ir import GateOp, flatten_qubits
+from lint_api import lint_source
+from qubits import has_duplicates
+
+HEADER = "from mindquantum import *\nsim = Simulator('mqvector', 3)\nc = Circuit()\n"
+
+
+def test_flatten_qubits_skips_unhashable_literals():
+    assert flatten_qubits([{0: 1}, 1]) == [1]
+    assert flatten_qubits([{0, 1}, [2, {3}]]) == [2]
+    assert flatten_qubits([[[0, 1]], 0]) == [0]
+    assert flatten_qubits([(0, 1), None, 'None']) == [0, 1]
+
+
+def test_has_duplicates_on_flattened_literals():
+    assert not has_duplicates(flatten_qubits([{0: 1}, 1]))
+    assert has_duplicates(flatten_qubits([[{0: 1}, 1], 1]))
+
+
+def test_unhashable_qubit_literals_do_not_crash():
+    source = HEADER + "\n".join([
+        "c += X.on({0: 1}, 1)",
+        "c += X.on({0, 1}, 1)",
+        "c += X.on(0, {1: 2})",
+        "c += X.on(0, {1, 2})",
+        "c = Circuit().x([[0, 1]], 0)",
+        "c = Circuit().x(0, [[0, 1]])",
+        "c += X.on([{0: 1}, 1], 2)",
+        "c += Measure().on({0: 1})",
+        "c.measure({0, 1})",
+    ]) + "\n"
+    assert list(lint_source(source)) == []
+
+
+def test_unhashable_literals_keep_other_issues():
+    source = HEADER + "c += X.on([{0: 1}, 1], 1)\nc += H.on(5)\n"
+    issues = [(issue['rule'], issue['line']) for issue in lint_source(source)]
+    assert issues == [('IIS', 5), ('PE', 4)]
+
+
+def test_noise_backend_variable_is_stored_as_ir():
+    source = ("from mindquantum import *\nnb = NoiseBackend('mqvector', 2, adder=a)\n"
+              "sim = Simulator(nb)\nc = Circuit()\nc += H.on(3)\n")
+    parser = Ast_parser()
+    parser.parser(source)
+    (name, value), = [attribute for attribute in parser.collect().attributes if attribute[0] == 'nb']
+    assert isinstance(value, GateOp) and value.last.name == 'NoiseBackend'
+    assert str(value) == 'NoiseBackend("mqvector",2,adder=a)'
+    issues = [(issue['rule'], issue['line']) for issue in lint_source(source)]
+    assert issues == [('IIS', 5)]
@@ -0,0 +1,36 @@
+"""
+git 模式：用户给定的版本不得被 git 当作选项解析。
+"""
+import subprocess
+
+import pytest
+
+from git_source import GitError, git_changed_files
+
+
+@pytest.fixture
+def repo(tmp_path):
+    def git(*args):
+        subprocess.run(['git', *args], cwd=tmp_path, check=True, capture_output=True)
+    git('init', '-q')
+    git('config', 'user.email', 'test@example.com')
+    git('config', 'user.name', 'test')
+    (tmp_path / 'a.py').write_text('x = 1\n')
+    git('add', 'a.py')
+    git('commit', '-q', '-m', 'first')
+    (tmp_path / 'a.py').write_text('x = 2\n')
+    (tmp_path / 'b.ipynb').write_text('{}')
+    git('add', 'a.py', 'b.ipynb')
+    git('commit', '-q', '-m', 'second')
+    return tmp_path
+
+
+def test_changed_since_rev(repo):
+    assert git_changed_files(str(repo), rev='HEAD~1') == ['a.py', 'b.ipynb']
+
+
+@pytest.mark.parametrize('rev', ['--output=out.txt', '-p', ''])
+def test_rev_that_looks_like_an_option_is_rejected(repo, rev):
+    with pytest.raises(GitError):
+        git_changed_files(str(repo), rev=rev)
+    assert not (repo / 'out.txt').exists()
@@ -0,0 +1,47 @@
+"""
+IncrementalDocument 的结果须与整篇分析（lint_api.lint_source）一致。
+"""
+from incremental import IncrementalDocument
+from lint_api import lint_source
+
+SOURCE = ("from mindquantum import *\nsim = Simulator('mqvector', 3)\nc = Circuit()\n"
+          "c.measure(0)\nc.x(1, 0)\n")
+
+
+def full(lines):
+    result = []
+    for issue in lint_source('\n'.join(lines)):
+        del issue['file']
+        result.append(issue)
+    return result
+
+
+def test_edits_match_full_analysis():
+    doc = IncrementalDocument(SOURCE)
+    lines = SOURCE.split('\n')
+    assert doc.issues() == full(lines)
+    assert doc.issues()
+
+    lines.insert(4, "c.h(2)")
+    doc.update(list(lines))
+    assert doc.issues() == full(lines)
+    lines[5] = "c.x(2, 1)"
+    doc.update(list(lines))
+    assert doc.issues() == full(lines) == []
+    lines[3] = "c.measure(2)"
+    doc.update(list(lines))
+    assert doc.issues() == full(lines)
+    assert doc.partial_parses == 3 and doc.full_parses == 1
+
+
+def test_syntax_error_and_recovery():
+    doc = IncrementalDocument(SOURCE)
+    lines = SOURCE.split('\n')
+    lines[4] = "c.x(1, 0"
+    doc.update(list(lines))
+    assert doc.syntax_error is not None
+    assert doc.issues() == []
+    lines[4] = "c.x(1, 0)"
+    doc.update(list(lines))
+    assert doc.syntax_error is None
+    assert doc.issues() == full(lines)
@@ -0,0 +1,58 @@
+"""
+循环变量的区间分析：range 区间、下标表达式求值，以及循环体中重新赋值的循环变量。
+"""
+import ast
+
+from intervals import Interval, eval_expr, range_interval
+from lint_api import lint_source
+
+HEADER = "from mindquantum import *\nsim = Simulator('mqvector', 2)\nc = Circuit()\n"
+
+
+def evaluate(expr, **env):
+    return eval_expr(ast.parse(expr, mode='eval').body, env, lambda name: None)
+
+
+def issues(body):
+    return [(issue['rule'], issue['line']) for issue in lint_source(HEADER + body)]
+
+
+def test_negative_ranges():
+    interval = range_interval(-3, 2)
+    assert (interval.lo, interval.hi, interval.step, interval.exact) == (-3, 1, 1, True)
+    interval = range_interval(5, 0, -2)
+    assert (interval.lo, interval.hi, interval.step) == (1, 5, 2)
+    assert range_interval(0, 5, -1) is None
+    assert range_interval(-1, -1) is None
+    assert range_interval(-1, 0) == -1
+    # 负数比特编号不进入掩码
+    assert Interval(-3, 1).mask(8) == 0b11
+
+
+def test_modulo_and_division_by_zero():
+    i = Interval(0, 4)
+    assert evaluate('i % 0', i=i) is None
+    assert evaluate('i // 0', i=i) is None
+    assert evaluate('3 % 0') is None
+    assert evaluate('i % n', i=i) is None
+    wrapped = evaluate('(i + 1) % 5', i=i)
+    assert (wrapped.lo, wrapped.hi, wrapped.exact) == (0, 4, True)
+
+
+def test_loop_variable_intervals():
+    assert issues("for i in range(5):\n    c += H.on(i)\n") == [('IIS', 5)]
+    assert issues("for i in range(3):\n    c += H.on(i % 2)\n") == []
+    assert issues("for i in range(-3, 2):\n    c += H.on(i)\n") == []
+    assert issues("for i in range(-3, 3):\n    c += H.on(i)\n") == [('IIS', 5)]
+    assert issues("for i in range(5, 0, -2):\n    c += H.on(i)\n") == [('IIS', 5)]
+    assert issues("for i in range(5):\n    c += H.on(i % 0)\n") == []
+
+
+def test_reassigned_loop_variable_has_no_interval():
+    assert issues("for i in range(5):\n    i = 0\n    c += H.on(i)\n") == []
+    assert issues("for i in range(5):\n    i %= 2\n    c += H.on(i)\n") == []
+    assert issues("for i in range(5):\n    if (i := 1):\n        c += H.on(i)\n") == []
+    assert issues("for i in range(5):\n    for i in range(2):\n        pass\n    c += H.on(i)\n") == []
+    # 只有被赋值的循环变量失去区间，外层循环变量不受影响
+    assert issues("for j in range(5):\n    for i in range(1):\n        i = 0\n        c += H.on(j)\n") \
+        == [('IIS', 7)]
@@ -0,0 +1,72 @@
+"""
+LSP 服务：经 Content-Length 分帧的消息往返，$/ 前缀的协议方法分派到对应的处理方法。
+"""
+import io
+
+import lsp_server
+from lsp_server import LanguageServer, handler_name, read_message, serve, write_message
+
+
+def _frames(*messages):
+    stream = io.BytesIO()
+    for message in messages:
+        write_message(stream, dict(message, jsonrpc='2.0'))
+    stream.seek(0)
+    return stream
+
+
+def _read_all(stream):
+    stream.seek(0)
+    messages = []
+    while True:
+        message = read_message(stream)
+        if message is None:
+            return messages
+        messages.append(message)
+
+
+def test_handler_name():
+    assert handler_name('textDocument/didOpen') == 'on_textDocument_didOpen'
+    assert handler_name('$/cancelRequest') == 'on_cancelRequest'
+    assert handler_name('initialize') == 'on_initialize'
+
+
+def test_cancel_request_round_trip(monkeypatch):
+    cancelled = []
+    monkeypatch.setattr(LanguageServer, 'on_cancelRequest',
+                        lambda self, params: cancelled.append(params['id']))
+    stdin = _frames(
+        {'id': 1, 'method': 'initialize', 'params': {}},
+        {'method': '$/cancelRequest', 'params': {'id': 1}},
+        {'id': 2, 'method': 'shutdown'},
+        {'method': 'exit'},
+    )
+    stdout = io.BytesIO()
+    assert serve(stdin, stdout) == 0
+    assert cancelled == [1]
+    responses = _read_all(stdout)
+    assert [response['id'] for response in responses] == [1, 2]
+    assert all('error' not in response for response in responses)
+
+
+def test_unknown_dollar_request_is_method_not_found():
+    stdout = io.BytesIO()
+    server = LanguageServer(stdout)
+    server.handle({'jsonrpc': '2.0', 'id': 7, 'method': '$/unknownRequest'})
+    server.handle({'jsonrpc': '2.0', 'method': '$/unknownNotification'})
+    responses = _read_all(stdout)
+    assert len(responses) == 1
+    assert responses[0]['error']['code'] == lsp_server.METHOD_NOT_FOUND
+
+
+def test_did_open_publishes_diagnostics():
+    text = "from mindquantum import *\nc = Circuit()\nc += X.on(1, 1)\n"
+    stdout = io.BytesIO()
+    server = LanguageServer(stdout)
+    server.handle({'jsonrpc': '2.0', 'method': 'textDocument/didOpen',
+                   'params': {'textDocument': {'uri': 'file:///x.py', 'text': text}}})
+    (notification,) = _read_all(stdout)
+    assert notification['method'] == 'textDocument/publishDiagnostics'
+    (diagnostic,) = notification['params']['diagnostics']
+    assert diagnostic['code'] == 'PE'
+    assert diagnostic['range']['start'] == {'line': 2, 'character': 0}
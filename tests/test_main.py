@@ -0,0 +1,46 @@
+"""
+文件夹模式：单个文件分析失败时记录错误并继续，串行与进程池（--jobs）的行为一致。
+"""
+import multiprocessing
+
+import pytest
+
+import main
+
+GOOD = "from mindquantum import *\nc = Circuit()\nc += X.on(1, 1)\n"
+
+
+@pytest.fixture
+def folder(tmp_path, monkeypatch):
+    for name in ('a.py', 'b_bad.py', 'c.py'):
+        (tmp_path / name).write_text(GOOD, encoding='utf-8')
+    parse_ast = main.parse_ast
+
+    def failing_parse(content):
+        if b'# boom' in content:
+            raise RuntimeError('boom')
+        return parse_ast(content)
+
+    (tmp_path / 'b_bad.py').write_text(GOOD + '# boom\n', encoding='utf-8')
+    monkeypatch.setattr(main, 'parse_ast', failing_parse)
+    return tmp_path
+
+
+@pytest.fixture
+def fork_pool(monkeypatch):
+    # 注入的失败只在 fork 出的工作进程中可见（spawn / forkserver 会重新导入 main）
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        pytest.skip('需要 fork 启动方式')
+    monkeypatch.setattr(multiprocessing, 'Pool', multiprocessing.get_context('fork').Pool)
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_failing_file_does_not_stop_folder_run(folder, jobs, caplog, request):
+    if jobs > 1:
+        request.getfixturevalue('fork_pool')
+    saved = []
+    main.analyze_folder(str(folder), jobs=jobs, save=lambda report, path: saved.append(path))
+    assert [p.rsplit('/', 1)[-1] for p in saved] == ['a.py', 'c.py']
+    if jobs == 1:
+        assert any('分析失败' in record.getMessage() and 'b_bad.py' in record.getMessage()
+                   for record in caplog.records)
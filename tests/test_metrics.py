@@ -0,0 +1,30 @@
+"""
+Prometheus / JSON 导出：textfile collector 可能以其他用户运行，导出文件须对所有用户可读。
+"""
+import json
+import os
+import stat
+
+from metrics import MetricsRegistry, write_json, write_prometheus
+
+
+def summary():
+    registry = MetricsRegistry()
+    registry.add('parse', 0.5, 0.25)
+    registry.record_file('a.py', 0.5)
+    return registry.summary()
+
+
+def test_prometheus_file_is_world_readable(tmp_path):
+    path = tmp_path / 'mindlint.prom'
+    write_prometheus(str(path), summary())
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+    assert 'mindlint_phase_calls_total{phase="parse"} 1' in path.read_text(encoding='utf-8')
+    assert [p.name for p in tmp_path.iterdir()] == ['mindlint.prom']
+
+
+def test_json_export(tmp_path):
+    path = tmp_path / 'metrics.json'
+    write_json(str(path), summary())
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+    assert json.loads(path.read_text(encoding='utf-8'))['files']['count'] == 1
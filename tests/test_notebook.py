@@ -0,0 +1,79 @@
+"""
+notebook 支持：按块流式扫描的结果与 json.load 一致，魔法命令的处理，以及单元 / 行号的定位。
+"""
+import json
+
+import pytest
+
+from lint_api import lint_file
+from notebook import NotebookError, iter_code_cells, load_notebook, read_notebook
+
+
+def _notebook(*cells, output='x' * 1000):
+    nb = {'nbformat': 4, 'nbformat_minor': 5, 'metadata': {'tags': ['"', '\\', '{]']}, 'cells': []}
+    for cell_type, source in cells:
+        cell = {'cell_type': cell_type, 'metadata': {}, 'source': source.splitlines(keepends=True)}
+        if cell_type == 'code':
+            cell['outputs'] = [{'output_type': 'stream', 'text': [output, '\\"}]']}]
+        nb['cells'].append(cell)
+    return json.dumps(nb, indent=1).encode('utf-8')
+
+
+CELLS = (
+    ('markdown', '# 标题 "quoted" \\ {x}'),
+    ('code', 'from mindquantum import *\nc = Circuit()\n'),
+    ('raw', '[not code]'),
+    ('code', 'c += X.on(1, 1)\n'),
+)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 64, 1 << 16])
+def test_chunked_scan_matches_json(chunk_size):
+    data = b'\xef\xbb\xbf' + _notebook(*CELLS)
+    expected = [(i + 1, ''.join(cell['source']))
+                for i, cell in enumerate(json.loads(data[3:])['cells']) if cell['cell_type'] == 'code']
+    assert list(iter_code_cells(data, chunk_size)) == expected
+
+
+@pytest.mark.parametrize('cut', [1, 10, 100, -2])
+def test_truncated_notebook_raises(cut):
+    data = _notebook(*CELLS)
+    with pytest.raises(NotebookError):
+        list(iter_code_cells(data[:cut], 5))
+
+
+def test_read_notebook_streams_from_file(tmp_path):
+    path = tmp_path / 'big.ipynb'
+    path.write_bytes(_notebook(*CELLS, output='A' * 500000))
+    source, lines = read_notebook(str(path))
+    assert source == 'from mindquantum import *\nc = Circuit()\nc += X.on(1, 1)'
+    assert lines.cells == [2, 4]
+    assert lines.locate(3) == (4, 1)
+
+
+def test_line_and_cell_magics():
+    source, _ = load_notebook(_notebook(
+        ('code', '%matplotlib inline\nimport numpy as np\n!pip install x\nfor i in range(2):\n    %time f()\n'),
+        ('code', '%%timeit\nx = 1\n'),
+        ('code', '%%bash\necho hi\nls -la\n'),
+        ('code', '%%capture out\ny = 2\n'),
+    ))
+    assert source.split('\n') == [
+        'pass  #matplotlib inline', 'import numpy as np', 'pass  #pip install x', 'for i in range(2):',
+        '    pass  #time f()',
+        'pass  #%timeit', 'x = 1',
+        'pass', '', '',
+        'pass  #%capture out', 'y = 2',
+    ]
+
+
+def test_python_cell_magic_body_is_linted(tmp_path):
+    path = tmp_path / 'x.ipynb'
+    path.write_bytes(_notebook(
+        ('code', 'from mindquantum import *\nc = Circuit()\n'),
+        ('markdown', 'text'),
+        ('code', '%%time\nc += X.on(1, 1)\n'),
+        ('code', '%%html\nc += X.on(2, 2)\n'),
+    ))
+    issues = [(issue['rule'], issue['cell'], issue['line']) for issue in lint_file(str(path))]
+    assert issues == [('PE', 3, 2)]
@@ -0,0 +1,56 @@
+"""
+解析前的预筛选：没有触发调用的文件跳过解析与全部规则，含触发调用的文件照常完整分析。
+"""
+import pytest
+
+import main
+from prefilter import Prefilter, event_names
+
+UNRELATED = b"import os\n\ndef size(path):\n    return os.path.getsize(path)\n"
+# 没有导入 mindquantum，但含订阅的 .on( 调用（例如通过其他模块传入的电路）
+TRIGGERING = b"def build(c, X):\n    c += X.on(1, 1)\n    return c\n"
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    monkeypatch.setattr(main, 'PREFILTER', Prefilter())
+    parse_ast = main.parse_ast
+    parsed = []
+
+    def counting_parse(content):
+        parsed.append(content)
+        return parse_ast(content)
+
+    monkeypatch.setattr(main, 'parse_ast', counting_parse)
+    return parsed
+
+
+def test_pattern_matches_trigger_calls_only():
+    prefilter = Prefilter(event_names())
+    assert not prefilter.relevant(UNRELATED)
+    # 触发名称只作为标识符的一部分出现、或后面没有调用括号时不算命中
+    assert not prefilter.relevant(b"phone = 1\nx = on\n")
+    assert prefilter.relevant(TRIGGERING)
+    assert prefilter.relevant(b"import mindquantum as mq\n")
+    assert (prefilter.checked, prefilter.skipped) == (4, 2)
+
+
+def test_file_without_triggers_is_skipped(parses):
+    report = main.lint_prefiltered(UNRELATED, UNRELATED.decode().split('\n'))
+    assert report == main.empty_report()
+    assert parses == []
+    assert (main.PREFILTER.checked, main.PREFILTER.skipped) == (1, 1)
+
+
+def test_file_with_triggers_is_analyzed(parses):
+    report = main.lint_prefiltered(TRIGGERING, TRIGGERING.decode().split('\n'))
+    assert parses == [TRIGGERING]
+    assert main.PREFILTER.skipped == 0
+    assert [(issue['rule'], issue['line']) for issue in report['issues']] == [('PE', 2)]
+
+
+def test_disabled_prefilter_analyzes_everything(parses):
+    main.PREFILTER.enabled = False
+    main.lint_prefiltered(UNRELATED, UNRELATED.decode().split('\n'))
+    assert parses == [UNRELATED]
+    assert main.PREFILTER.checked == 0
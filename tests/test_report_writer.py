@@ -0,0 +1,36 @@
+"""
+SARIF 报告的 artifactLocation.uri 须为合法的 URI；JSONL 中的 file 字段仍为路径。
+"""
+import json
+import os
+
+from report_writer import artifact_uri, open_report_writer
+
+REPORT = {'issues': [{'rule': 'IIS', 'severity': 'error', 'line': 3, 'message': 'm', 'source': 's'}]}
+
+
+def test_relative_uris_are_percent_encoded():
+    assert artifact_uri(os.path.join('data', 'a.py')) == 'data/a.py'
+    assert artifact_uri(os.path.join('my data', '量子.py')) == 'my%20data/%E9%87%8F%E5%AD%90.py'
+    assert artifact_uri('a:b.py') == 'a%3Ab.py'
+
+
+def test_absolute_paths_become_file_uris(tmp_path):
+    path = tmp_path / 'my data' / '量子.py'
+    uri = artifact_uri(str(path))
+    assert uri.startswith('file:///')
+    assert uri.endswith('/my%20data/%E9%87%8F%E5%AD%90.py')
+    assert ' ' not in uri
+
+
+def test_sarif_and_jsonl_locations(tmp_path):
+    source = str(tmp_path / 'my data' / 'a.py')
+    with open_report_writer(str(tmp_path / 'out.sarif')) as writer:
+        writer.write(REPORT, source)
+    with open_report_writer(str(tmp_path / 'out.jsonl')) as writer:
+        writer.write(REPORT, source)
+    sarif = json.loads((tmp_path / 'out.sarif').read_text(encoding='utf-8'))
+    location = sarif['runs'][0]['results'][0]['locations'][0]['physicalLocation']
+    assert location['artifactLocation']['uri'] == artifact_uri(source)
+    record = json.loads((tmp_path / 'out.jsonl').read_text(encoding='utf-8'))
+    assert record['file'] == source.replace(os.sep, '/')
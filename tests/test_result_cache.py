@@ -0,0 +1,77 @@
+"""
+结果缓存：内容或规则集版本变化时失效；prune() 按最久未使用淘汰，
+没有写入或未超过上限时不遍历缓存目录。
+"""
+import os
+
+import pytest
+
+import main
+import result_cache
+from line_index import LineIndex
+from result_cache import SIZE_FILE, ResultCache
+
+SOURCE = b"from mindquantum import *\nc = Circuit()\nc += X.on(1, 1)\n"
+
+
+def lint(data, cache):
+    return main.lint_source(data, LineIndex(data), cache)
+
+
+def test_hit_and_invalidation(tmp_path):
+    cache = ResultCache(str(tmp_path), version='v1')
+    report = lint(SOURCE, cache)
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert lint(SOURCE, cache) == report
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # 内容变化
+    lint(SOURCE + b"c += H.on(0)\n", cache)
+    assert (cache.hits, cache.misses) == (1, 2)
+    # 规则集版本变化
+    other = ResultCache(str(tmp_path), version='v2')
+    lint(SOURCE, other)
+    assert (other.hits, other.misses) == (0, 1)
+
+
+def entry(cache, name, mtime):
+    key = cache.key(name)
+    cache.put(key, {'issues': [], 'pad': 'x' * 100})
+    os.utime(cache._path(key), (mtime, mtime))
+    return key
+
+
+def test_prune_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=250)
+    keys = [entry(cache, name, mtime) for name, mtime in (('old', 1000), ('new', 3000), ('mid', 2000))]
+    assert cache.prune() == 1
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[1]) is not None and cache.get(keys[2]) is not None
+    size = sum(os.path.getsize(cache._path(key)) for key in keys[1:])
+    assert (tmp_path / SIZE_FILE).read_text() == str(size)
+    assert cache.written == 0
+
+
+def test_prune_skips_walk_without_writes_or_below_limit(tmp_path, monkeypatch):
+    cache = ResultCache(str(tmp_path), max_bytes=10000)
+    entry(cache, 'a', 1000)
+    assert cache.prune() == 0           # 第一次：没有大小记录，遍历并建立记录
+    recorded = int((tmp_path / SIZE_FILE).read_text())
+
+    def no_walk(*args):
+        raise AssertionError('prune walked the cache directory')
+
+    monkeypatch.setattr(result_cache.os, 'walk', no_walk)
+    reader = ResultCache(str(tmp_path), max_bytes=10000)
+    reader.get(reader.key('a'))
+    assert reader.prune() == 0          # 只有命中，没有写入
+
+    writer = ResultCache(str(tmp_path), max_bytes=10000)
+    entry(writer, 'b', 2000)
+    assert writer.prune() == 0          # 记录加写入量仍在上限内
+    assert int((tmp_path / SIZE_FILE).read_text()) == recorded + os.path.getsize(writer._path(writer.key('b')))
+
+    writer.max_bytes = 1
+    entry(writer, 'c', 3000)
+    with pytest.raises(AssertionError):
+        writer.prune()                  # 超过上限时才遍历
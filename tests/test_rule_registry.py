@@ -0,0 +1,69 @@
+"""
+插件规则：清单文件登记的规则只在被选中时导入，并与内置规则一样受 --select / --ignore 控制。
+"""
+import json
+import sys
+
+import pytest
+
+import rule_registry
+from lint_api import lint_source
+from rule_registry import RuleRegistry
+
+PLUGIN = '''
+from mindLint import Rule
+
+
+class checker_XH(Rule):
+    code = 'XH'
+    description = 'H gate used'
+    events = {'h': 'on_h'}
+
+    def on_h(self, row):
+        self.report("Warning", row.lineno, "[WARNING] 使用了 H 门")
+'''
+
+SOURCE = "from mindquantum import *\nc = Circuit()\nc.h(0)\nc += X.on(1, 1)\n"
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    (tmp_path / 'mq_plugin_rules.py').write_text(PLUGIN, encoding='utf-8')
+    manifest = tmp_path / 'rules.json'
+    manifest.write_text(json.dumps({'rules': [
+        {'code': 'XH', 'target': 'mq_plugin_rules:checker_XH', 'description': 'H gate used'}]}),
+        encoding='utf-8')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, 'mq_plugin_rules', raising=False)
+    registry = RuleRegistry()
+    registry.add_manifest(str(manifest))
+    monkeypatch.setattr(rule_registry, 'REGISTRY', registry)
+    yield registry
+    sys.modules.pop('mq_plugin_rules', None)
+
+
+def rules_reported():
+    return [(issue['rule'], issue['line']) for issue in lint_source(SOURCE)]
+
+
+def test_manifest_rule_runs_with_builtins(registry):
+    assert registry.codes == ['IIS', 'IM', 'PE', 'XH']
+    assert rules_reported() == [('PE', 4), ('XH', 3)]
+
+
+def test_select_plugin_rule(registry):
+    registry.select(['XH'])
+    assert rules_reported() == [('XH', 3)]
+    assert registry.rules()['XH'].__module__ == 'mq_plugin_rules'
+
+
+def test_ignored_plugin_rule_is_not_imported(registry):
+    registry.select(ignore=['XH'])
+    assert rules_reported() == [('PE', 4)]
+    assert 'mq_plugin_rules' not in sys.modules
+
+
+def test_unknown_code_is_rejected(registry, monkeypatch):
+    monkeypatch.setattr(registry, 'load_entry_points', lambda: None)
+    with pytest.raises(KeyError):
+        registry.select(['XX'])
@@ -0,0 +1,90 @@
+"""
+依赖感知的规则调度：消费者在生产者之后的阶段运行，文件中没有触发门调用的规则连同其事实被跳过。
+"""
+import pytest
+
+from lint_api import lint_source
+from main import parse_ast
+from mindLint import Facts, MindLint, Rule, checker_IIS, checker_IM
+from rule_scheduler import RuleSchedule
+
+
+class checker_BK(Rule):
+    """ 读取 IIS 产出的 backend，在 Simulator 调用处报告 """
+    code = 'BK'
+    description = 'Backend seen'
+    events = {'Simulator': 'on_simulator'}
+    consumes = ('backend',)
+
+    def on_simulator(self, row):
+        self.report("Warning", row.lineno, f"[WARNING] backend={self.context.backend}")
+
+
+def check(rules, source):
+    collected = parse_ast(source)
+    checker = MindLint(rules)
+    checker.check(collected.attributes, collected.att_line_numbers, collected.gate_ops,
+                  source.split('\n'), collected.assign_scopes, collected.cfgs)
+    return checker
+
+
+def test_consumer_runs_after_producer():
+    # 消费者登记在生产者之前，调度仍把它放到下一阶段
+    rules = {'BK': checker_BK, 'IIS': checker_IIS}
+    schedule = RuleSchedule(rules, Facts)
+    assert schedule.depends == {'BK': ['IIS'], 'IIS': []}
+    assert [list(stage) for stage in schedule.stages] == [['IIS'], ['BK']]
+
+    checker = check(rules, "from mindquantum import *\nsim = Simulator('mqvector', 2)\n")
+    assert [(issue['rule'], issue['message']) for issue in checker.report_issues] == \
+        [('BK', 'backend=mqvector')]
+
+
+def test_dependency_cycle_is_rejected():
+    class checker_A(Rule):
+        events = {'h': 'on_h'}
+        produces = ('a',)
+        consumes = ('b',)
+
+    class checker_B(Rule):
+        events = {'h': 'on_h'}
+        produces = ('b',)
+        consumes = ('a',)
+
+    with pytest.raises(ValueError, match='循环依赖'):
+        RuleSchedule({'A': checker_A, 'B': checker_B}, Facts)
+
+
+def test_im_is_skipped_without_measure(monkeypatch):
+    created = []
+
+    class RecordingIM(checker_IM):
+        def __init__(self, context):
+            super().__init__(context)
+            created.append(self)
+
+    solved = []
+    measured = Facts['measured_qubits']
+    initial = measured.initial
+
+    def recording_initial(self, flow):
+        solved.append(flow)
+        return initial(self, flow)
+
+    monkeypatch.setattr(measured, 'initial', recording_initial)
+
+    rules = {'IM': RecordingIM}
+    checker = check(rules, "from mindquantum import *\nc = Circuit()\nc.x(1, 0)\nc += X.on(1, 0)\n")
+    table = checker.context.table
+    assert checker.schedule.runnable(rules, table) == []
+    assert created == [] and solved == []
+
+    checker = check(rules, "from mindquantum import *\nc = Circuit()\nc.measure(0)\nc.x(1, 0)\n")
+    assert len(created) == 1 and solved
+    assert [(issue['rule'], issue['line']) for issue in checker.report_issues] == [('IM', 4)]
+
+
+def test_default_rules_report_im_only_with_measure():
+    source = "from mindquantum import *\nc = Circuit()\nc += X.on(1, 0)\n"
+    assert [issue['rule'] for issue in lint_source(source)] == []
+    assert [issue['rule'] for issue in lint_source(source + "c.measure(0)\nc += X.on(1, 0)\n")] == ['IM']
@@ -0,0 +1,55 @@
+import os
+
+
+class TreeWatcher:
+    """
+    轮询目录树（或单个文件），按 (mtime_ns, size) 判断文件是否被修改。
+
+    每次 poll() 只做一次 os.scandir 遍历并复用 DirEntry 的 stat 结果，
+    返回与上一次快照相比新增/修改以及被删除的文件。
+    result/ 与隐藏目录（如 .mindlint_cache）不会被遍历。
+    """
+
+    def __init__(self, path, suffixes=('.py',)):
+        self.path = path
+        self.suffixes = tuple(suffixes)
+        self.snapshot = self._scan()
+
+    def _scan(self):
+        snapshot = {}
+        if os.path.isfile(self.path):
+            try:
+                stat = os.stat(self.path)
+                snapshot[self.path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                pass
+            return snapshot
+
+        stack = [self.path]
+        while stack:
+            directory = stack.pop()
+            try:
+                entries = os.scandir(directory)
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name != 'result' and not entry.name.startswith('.'):
+                                stack.append(entry.path)
+                        elif entry.name.endswith(self.suffixes):
+                            stat = entry.stat()
+                            snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+                    except OSError:
+                        continue
+        return snapshot
+
+    def poll(self):
+        """ 返回 (changed, removed)，均按路径排序 """
+        current = self._scan()
+        previous = self.snapshot
+        changed = sorted(path for path, state in current.items() if previous.get(path) != state)
+        removed = sorted(path for path in previous if path not in current)
+        self.snapshot = current
+        return changed, removed